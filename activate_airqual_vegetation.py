@@ -1,24 +1,25 @@
-import shutil
-import os
+from app.columnar import copy_dataset
+from app.snapshots import activate_datasets
+from config import Config
 
 print("Activating air quality and vegetation features...\n")
 
 diseases = ['dengue', 'typhoid', 'cholera']
 
+# Switch the served data to a new snapshot; the 16-feature one stays available for rollback
+activate_datasets(
+    {disease: f'app/data/{disease}_historical_data_full.csv' for disease in diseases},
+    label='air quality and vegetation features (24 columns)',
+    root=Config.SNAPSHOT_PATH,
+    previous={disease: f'app/data/{disease}_historical_data.csv' for disease in diseases}
+)
+
 for disease in diseases:
-    # Backup current 16-feature files
-    current_file = f'app/data/{disease}_historical_data.csv'
-    backup_file = f'app/data/{disease}_historical_data_16feat_backup.csv'
-    
-    if os.path.exists(current_file):
-        shutil.copy(current_file, backup_file)
-        print(f"✓ Backed up {disease}_historical_data.csv (16 features)")
-    
-    # Copy full feature files to main location
+    # Copy full feature files to the working location read by the next merge step
     full_file = f'app/data/{disease}_historical_data_full.csv'
     dest_file = f'app/data/{disease}_historical_data.csv'
     
-    shutil.copy(full_file, dest_file)
+    copy_dataset(full_file, dest_file)
     print(f"✓ Activated {disease}_historical_data_full.csv -> {disease}_historical_data.csv")
 
 print("\n" + "="*60)
@@ -35,4 +36,4 @@ print(f"    - pm10: Particulate matter 10μm (µg/m³)")
 print(f"    - pm25: Particulate matter 2.5μm (µg/m³)")
 print(f"  Vegetation (1):")
 print(f"    - ndvi: Normalized Difference Vegetation Index")
-print(f"\nBackups saved as *_16feat_backup.csv")
+print(f"\nPrevious 16-feature data: python manage_snapshots.py rollback")
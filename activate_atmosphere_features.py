@@ -1,24 +1,25 @@
-import shutil
-import os
+from app.columnar import copy_dataset
+from app.snapshots import activate_datasets
+from config import Config
 
 print("Activating atmosphere-enhanced features...\n")
 
 diseases = ['dengue', 'typhoid', 'cholera']
 
+# Switch the served data to a new snapshot; the previous one stays available for rollback
+activate_datasets(
+    {disease: f'app/data/{disease}_historical_data_atmosphere.csv' for disease in diseases},
+    label='atmosphere features (17 columns)',
+    root=Config.SNAPSHOT_PATH,
+    previous={disease: f'app/data/{disease}_historical_data.csv' for disease in diseases}
+)
+
 for disease in diseases:
-    # Backup current enhanced files
-    current_file = f'app/data/{disease}_historical_data_enhanced.csv'
-    backup_file = f'app/data/{disease}_historical_data_enhanced_backup.csv'
-    
-    if os.path.exists(current_file):
-        shutil.copy(current_file, backup_file)
-        print(f"✓ Backed up {disease}_historical_data_enhanced.csv")
-    
-    # Copy atmosphere files to main location
+    # Copy atmosphere files to the working location read by the next merge step
     atmos_file = f'app/data/{disease}_historical_data_atmosphere.csv'
     dest_file = f'app/data/{disease}_historical_data.csv'
     
-    shutil.copy(atmos_file, dest_file)
+    copy_dataset(atmos_file, dest_file)
     print(f"✓ Activated {disease}_historical_data_atmosphere.csv -> {disease}_historical_data.csv")
 
 print("\n" + "="*60)
@@ -32,4 +33,4 @@ print(f"  - tave: Average temperature (°C)")
 print(f"  - temp_range: Diurnal temperature range")
 print(f"  - tave_7day: 7-day moving average temperature")
 print(f"  - tave_30day: 30-day moving average temperature")
-print(f"\nBackups saved as *_enhanced_backup.csv")
+print(f"\nPrevious data: python manage_snapshots.py rollback")
@@ -4,32 +4,32 @@ Replaces standard files with enhanced versions and updates configuration
 """
 
 import os
-import shutil
 from pathlib import Path
 
+from app.columnar import copy_dataset
+from app.snapshots import activate_datasets
+from config import Config
+
 DATA_DIR = Path('app/data')
 DISEASES = ['dengue', 'typhoid', 'cholera']
 
-def backup_original_files():
-    """Backup original disease files"""
-    print("Backing up original files...")
-    for disease in DISEASES:
-        original = DATA_DIR / f'{disease}_historical_data.csv'
-        backup = DATA_DIR / f'{disease}_historical_data_original.csv'
-        
-        if original.exists() and not backup.exists():
-            shutil.copy2(original, backup)
-            print(f"  ✓ Backed up {disease}_historical_data.csv")
-
 def activate_enhanced_files():
-    """Replace original files with enhanced versions"""
-    print("\nActivating enhanced files...")
+    """Activate a snapshot of the enhanced files and update the working copies"""
+    print("Activating enhanced files...")
+    # The original files are recorded as the baseline snapshot, so they can be rolled back to
+    activate_datasets(
+        {disease: DATA_DIR / f'{disease}_historical_data_enhanced.csv'
+         for disease in DISEASES if (DATA_DIR / f'{disease}_historical_data_enhanced.csv').exists()},
+        label='enhanced features (10 columns)',
+        root=Config.SNAPSHOT_PATH,
+        previous={disease: DATA_DIR / f'{disease}_historical_data.csv' for disease in DISEASES}
+    )
     for disease in DISEASES:
         enhanced = DATA_DIR / f'{disease}_historical_data_enhanced.csv'
         target = DATA_DIR / f'{disease}_historical_data.csv'
         
         if enhanced.exists():
-            shutil.copy2(enhanced, target)
+            copy_dataset(enhanced, target)
             print(f"  ✓ Activated enhanced data for {disease}")
         else:
             print(f"  ✗ Enhanced file not found for {disease}")
@@ -97,9 +97,6 @@ def main():
     print("="*60)
     print()
     
-    # Backup originals
-    backup_original_files()
-    
     # Activate enhanced versions
     activate_enhanced_files()
     
@@ -1,26 +1,29 @@
-import shutil
-import os
+from app.columnar import copy_dataset
+from app.snapshots import activate_datasets
+from config import Config
 
 print("Activating Sanitation/Water Body enhanced data...\n")
 
 diseases = ['dengue', 'typhoid', 'cholera']
 
+# Switch the served data to a new snapshot; the 23-feature one stays available for rollback
+activate_datasets(
+    {disease: f'app/data/{disease}_historical_data_with_sanwater.csv' for disease in diseases},
+    label='sanitation/water body features (41 inputs)',
+    root=Config.SNAPSHOT_PATH,
+    previous={disease: f'app/data/{disease}_historical_data.csv' for disease in diseases}
+)
+
 for disease in diseases:
     print(f"Processing {disease}...")
     
     # Paths
     current_file = f'app/data/{disease}_historical_data.csv'
-    backup_file = f'app/data/{disease}_23feat_backup.csv'
     new_file = f'app/data/{disease}_historical_data_with_sanwater.csv'
     
-    # Backup current 23-feature data
-    if os.path.exists(current_file):
-        print(f"  Backing up current data to {backup_file}")
-        shutil.copy(current_file, backup_file)
-    
     # Replace with 41-feature data
     print(f"  Activating 41-feature data from {new_file}")
-    shutil.copy(new_file, current_file)
+    copy_dataset(new_file, current_file)
     
     print(f"  ✓ {disease} data updated\n")
 
@@ -28,7 +31,7 @@ print("="*60)
 print("ACTIVATION COMPLETE")
 print("="*60)
 print("\n✓ All disease datasets now use 41-feature data (23 + 18 sanitation/water body)")
-print("✓ Previous 23-feature data backed up as *_23feat_backup.csv")
+print("✓ Previous 23-feature data: python manage_snapshots.py rollback")
 print("\nNext steps:")
 print("1. Update config.py CLIMATE_FEATURES list")
 print("2. Update app/data_utils.py feature extraction")
@@ -1,69 +1,215 @@
-from flask import Flask, render_template, jsonify, request
 import os
 import sys
-import numpy as np
-import pandas as pd
-from datetime import datetime, timedelta
 import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Add current directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from app.data_utils import DataProcessor
-from app.model import DiseaseOutbreakModel
+from app.startup import StartupTimer
+
+# Created before the heavy imports so the startup breakdown includes them
+startup = StartupTimer()
+
+from flask import Flask, render_template, jsonify, request
+
+from app.forecasting import (TAIL_ROWS, get_data_file, get_model_file, load_forecast_model, load_data_processor,
+                             forecast_input, build_forecast, build_barangay_forecast, read_barangay_names)
+from app.forecast_cache import ForecastCache
+from app.forecast_table import ForecastTable
+from app.http_cache import cached_json, make_etag, newest_mtime, ResponseCompressor
+from app.profiling import RequestProfiler
+from app.metrics import MODEL_LOAD_SECONDS, RequestMetrics, CONTENT_TYPE as METRICS_CONTENT_TYPE, render as render_metrics
+from app.status_stream import StatusBroadcaster
+from app.dataset_store import DatasetStore
+from app.snapshots import SnapshotStore
+from app.batching import MicroBatcher
 from config import Config
 
+startup.mark('imports')
+
 app = Flask(__name__, 
             template_folder='app/templates',
             static_folder='app/static')
 app.config.from_object(Config)
+# gzip/brotli for JSON and HTML responses the client accepts compressed
+app.after_request(ResponseCompressor())
+# Per-endpoint latency histograms and in-flight counts for /metrics
+RequestMetrics().init_app(app)
+# Opt-in stack sampling of single requests, fetched from /admin/profiles
+profiler = RequestProfiler(
+    token=Config.PROFILE_TOKEN,
+    sample_rate=Config.PROFILE_SAMPLE_RATE,
+    interval_ms=Config.PROFILE_INTERVAL_MS,
+    keep=Config.PROFILE_KEEP
+)
+profiler.init_app(app)
 
 # Global variables to store models and data processors
 models = {}
 data_processors = {}
+batchers = {}
+# Version of each model file as loaded; models are not reloaded when the file changes,
+# so forecasts are cached and tagged with this version rather than the file's current one
+model_versions = {}
+forecast_cache = ForecastCache()
+# Written by precompute_forecasts.py; rows are served while their data/model versions are current
+forecast_table = ForecastTable(Config.FORECAST_TABLE)
+snapshot_store = SnapshotStore(Config.SNAPSHOT_PATH)
+dataset_store = DatasetStore(snapshots=snapshot_store, tail_rows=TAIL_ROWS)
+barangay_names = {}
+# Shared status snapshot pushed to dashboards over /api/status_stream
+status_broadcaster = StatusBroadcaster(heartbeat=Config.STATUS_STREAM_HEARTBEAT)
+# Diseases whose model could not be loaded, with the reason (not retried until restart)
+model_errors = {}
+_model_locks = {disease: threading.Lock() for disease in Config.DISEASES}
+# Runs the per-disease forecasts of one /api/dashboard request side by side (one model each)
+dashboard_executor = ThreadPoolExecutor(max_workers=len(Config.DISEASES), thread_name_prefix='dashboard')
 
-def initialize_models():
-    """Initialize models for all diseases"""
-    print("Initializing models...")
+def load_disease_model(disease):
+    """Load one disease's model and start its micro-batcher; returns the batcher or None"""
+    data_file = get_data_file(disease)
+    columns = dataset_store.columns(disease)
+    if columns is None:
+        model_errors[disease] = f'data file not found at {data_file}'
+        print(f"✗ {disease} data file not found at {data_file}")
+        return None
     
-    for disease in Config.DISEASES:
+    model_path = get_model_file(disease)
+    if not os.path.exists(model_path):
+        model_errors[disease] = f'model not found at {model_path}'
+        print(f"✗ {disease} model not found at {model_path}")
+        return None
+    
+    # Stat before reading, so a file replaced mid-load is not tagged with the new version
+    model_version = ForecastCache.file_version(model_path)
+    load_start = time.perf_counter()
+    with startup.stage(f'model:{disease}'):
+        data_processor = load_data_processor(model_path)
+        # Feature list saved with the model, else derived from the header only
+        feature_columns = data_processor.feature_columns or data_processor.get_feature_columns(columns)
+        missing = sorted(set(feature_columns) - set(columns))
+        if missing:
+            raise ValueError(f"data file lacks model features {missing}")
+        model = load_forecast_model(model_path, len(feature_columns), data_processor.sequence_length)
+    MODEL_LOAD_SECONDS.set(time.perf_counter() - load_start, disease=disease)
+    
+    data_processors[disease] = data_processor
+    models[disease] = model
+    model_versions[disease] = model_version
+    # Concurrent requests for this model are coalesced into batched forward passes
+    batchers[disease] = MicroBatcher(
+        model,
+        max_batch_size=Config.INFERENCE_MAX_BATCH_SIZE,
+        max_wait_ms=Config.INFERENCE_MAX_WAIT_MS,
+        name=disease
+    )
+    print(f"✓ {disease} model loaded ({model.n_features} features)")
+    # Status only covers loaded models, so dashboards learn about this one now
+    refresh_status()
+    return batchers[disease]
+
+def get_batcher(disease):
+    """Return the micro-batcher for a disease, loading its model on first use (None if unavailable)"""
+    batcher = batchers.get(disease)
+    if batcher is not None or disease in model_errors:
+        return batcher
+    
+    with _model_locks[disease]:
+        # Another request may have loaded it while we waited
+        if disease in batchers or disease in model_errors:
+            return batchers.get(disease)
         try:
-            # Initialize data processor
-            data_processors[disease] = DataProcessor(sequence_length=Config.SEQUENCE_LENGTH)
-            
-            # Load sample data to determine feature count
-            data_file = os.path.join(Config.DATA_PATH, f'{disease.lower()}_historical_data.csv')
-            if not os.path.exists(data_file):
-                print(f"✗ {disease} data file not found at {data_file}")
-                continue
-            
-            # Read data to get feature count
-            df = pd.read_csv(data_file)
-            # Determine feature columns (all except 'date' and including disease_cases for target)
-            # The model expects all columns as input features during prediction
-            feature_cols = [col for col in df.columns if col != 'date']
-            # n_features is the number of input columns (which includes disease_cases as last column)
-            n_features = len(feature_cols) - 1  # Subtract 1 because disease_cases is target, not input
-            
-            # Initialize model
-            model = DiseaseOutbreakModel(
-                sequence_length=Config.SEQUENCE_LENGTH,
-                n_features=n_features,
-                model_type='LSTM'
-            )
-            
-            # Load trained model
-            model_path = os.path.join('app', 'models', f'{disease.lower()}_forecast_model.h5')
-            
-            if os.path.exists(model_path):
-                model.load_model(model_path)
-                models[disease] = model
-                print(f"✓ {disease} model loaded ({n_features} features)")
-            else:
-                print(f"✗ {disease} model not found at {model_path}")
-                
+            return load_disease_model(disease)
         except Exception as e:
+            model_errors[disease] = str(e)
             print(f"Error loading {disease} model: {e}")
+            return None
+
+def load_barangay_names():
+    """Map barangay codes to names from location.csv (once)"""
+    if not barangay_names:
+        barangay_names.update(read_barangay_names())
+    return barangay_names
+
+def warm_up():
+    """Load every model and dataset ahead of the first requests, then flag the server ready"""
+    with startup.stage('warmup'):
+        for disease in Config.DISEASES:
+            get_batcher(disease)
+            with startup.stage(f'data:{disease}'):
+                dataset_store.get(disease)
+        with startup.stage('data:barangays'):
+            if dataset_store.get('barangays') is not None:
+                print("✓ Barangay features loaded")
+            load_barangay_names()
+    
+    startup.set_ready()
+    refresh_status()
+    report = startup.report()
+    print(f"✓ Ready after {report['ready_after_s']:.2f} s")
+    for name, ms in report['stages_ms'].items():
+        print(f"    {name:<24}{ms:>10.1f} ms")
+
+def initialize_models(mode=None):
+    """Register datasets and load models for all diseases
+    
+    mode (default Config.STARTUP_MODE) is 'eager' to load everything before
+    returning, 'background' to load in a daemon thread while the server already
+    answers health checks, or 'lazy' to load each model and dataset on first use.
+    Only file headers (or columnar schema sidecars) are read here.
+    """
+    mode = mode or Config.STARTUP_MODE
+    print(f"Initializing models ({mode} startup)...")
+    
+    for disease in Config.DISEASES:
+        dataset_store.register(disease, get_data_file(disease), load=False)
+    # Per-barangay features are shared by all diseases
+    dataset_store.register('barangays', Config.BARANGAY_DATA_FILE, load=False)
+    startup.mark('register')
+    
+    # Swap in fresh datasets whenever a data file changes or another snapshot is activated,
+    # then push any resulting status change to connected dashboards
+    dataset_store.add_listener(lambda reloaded: refresh_status())
+    dataset_store.start_watcher(interval=Config.DATA_RELOAD_INTERVAL)
+    
+    if mode == 'eager':
+        warm_up()
+    elif mode == 'background':
+        threading.Thread(target=warm_up, name='warmup', daemon=True).start()
+    else:
+        # Nothing to wait for: every model and dataset loads on its first request
+        startup.set_ready()
+        refresh_status()
+
+def compute_forecast(disease, dataset):
+    """Run the full forecast pipeline for a disease and return the response dict"""
+    # Batched with any concurrent requests for the same model
+    data_processor = data_processors[disease]
+    return build_forecast(disease, forecast_input(dataset, data_processor), data_processor, batchers[disease])
+
+def compute_barangay_forecast(disease, dataset, barangays):
+    """Forecast every barangay series for a disease in one batched call"""
+    return build_barangay_forecast(disease, dataset.df, barangays.df, data_processors[disease],
+                                   batchers[disease], load_barangay_names())
+
+def precomputed_or_live(key, data_version, model_version, compute):
+    """Forecast JSON from the precomputed table when it matches both versions, else compute() live"""
+    payload = forecast_table.get(key, data_version, model_version)
+    if payload is not None:
+        return payload
+    return compute()
+
+def forecast_json(disease, dataset):
+    """Forecast JSON for a disease: cached, precomputed, or computed live in that order"""
+    model_version = model_versions[disease]
+    return forecast_cache.get_or_compute(
+        disease, dataset.version, model_version,
+        lambda: precomputed_or_live(disease, dataset.version, model_version,
+                                    lambda: compute_forecast(disease, dataset))
+    )
 
 @app.route('/')
 def index():
@@ -77,90 +223,157 @@ def get_forecast(disease):
     if disease not in Config.DISEASES:
         return jsonify({'error': 'Disease not found'}), 404
     
-    if disease not in models:
+    if get_batcher(disease) is None:
         return jsonify({'error': f'{disease} model not loaded'}), 500
     
     try:
-        # Load historical data
-        data_file = os.path.join(Config.DATA_PATH, f'{disease.lower()}_historical_data.csv')
+        dataset = dataset_store.get(disease)
         
-        if not os.path.exists(data_file):
+        if dataset is None:
             return jsonify({'error': 'Historical data not found'}), 404
         
-        # Process data
-        data_processor = data_processors[disease]
-        df = data_processor.load_data(data_file)
-        scaled_data = data_processor.prepare_features(df)
-        
-        # Get last sequence for prediction
-        last_sequence = scaled_data[-Config.SEQUENCE_LENGTH:]
-        
-        # Make forecast
-        model = models[disease]
-        predictions = model.predict_future(last_sequence, n_days=Config.FORECAST_DAYS)
-        
-        # Inverse transform predictions
-        predicted_cases = data_processor.inverse_transform_predictions(predictions)
-        
-        # Prepare response
-        last_date = df['date'].iloc[-1]
-        forecast_dates = [
-            (last_date + timedelta(days=i+1)).strftime('%Y-%m-%d')
-            for i in range(Config.FORECAST_DAYS)
-        ]
+        # Serve from cache unless the data or model changed since last compute; a miss
+        # reads the precomputed table and only runs the model if that row is stale
+        model_path = get_model_file(disease)
+        model_version = model_versions[disease]
+        return cached_json(
+            lambda: forecast_json(disease, dataset),
+            ('forecast', disease, dataset.version, model_version),
+            last_modified=newest_mtime(dataset.filepath, model_path),
+            max_age=Config.HTTP_CACHE_MAX_AGE
+        )
         
-        # Get historical data for context (last 30 days)
-        historical_dates = df['date'].tail(30).dt.strftime('%Y-%m-%d').tolist()
-        historical_cases = df['disease_cases'].tail(30).tolist()
-        
-        # Calculate alert level
-        avg_cases = np.mean(historical_cases)
-        max_predicted = np.max(predicted_cases)
-        
-        if max_predicted > avg_cases * 2:
-            alert_level = 'HIGH'
-            alert_message = f'High outbreak risk detected! Predicted cases may reach {int(max_predicted)} cases.'
-        elif max_predicted > avg_cases * 1.5:
-            alert_level = 'MEDIUM'
-            alert_message = f'Moderate outbreak risk. Predicted cases may reach {int(max_predicted)} cases.'
-        else:
-            alert_level = 'LOW'
-            alert_message = f'Low outbreak risk. Cases expected to remain around {int(max_predicted)} cases.'
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/forecast/<disease>/barangays')
+def get_barangay_forecast(disease):
+    """Get per-barangay forecast table for a disease"""
+    
+    if disease not in Config.DISEASES:
+        return jsonify({'error': 'Disease not found'}), 404
+    
+    if get_batcher(disease) is None:
+        return jsonify({'error': f'{disease} model not loaded'}), 500
+    
+    try:
+        dataset = dataset_store.get(disease)
+        barangays = dataset_store.get('barangays')
         
-        response = {
-            'disease': disease,
-            'forecast_dates': forecast_dates,
-            'predicted_cases': [int(max(0, x)) for x in predicted_cases],
-            'historical_dates': historical_dates,
-            'historical_cases': historical_cases,
-            'alert_level': alert_level,
-            'alert_message': alert_message,
-            'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
+        if dataset is None or barangays is None:
+            return jsonify({'error': 'Barangay data not found'}), 404
         
-        return jsonify(response)
+        key = f'{disease}:barangays'
+        data_version = (dataset.version, barangays.version)
+        model_path = get_model_file(disease)
+        model_version = model_versions[disease]
+        return cached_json(
+            lambda: forecast_cache.get_or_compute(
+                key, data_version, model_version,
+                lambda: precomputed_or_live(key, data_version, model_version,
+                                            lambda: compute_barangay_forecast(disease, dataset, barangays))
+            ),
+            ('forecast', key, data_version, model_version),
+            last_modified=newest_mtime(dataset.filepath, barangays.filepath, model_path),
+            max_age=Config.HTTP_CACHE_MAX_AGE
+        )
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/healthz')
+def healthz():
+    """Liveness check: answers as soon as the process serves HTTP"""
+    return jsonify({'status': 'ok'})
+
+@app.route('/readyz')
+def readyz():
+    """Readiness check with the startup timing breakdown; 503 until models are loaded"""
+    report = startup.report()
+    report['models'] = sorted(models)
+    report['model_errors'] = model_errors
+    return jsonify(report), (200 if report['ready'] else 503)
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint: request, forecast stage and model load latencies"""
+    return app.response_class(render_metrics(), content_type=METRICS_CONTENT_TYPE)
+
+@app.route('/admin/profiles')
+def list_profiles():
+    """Recent request profiles, newest first (needs the profiling token)"""
+    if not profiler.authorized():
+        return jsonify({'error': 'Not found'}), 404
+    return jsonify(profiler.profiles())
+
+@app.route('/admin/profiles/<int:profile_id>')
+def get_profile(profile_id):
+    """One profile as collapsed stacks (default) or ?format=speedscope JSON"""
+    if not profiler.authorized():
+        return jsonify({'error': 'Not found'}), 404
+    profile = profiler.get(profile_id)
+    if profile is None:
+        return jsonify({'error': 'Profile not found'}), 404
+    
+    if request.args.get('format') == 'speedscope':
+        response = jsonify(profile.speedscope())
+        response.headers['Content-Disposition'] = f'attachment; filename=profile-{profile_id}.speedscope.json'
+        return response
+    return app.response_class(profile.collapsed(), mimetype='text/plain')
+
+@app.route('/api/inference_stats')
+def get_inference_stats():
+    """Get micro-batching queue depth, batch sizes and wait times per model"""
+    return jsonify({disease: batcher.stats() for disease, batcher in batchers.items()})
+
+@app.route('/api/forecast_cache')
+def get_forecast_cache_stats():
+    """Get forecast cache hit/miss counters and precomputed table reads"""
+    stats = forecast_cache.stats()
+    stats['table'] = forecast_table.stats()
+    return jsonify(stats)
+
+def status_datasets():
+    """{disease: Dataset} for every disease with a loaded model and data
+
+    Never loads a model: in lazy startup a disease appears once its first
+    forecast request has loaded it (load_disease_model refreshes the status).
+    """
+    datasets = {}
+    for disease in Config.DISEASES:
+        if batchers.get(disease) is None:
+            continue
+        # Get historical data from the shared store
+        dataset = dataset_store.get(disease)
+        if dataset is not None:
+            datasets[disease] = dataset
+    return datasets
+
+def refresh_status():
+    """Rebuild the shared status snapshot; streams are only woken if it changed"""
+    status_data = build_current_status(status_datasets())
+    return status_broadcaster.publish({entry['disease']: entry for entry in status_data})
+
 @app.route('/api/current_status')
 def get_current_status():
     """Get current status for all diseases"""
+    datasets = status_datasets()
     
+    return cached_json(
+        lambda: build_current_status(datasets),
+        ('status', [(disease, dataset.version) for disease, dataset in datasets.items()]),
+        last_modified=newest_mtime(*(dataset.filepath for dataset in datasets.values())),
+        max_age=Config.HTTP_CACHE_MAX_AGE
+    )
+
+def build_current_status(datasets):
+    """Latest cases and weekly trend for each loaded disease dataset"""
     status_data = []
     
-    for disease in Config.DISEASES:
+    for disease, dataset in datasets.items():
         try:
-            if disease not in models:
-                continue
-            
-            # Load historical data
-            data_file = os.path.join(Config.DATA_PATH, f'{disease.lower()}_historical_data.csv')
-            
-            if not os.path.exists(data_file):
-                continue
-            
-            df = pd.read_csv(data_file, parse_dates=['date'])
+            # Only the last week is needed
+            df = dataset.tail(7)
             
             # Get latest data
             latest_cases = int(df['disease_cases'].iloc[-1])
@@ -174,14 +387,26 @@ def get_current_status():
                 'disease': disease,
                 'current_cases': latest_cases,
                 'date': latest_date,
-                'trend': trend
+                'trend': trend,
+                # Same tag as the forecast endpoint's ETag: changes when the forecast would
+                'forecast_version': make_etag('forecast', disease, dataset.version, model_versions[disease])
             })
             
         except Exception as e:
             print(f"Error getting status for {disease}: {e}")
             continue
     
-    return jsonify(status_data)
+    return status_data
+
+@app.route('/api/status_stream')
+def status_stream():
+    """Server-Sent Events: the status snapshot once, then deltas whenever it changes"""
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    return app.response_class(
+        status_broadcaster.stream(last_event_id),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 @app.route('/api/climate_data/<disease>')
 def get_climate_data(disease):
@@ -191,45 +416,112 @@ def get_climate_data(disease):
         return jsonify({'error': 'Disease not found'}), 404
     
     try:
-        data_file = os.path.join(Config.DATA_PATH, f'{disease.lower()}_historical_data.csv')
+        dataset = dataset_store.get(disease)
         
-        if not os.path.exists(data_file):
+        if dataset is None:
             return jsonify({'error': 'Data not found'}), 404
         
-        df = pd.read_csv(data_file, parse_dates=['date'])
-        
-        # Get last 30 days
-        df_recent = df.tail(30)
-        
-        response = {
-            'dates': df_recent['date'].dt.strftime('%Y-%m-%d').tolist()
-        }
-        
-        # Add available climate features (CCHAIN format)
-        if 'precipitation' in df_recent.columns:
-            response['precipitation'] = df_recent['precipitation'].round(2).tolist()
-        if 'precipitation_7day' in df_recent.columns:
-            response['precipitation_7day'] = df_recent['precipitation_7day'].round(2).tolist()
-        if 'precipitation_30day' in df_recent.columns:
-            response['precipitation_30day'] = df_recent['precipitation_30day'].round(2).tolist()
-        if 'spi3' in df_recent.columns:
-            response['spi3'] = df_recent['spi3'].round(2).tolist()
-        if 'precip_anomaly' in df_recent.columns:
-            response['precip_anomaly'] = df_recent['precip_anomaly'].round(2).tolist()
-        
-        # Legacy format support
-        if 'temperature' in df_recent.columns:
-            response['temperature'] = df_recent['temperature'].round(1).tolist()
-        if 'humidity' in df_recent.columns:
-            response['humidity'] = df_recent['humidity'].round(1).tolist()
-        if 'rainfall' in df_recent.columns:
-            response['rainfall'] = df_recent['rainfall'].round(1).tolist()
-        
-        return jsonify(response)
+        return cached_json(
+            lambda: build_climate_data(dataset),
+            ('climate', disease, dataset.version),
+            last_modified=newest_mtime(dataset.filepath),
+            max_age=Config.HTTP_CACHE_MAX_AGE
+        )
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def build_climate_data(dataset):
+    """Last 30 days of the climate features present in a dataset"""
+    # Get last 30 days
+    df_recent = dataset.tail(Config.HISTORY_DAYS)
+    
+    response = {
+        'dates': df_recent['date'].dt.strftime('%Y-%m-%d').tolist()
+    }
+    
+    # Add available climate features (CCHAIN format)
+    if 'precipitation' in df_recent.columns:
+        response['precipitation'] = df_recent['precipitation'].round(2).tolist()
+    if 'precipitation_7day' in df_recent.columns:
+        response['precipitation_7day'] = df_recent['precipitation_7day'].round(2).tolist()
+    if 'precipitation_30day' in df_recent.columns:
+        response['precipitation_30day'] = df_recent['precipitation_30day'].round(2).tolist()
+    if 'spi3' in df_recent.columns:
+        response['spi3'] = df_recent['spi3'].round(2).tolist()
+    if 'precip_anomaly' in df_recent.columns:
+        response['precip_anomaly'] = df_recent['precip_anomaly'].round(2).tolist()
+    
+    # Legacy format support
+    if 'temperature' in df_recent.columns:
+        response['temperature'] = df_recent['temperature'].round(1).tolist()
+    if 'humidity' in df_recent.columns:
+        response['humidity'] = df_recent['humidity'].round(1).tolist()
+    if 'rainfall' in df_recent.columns:
+        response['rainfall'] = df_recent['rainfall'].round(1).tolist()
+    
+    return response
+
+@app.route('/api/dashboard')
+def get_dashboard():
+    """Status, forecast and climate data for all diseases (or ?diseases=A,B) in one response"""
+    requested = request.args.get('diseases')
+    diseases = [disease for disease in requested.split(',') if disease] if requested else Config.DISEASES
+    unknown = [disease for disease in diseases if disease not in Config.DISEASES]
+    if unknown:
+        return jsonify({'error': f"Disease not found: {', '.join(unknown)}"}), 404
+    
+    datasets = {}
+    errors = {}
+    for disease in diseases:
+        if get_batcher(disease) is None:
+            errors[disease] = f'{disease} model not loaded'
+            continue
+        dataset = dataset_store.get(disease)
+        if dataset is None:
+            errors[disease] = 'Historical data not found'
+            continue
+        datasets[disease] = dataset
+    
+    model_paths = [get_model_file(disease) for disease in datasets]
+    failed = {}
+    response = cached_json(
+        lambda: build_dashboard(datasets, errors, failed),
+        ('dashboard', [(disease, dataset.version, model_versions[disease])
+                       for disease, dataset in datasets.items()], errors),
+        last_modified=newest_mtime(*(dataset.filepath for dataset in datasets.values()), *model_paths),
+        max_age=Config.HTTP_CACHE_MAX_AGE
+    )
+    if failed:
+        # A forecast failed to compute: the response must not be revalidated as current
+        del response.headers['ETag']
+        response.cache_control.no_store = True
+    return response
+
+def build_dashboard(datasets, errors, failed):
+    """Combined dashboard JSON; forecasts that raise are reported in errors and recorded in failed
+    
+    Every section reads the same cached tail of each dataset, and the cached
+    forecast JSON is embedded as is rather than parsed and re-serialized.
+    """
+    forecasts = {disease: dashboard_executor.submit(forecast_json, disease, dataset)
+                 for disease, dataset in datasets.items()}
+    status = {entry['disease']: entry for entry in build_current_status(datasets)}
+    
+    sections = []
+    for disease, dataset in datasets.items():
+        try:
+            forecast = forecasts[disease].result()
+        except Exception as e:
+            failed[disease] = str(e)
+            continue
+        sections.append(
+            f'{json.dumps(disease)}: {{"status": {json.dumps(status.get(disease))}, '
+            f'"forecast": {forecast}, "climate": {json.dumps(build_climate_data(dataset))}}}'
+        )
+    
+    return '{"diseases": {' + ', '.join(sections) + '}, "errors": ' + json.dumps({**errors, **failed}) + '}'
+
 if __name__ == '__main__':
     # Initialize models on startup
     initialize_models()
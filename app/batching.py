@@ -0,0 +1,158 @@
+import time
+import queue
+import threading
+from collections import Counter, deque
+from concurrent.futures import Future
+
+import numpy as np
+
+from app.metrics import BATCH_SECONDS
+
+
+class _Request:
+    """Forecast windows queued by one caller"""
+
+    def __init__(self, windows, n_days):
+        self.windows = windows
+        self.n_days = n_days
+        self.enqueued = time.perf_counter()
+        self.future = Future()
+
+
+class MicroBatcher:
+    """Coalesces concurrent forecast requests for one model into batched forward passes
+
+    Callers from any thread submit windows; a single worker thread collects
+    requests until max_batch_size windows are queued or the oldest request has
+    waited max_wait_ms, then runs one predict_future_batch over all of them and
+    hands each caller its own rows. A single request larger than max_batch_size
+    runs as a batch of its own.
+    """
+
+    def __init__(self, model, max_batch_size=32, max_wait_ms=5.0, name='model'):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._carry = None
+        self._lock = threading.Lock()
+        self._batch_sizes = Counter()
+        self._waits_ms = deque(maxlen=1000)
+        self._requests = 0
+        self._batches = 0
+        self._max_queue_depth = 0
+
+        self._worker = threading.Thread(target=self._run, name=f'batcher-{name}', daemon=True)
+        self._worker.start()
+
+    def submit(self, last_sequences, n_days=14):
+        """Queue (n, seq_len, n_features) windows; the Future resolves to (n, n_days) predictions"""
+        request = _Request(np.asarray(last_sequences, dtype=np.float32), n_days)
+        self._queue.put(request)
+        with self._lock:
+            self._requests += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+        return request.future
+
+    def predict_future(self, last_sequence, n_days=14):
+        """Blocking drop-in for DiseaseOutbreakModel.predict_future (2D) or predict_future_batch (3D)"""
+        if last_sequence.ndim == 2:
+            return self.submit(last_sequence[np.newaxis], n_days).result()[0]
+        return self.submit(last_sequence, n_days).result()
+
+    def predict_future_batch(self, last_sequences, n_days=14):
+        """Blocking drop-in for predict_future_batch on (n, seq_len, n_features) windows"""
+        return self.submit(last_sequences, n_days).result()
+
+    def _next_request(self, timeout=None):
+        if self._carry is not None:
+            request, self._carry = self._carry, None
+            return request
+        return self._queue.get(timeout=timeout)
+
+    def _collect(self):
+        """Block for the first request, then gather more until the batch is full or the wait expires"""
+        first = self._next_request()
+        if first is None:
+            return None
+
+        batch = [first]
+        rows = len(first.windows)
+        deadline = first.enqueued + self.max_wait
+        while rows < self.max_batch_size:
+            # Past the deadline, still take whatever is already queued, without waiting
+            timeout = max(deadline - time.perf_counter(), 0)
+            try:
+                request = self._next_request(timeout=timeout)
+            except queue.Empty:
+                break
+            if request is None:
+                # Shutdown sentinel: serve this batch, then stop
+                self._queue.put(None)
+                break
+            if rows + len(request.windows) > self.max_batch_size:
+                # An overflowing request opens the next batch
+                self._carry = request
+                break
+            batch.append(request)
+            rows += len(request.windows)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        start = time.perf_counter()
+        windows = np.concatenate([request.windows for request in batch])
+        with self._lock:
+            self._batches += 1
+            self._batch_sizes[len(windows)] += 1
+            self._waits_ms.extend((start - request.enqueued) * 1000 for request in batch)
+
+        try:
+            # Later forecast days never affect earlier ones, so mixed horizons share one pass
+            with BATCH_SECONDS.time(model=self.name):
+                predictions = self.model.predict_future_batch(windows, max(r.n_days for r in batch))
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        offset = 0
+        for request in batch:
+            n = len(request.windows)
+            request.future.set_result(predictions[offset:offset + n, :request.n_days])
+            offset += n
+
+    def stats(self):
+        """Queue depth, batch size distribution and queue wait time"""
+        with self._lock:
+            waits = np.array(self._waits_ms) if self._waits_ms else np.zeros(1)
+            return {
+                'model': self.name,
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000,
+                'queue_depth': self._queue.qsize(),
+                'max_queue_depth': self._max_queue_depth,
+                'requests': self._requests,
+                'batches': self._batches,
+                'mean_batch_size': round(sum(k * v for k, v in self._batch_sizes.items()) / max(self._batches, 1), 2),
+                'batch_sizes': {str(size): count for size, count in sorted(self._batch_sizes.items())},
+                'wait_ms': {
+                    'mean': round(float(waits.mean()), 3),
+                    'p50': round(float(np.percentile(waits, 50)), 3),
+                    'p95': round(float(np.percentile(waits, 95)), 3),
+                    'max': round(float(waits.max()), 3)
+                }
+            }
+
+    def close(self):
+        """Stop the worker after queued requests are served"""
+        self._queue.put(None)
+        self._worker.join()
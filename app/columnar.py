@@ -0,0 +1,168 @@
+"""
+Columnar binary dataset format for the per-disease historical data files
+
+A dataset stored next to `name.csv` consists of:
+  name.npy        - float64 value columns, column-major so each column is contiguous
+  name.dates.npy  - datetime64 date column
+  name.json       - schema sidecar (column order, original dtypes, row count)
+
+The arrays are memory-mapped on load, so reading involves no text parsing.
+The CSV stays the fallback whenever the binary files are missing or older.
+"""
+
+import io
+import os
+import csv
+import json
+import shutil
+import numpy as np
+import pandas as pd
+
+FORMAT_VERSION = 1
+
+
+def columnar_paths(csv_path):
+    """Return (values, dates, schema) file paths for a dataset CSV path"""
+    stem = os.path.splitext(csv_path)[0]
+    return f'{stem}.npy', f'{stem}.dates.npy', f'{stem}.json'
+
+
+def has_columnar(csv_path):
+    """True if binary files exist and are at least as new as the CSV"""
+    values_path, dates_path, schema_path = columnar_paths(csv_path)
+    if not all(os.path.exists(p) for p in (values_path, dates_path, schema_path)):
+        return False
+    if not os.path.exists(csv_path):
+        return True
+    return os.path.getmtime(schema_path) >= os.path.getmtime(csv_path)
+
+
+def save_columnar(df, csv_path):
+    """Write df (a 'date' column plus numeric columns) in the columnar format"""
+    values_path, dates_path, schema_path = columnar_paths(csv_path)
+    value_columns = [col for col in df.columns if col != 'date']
+
+    values = np.asfortranarray(df[value_columns].to_numpy(dtype=np.float64))
+    dates = pd.to_datetime(df['date']).to_numpy()
+
+    schema = {
+        'format_version': FORMAT_VERSION,
+        'n_rows': int(len(df)),
+        'columns': ['date'] + value_columns,
+        'dtypes': {col: str(df[col].dtype) for col in value_columns}
+    }
+
+    np.save(values_path, values)
+    np.save(dates_path, dates)
+    # Schema is written last: its mtime marks the dataset as complete
+    with open(schema_path, 'w') as f:
+        json.dump(schema, f, indent=2)
+
+    return schema_path
+
+
+def load_schema(csv_path):
+    """Read the schema sidecar for a dataset"""
+    with open(columnar_paths(csv_path)[2]) as f:
+        return json.load(f)
+
+
+def load_columnar(csv_path, mmap=True, tail=None):
+    """Load a columnar dataset as a DataFrame without parsing any text
+
+    With tail=n only the last n rows are copied out of the memory-mapped
+    arrays; each column is contiguous, so that reads n values per column.
+    """
+    values_path, dates_path, _ = columnar_paths(csv_path)
+    schema = load_schema(csv_path)
+    if schema.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar format version in {csv_path}")
+
+    mmap_mode = 'r' if mmap or tail else None
+    values = np.load(values_path, mmap_mode=mmap_mode)
+    dates = np.load(dates_path, mmap_mode=mmap_mode)
+    if tail:
+        values, dates = np.array(values[-tail:], order='F'), np.array(dates[-tail:])
+
+    value_columns = schema['columns'][1:]
+    df = pd.DataFrame(values, columns=value_columns, copy=False)
+    df.insert(0, 'date', pd.DatetimeIndex(dates))
+
+    # Restore any non-float columns (stored as float64)
+    for col, dtype in schema['dtypes'].items():
+        if dtype != 'float64':
+            df[col] = df[col].astype(dtype)
+
+    return df
+
+
+def read_columns(csv_path):
+    """Column names of a dataset from its schema sidecar or the CSV header line only"""
+    if has_columnar(csv_path):
+        return load_schema(csv_path)['columns']
+    with open(csv_path, newline='') as f:
+        return next(csv.reader(f))
+
+
+def read_csv_tail(csv_path, n_rows, block_size=1 << 16):
+    """Last n_rows of a CSV, reading blocks backwards from the end of the file"""
+    with open(csv_path, 'rb') as f:
+        header = f.readline()
+        data_start = f.tell()
+        pos = f.seek(0, os.SEEK_END)
+        chunks = []
+        newlines = 0
+        # One newline more than n_rows: the first line read may be cut off
+        while pos > data_start and newlines <= n_rows:
+            size = min(block_size, pos - data_start)
+            pos -= size
+            f.seek(pos)
+            chunk = f.read(size)
+            chunks.append(chunk)
+            newlines += chunk.count(b'\n')
+
+    lines = b''.join(reversed(chunks)).splitlines()
+    if pos > data_start:
+        lines = lines[1:]
+    lines = [line for line in lines if line.strip()][-n_rows:]
+    return pd.read_csv(io.BytesIO(header + b'\n'.join(lines)), parse_dates=['date'])
+
+
+def load_dataset_tail(csv_path, n_rows):
+    """Last n_rows of a dataset (files are written in date order) without reading the rest"""
+    if has_columnar(csv_path):
+        return load_columnar(csv_path, tail=n_rows)
+    return read_csv_tail(csv_path, n_rows)
+
+
+def load_dataset(csv_path):
+    """Load a dataset from its columnar files if current, else from the CSV"""
+    if has_columnar(csv_path):
+        df = load_columnar(csv_path)
+    else:
+        df = pd.read_csv(csv_path, parse_dates=['date'])
+    return df
+
+
+def write_dataset(df, csv_path):
+    """Write a dataset as CSV plus the columnar binary files"""
+    df.to_csv(csv_path, index=False)
+    save_columnar(df, csv_path)
+
+
+def drop_columnar(csv_path):
+    """Remove a dataset's columnar files, e.g. after rows were appended to its CSV"""
+    for path in columnar_paths(csv_path):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def copy_dataset(src_csv, dst_csv):
+    """Copy a dataset CSV and, when present, its columnar files"""
+    shutil.copy(src_csv, dst_csv)
+    if has_columnar(src_csv):
+        for src, dst in zip(columnar_paths(src_csv), columnar_paths(dst_csv)):
+            shutil.copy(src, dst)
+    else:
+        # Drop stale binaries so the copied CSV is not shadowed
+        drop_columnar(dst_csv)
@@ -1,25 +1,66 @@
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler
+from numpy.lib.stride_tricks import sliding_window_view
 import os
 
+from app.columnar import load_dataset
+
 class DataProcessor:
     """Process historical climate and health data for disease forecasting"""
     
     def __init__(self, sequence_length=30):
         self.sequence_length = sequence_length
-        self.scaler = MinMaxScaler(feature_range=(0, 1))
+        self._scaler = None
+        # Fitted min-max scaling (x * scale_ + min_ per feature_columns entry), set by
+        # prepare_features/set_scaling or loaded from a model's inference bundle
+        self.feature_columns = None
+        self.min_ = None
+        self.scale_ = None
+        self.scaling_source = None
+    
+    @property
+    def scaler(self):
+        """scikit-learn MinMaxScaler used for fitting, created on first use"""
+        if self._scaler is None:
+            # Imported here: scikit-learn adds over a second to importing this module
+            from sklearn.preprocessing import MinMaxScaler
+            self._scaler = MinMaxScaler(feature_range=(0, 1))
+        return self._scaler
+    
+    def set_scaling(self, feature_columns, min_, scale_, source='fit'):
+        """Use these min-max parameters for transform and inverse transform"""
+        self.feature_columns = list(feature_columns)
+        self.min_ = np.asarray(min_, dtype=np.float64)
+        self.scale_ = np.asarray(scale_, dtype=np.float64)
+        self.scaling_source = source
+    
+    def inference_config(self):
+        """Fitted scaling, ordered feature list and sequence length for saving with a model"""
+        if self.scale_ is None:
+            raise ValueError("Scaler not fitted")
+        return {
+            'sequence_length': self.sequence_length,
+            'feature_columns': self.feature_columns,
+            'scaler': {'min': self.min_.tolist(), 'scale': self.scale_.tolist()}
+        }
+    
+    def load_inference_config(self, config):
+        """Adopt the scaling and window length saved with a model instead of refitting"""
+        self.sequence_length = config['sequence_length']
+        self.set_scaling(config['feature_columns'], config['scaler']['min'], config['scaler']['scale'],
+                         source='bundle')
+        return self
         
     def load_data(self, filepath):
-        """Load historical data from CSV file"""
-        df = pd.read_csv(filepath, parse_dates=['date'])
+        """Load historical data (columnar binary files if present, else the CSV)"""
+        df = load_dataset(filepath)
         df = df.sort_values('date')
         return df
     
-    def prepare_features(self, df):
-        """Prepare features for model input - supports CCHAIN data format"""
+    def get_feature_columns(self, columns):
+        """Ordered model input columns for a data file - supports CCHAIN data format"""
         # Check which feature columns are available
-        if 'temperature' in df.columns:
+        if 'temperature' in columns:
             # Original synthetic data format
             feature_columns = ['temperature', 'humidity', 'rainfall', 'disease_cases']
         else:
@@ -45,50 +86,138 @@ class DataProcessor:
                        'pharmacy_count', 'pharmacy_nearest',
                        'doctors_count', 'doctors_nearest',
                        'rwi_mean', 'rwi_median', 'rwi_std']:
-                if col in df.columns:
+                if col in columns:
                     available_features.append(col)
             
             # Always include disease_cases as the last feature
-            if 'disease_cases' in df.columns:
+            if 'disease_cases' in columns:
                 available_features.append('disease_cases')
             
             feature_columns = available_features
         
+        return feature_columns
+    
+    def extract_features(self, df):
+        """Select feature columns and fill missing values (unscaled)"""
+        feature_columns = self.get_feature_columns(df.columns)
+        
         # Handle missing values
         df_clean = df[feature_columns].copy()
         df_clean = df_clean.ffill().bfill().fillna(0)
         
-        features = df_clean.values
+        return df_clean.values
+    
+    def prepare_features(self, df):
+        """Prepare features for model input - supports CCHAIN data format
+        
+        Fits the scaler on all of df (training); see transform_last for serving.
+        """
+        features = self.extract_features(df)
         
         # Normalize features
         scaled_features = self.scaler.fit_transform(features)
+        self.set_scaling(self.get_feature_columns(df.columns), self.scaler.min_, self.scaler.scale_)
         
         return scaled_features
     
-    def create_sequences(self, data):
-        """Create sequences for LSTM/GRU input"""
-        X, y = [], []
+    def transform(self, features):
+        """Scale feature rows with the fitted parameters"""
+        return features * self.scale_ + self.min_
+    
+    def transform_last(self, df, n_rows=None):
+        """Scale only the last n_rows (default sequence_length) of df with the fitted parameters
+        
+        Missing values are filled exactly as extract_features fills the full history.
+        """
+        n_rows = n_rows or self.sequence_length
+        # Slice rows before selecting columns so only the tail is copied
+        values = df.iloc[-n_rows:][self.feature_columns].to_numpy(dtype=np.float64)
+        if np.isnan(values).any():
+            # Gaps at the start of the tail are forward-filled from earlier rows
+            values = df[self.feature_columns].ffill().iloc[-n_rows:].bfill().fillna(0).to_numpy(dtype=np.float64)
+        return self.transform(values)
+    
+    def create_sequences(self, data, output_steps=1, dtype=None):
+        """Create sequences for LSTM/GRU input
         
-        for i in range(len(data) - self.sequence_length):
-            # Input: sequence_length days of data
-            X.append(data[i:i + self.sequence_length])
-            # Output: disease cases for next day
-            y.append(data[i + self.sequence_length, -1])  # Last column is disease_cases
+        X is a strided, read-only view over data (no per-window copies). With
+        output_steps > 1, y holds the next output_steps days of disease cases for
+        each window (shape (n, output_steps)) for multi-horizon models. Pass
+        dtype=np.float32 to convert once up front instead of per batch.
+        """
+        data = np.asarray(data, dtype=dtype)
+        n_sequences = max(len(data) - self.sequence_length - output_steps + 1, 0)
         
-        return np.array(X), np.array(y)
+        if n_sequences == 0:
+            return (np.empty((0, self.sequence_length, data.shape[1]), dtype=data.dtype),
+                    np.empty((0,) if output_steps == 1 else (0, output_steps), dtype=data.dtype))
+        
+        # Input: sequence_length days of data, shape (n, sequence_length, n_features)
+        windows = sliding_window_view(data, self.sequence_length, axis=0)
+        X = windows[:n_sequences].transpose(0, 2, 1)
+        
+        # Output: disease cases for the following day(s) - last column is disease_cases
+        targets = data[self.sequence_length:, -1]
+        if output_steps == 1:
+            y = targets[:n_sequences]
+        else:
+            y = sliding_window_view(targets, output_steps)[:n_sequences]
+        
+        return X, y
     
-    def inverse_transform_predictions(self, predictions):
-        """Convert normalized predictions back to original scale"""
-        # Create dummy array with same shape as original features
-        # Get the number of features from the scaler
-        n_features = self.scaler.n_features_in_
-        dummy = np.zeros((len(predictions), n_features))
-        dummy[:, -1] = predictions.flatten()
+    def iter_sequences(self, data, output_steps=1, dtype=np.float32):
+        """Yield (X, y) windows one at a time without materializing the full tensor
+        
+        Suitable for tf.data.Dataset.from_generator.
+        """
+        X, y = self.create_sequences(data, output_steps=output_steps, dtype=dtype)
+        for i in range(len(X)):
+            yield X[i], y[i]
+    
+    def prepare_barangay_data(self, barangay_df, city_df, id_col='adm4_pcode'):
+        """Per-barangay series in the column layout of a city-level disease file
         
-        # Inverse transform
-        inversed = self.scaler.inverse_transform(dummy)
+        Features measured per barangay (iloilo_barangay_features.csv) replace the
+        city averages; columns only available city-wide (e.g. disease_cases from
+        PIDSR) are taken from city_df on the same date.
+        """
+        city_cols = [col for col in city_df.columns if col == 'date' or col not in barangay_df.columns]
+        df = barangay_df.merge(city_df[city_cols], on='date', how='inner')
+        df = df[[id_col] + list(city_df.columns)]
+        return df.sort_values([id_col, 'date']).reset_index(drop=True)
+    
+    def prepare_series_tensor(self, series_df, id_col='adm4_pcode', dtype=np.float32):
+        """Scale the last sequence_length rows of every series for batched inference
+        
+        Uses the scaling fitted on (or saved with the model for) the city-level data. Returns
+        (X, series_ids, last_dates) with X of shape (n_series, sequence_length,
+        n_features); series with fewer than sequence_length rows are skipped.
+        """
+        feature_columns = self.feature_columns or self.get_feature_columns(series_df.columns)
+        tails = series_df.groupby(id_col, sort=True).tail(self.sequence_length)
+        lengths = tails.groupby(id_col)[id_col].transform('size')
+        tails = tails[lengths == self.sequence_length].sort_values([id_col, 'date'])
+        
+        # Fill gaps within each series only, never across barangays
+        values = tails.groupby(id_col)[feature_columns].ffill()
+        values = values.groupby(tails[id_col]).bfill().fillna(0).to_numpy()
+        
+        n_series = len(tails) // self.sequence_length
+        scaled = self.transform(values).astype(dtype, copy=False)
+        X = scaled.reshape(n_series, self.sequence_length, len(feature_columns))
+        
+        series_ids = tails[id_col].to_numpy()[::self.sequence_length].tolist()
+        last_dates = tails['date'].to_numpy()[self.sequence_length - 1::self.sequence_length]
+        return X, series_ids, last_dates
+    
+    def inverse_transform_predictions(self, predictions):
+        """Convert normalized predictions back to original scale
         
-        return inversed[:, -1]
+        Accepts any shape, e.g. (n_days,) or (n_series, n_days) for batched forecasts.
+        """
+        predictions = np.asarray(predictions)
+        # Only the target column (disease_cases, last) is needed: x = (x_scaled - min) / scale
+        return (predictions - self.min_[-1]) / self.scale_[-1]
     
     def generate_sample_data(self, filepath, num_days=365):
         """Generate sample historical data for demonstration"""
@@ -0,0 +1,181 @@
+import threading
+
+from app.columnar import load_dataset, load_dataset_tail, read_columns
+from app.forecast_cache import ForecastCache
+from app.metrics import STAGE_SECONDS
+
+
+class Dataset:
+    """Immutable snapshot of one version of a historical data file
+
+    The full frame is parsed on first access to df. tail(n) reads only the
+    trailing rows (a slice of the memory-mapped columnar copy, or a backwards
+    read of the CSV) and keeps them for this version, so requests that only
+    need recent days cost O(n) rather than O(history).
+    """
+
+    def __init__(self, name, filepath, version, df=None):
+        self.name = name
+        self.filepath = filepath
+        self.version = version
+        self._df = df
+        self._tail = None
+        self._lock = threading.Lock()
+
+    @property
+    def df(self):
+        """Full history, sorted by date"""
+        if self._df is None:
+            with self._lock:
+                if self._df is None:
+                    self._df = DatasetStore.read_file(self.filepath)
+        return self._df
+
+    def tail(self, n):
+        """Last n rows by date, without parsing the rest of the file"""
+        if self._df is not None:
+            return self._df.tail(n)
+        cached = self._tail
+        if cached is None or cached[0] < n:
+            with STAGE_SECONDS.time(stage='load'):
+                df = load_dataset_tail(self.filepath, n).sort_values('date').reset_index(drop=True)
+            cached = self._tail = (n, df)
+        return cached[1].tail(n)
+
+
+class DatasetStore:
+    """Process-wide registry of parsed historical datasets with file-change reload
+
+    With a SnapshotStore, datasets are read from the active snapshot (versioned by
+    content hash) and the registered file is only the fallback when none is active.
+    Datasets registered with load=False are opened on their first get(). Loading
+    reads only the last tail_rows rows; the full history is parsed when
+    Dataset.df is first used.
+    """
+
+    def __init__(self, snapshots=None, tail_rows=30):
+        self.snapshots = snapshots
+        self.tail_rows = tail_rows
+        self._files = {}
+        self._datasets = {}
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+        self._listeners = []
+
+    @staticmethod
+    def read_file(filepath):
+        """Load a historical data file the same way DataProcessor.load_data does"""
+        with STAGE_SECONDS.time(stage='load'):
+            df = load_dataset(filepath)
+            df = df.sort_values('date').reset_index(drop=True)
+        return df
+
+    def register(self, name, filepath, load=True):
+        """Track a data file under name and, unless load=False, load it if it exists"""
+        with self._lock:
+            self._files[name] = filepath
+        if not load:
+            return None
+        return self.reload(name)
+
+    def columns(self, name):
+        """Column names of the active data for name without parsing it, or None if missing"""
+        filepath, version = self.resolve(name)
+        if version is None:
+            return None
+        return read_columns(filepath)
+
+    def resolve(self, name):
+        """Return (path, version) of the data currently active for name"""
+        if self.snapshots is not None:
+            # Snapshots key datasets by lowercase disease name, like the data file names
+            resolved = self.snapshots.resolve(name.lower())
+            if resolved is not None:
+                return resolved
+        filepath = self._files[name]
+        return filepath, ForecastCache.file_version(filepath)
+
+    def reload(self, name):
+        """Re-read the active data for name and atomically swap in the new snapshot"""
+        filepath, version = self.resolve(name)
+        if version is None:
+            with self._lock:
+                self._datasets.pop(name, None)
+            return None
+
+        dataset = Dataset(name, filepath, version)
+        # Reading the tail checks the new file is readable before it replaces the old one
+        dataset.tail(self.tail_rows)
+        with self._lock:
+            self._datasets[name] = dataset
+        return dataset
+
+    def get(self, name):
+        """Return the current Dataset snapshot for name, loading it on first use
+
+        Returns None if name is not registered or its file does not exist.
+        """
+        dataset = self._datasets.get(name)
+        if dataset is not None or name not in self._files:
+            return dataset
+        with self._load_lock:
+            # Another thread may have loaded it while we waited
+            dataset = self._datasets.get(name)
+            if dataset is None:
+                dataset = self.reload(name)
+        return dataset
+
+    def check_for_changes(self):
+        """Reload every dataset whose active version differs from the loaded one"""
+        reloaded = []
+        # Datasets never loaded are left to their first get()
+        for name in list(self._datasets):
+            current = self._datasets.get(name)
+            try:
+                filepath, version = self.resolve(name)
+            except Exception as e:
+                print(f"Error resolving {name} dataset: {e}")
+                continue
+            if version == (current.version if current else None):
+                continue
+            try:
+                self.reload(name)
+                reloaded.append(name)
+                print(f"✓ Reloaded {name} dataset from {filepath}")
+            except Exception as e:
+                # Keep serving the previous snapshot if the new file is unreadable
+                print(f"Error reloading {name} dataset: {e}")
+        return reloaded
+
+    def add_listener(self, callback):
+        """Call callback(reloaded_names) after every watcher poll, even when nothing was reloaded"""
+        self._listeners.append(callback)
+
+    def start_watcher(self, interval=5.0):
+        """Poll registered files in a daemon thread and reload them on change"""
+        if self._watcher is not None and self._watcher.is_alive():
+            return self._watcher
+
+        self._stop.clear()
+
+        def watch():
+            while not self._stop.wait(interval):
+                reloaded = self.check_for_changes()
+                for callback in self._listeners:
+                    try:
+                        callback(reloaded)
+                    except Exception as e:
+                        print(f"Error in dataset listener: {e}")
+
+        self._watcher = threading.Thread(target=watch, name='dataset-watcher', daemon=True)
+        self._watcher.start()
+        return self._watcher
+
+    def stop_watcher(self):
+        """Stop the background watcher thread"""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
@@ -0,0 +1,77 @@
+import json
+import os
+import threading
+
+from app.metrics import STAGE_SECONDS
+
+
+class ForecastCache:
+    """In-memory cache of forecast responses keyed by disease and file versions"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def file_version(filepath):
+        """Cheap version stamp for a file: (mtime_ns, size), or None if missing"""
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def make_key(self, disease, data_version, model_version):
+        """Build a cache key that changes whenever the data or model version changes"""
+        return (disease, data_version, model_version)
+
+    def get(self, key):
+        """Return the cached JSON string for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key[0])
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, key, response):
+        """Serialize a response dict once (or take JSON as is) and store it, replacing any stale entry"""
+        if isinstance(response, str):
+            payload = response
+        else:
+            with STAGE_SECONDS.time(stage='serialize'):
+                payload = json.dumps(response)
+        with self._lock:
+            # One entry per disease: a new data/model version evicts the old one
+            self._entries[key[0]] = (key, payload)
+        return payload
+
+    def get_or_compute(self, disease, data_version, model_version, compute):
+        """Return cached JSON for disease, calling compute() to fill a miss"""
+        key = self.make_key(disease, data_version, model_version)
+        payload = self.get(key)
+        if payload is None:
+            payload = self.put(key, compute())
+        return payload
+
+    def invalidate(self, disease=None):
+        """Drop the cached entry for one disease, or all entries"""
+        with self._lock:
+            if disease is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(disease, None)
+
+    def stats(self):
+        """Return hit/miss counters and the diseases currently cached"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+                'cached_diseases': sorted(self._entries.keys())
+            }
@@ -0,0 +1,97 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS forecasts (
+    key TEXT PRIMARY KEY,
+    disease TEXT NOT NULL,
+    data_version TEXT NOT NULL,
+    model_version TEXT NOT NULL,
+    alert_level TEXT,
+    computed_at TEXT NOT NULL,
+    payload TEXT NOT NULL
+)
+"""
+
+
+def version_stamp(version):
+    """Serialize a data/model version (hash string or (mtime_ns, size) tuple) for storage"""
+    return json.dumps(version)
+
+
+class ForecastTable:
+    """Precomputed forecast responses in a SQLite table keyed by forecast name
+
+    precompute_forecasts.py writes one row per forecast ('Dengue',
+    'Dengue:barangays', ...) stamped with the data and model versions it was
+    computed from. get() only returns a row whose stamps match the versions
+    the caller currently serves; otherwise the row is stale and the caller
+    falls back to live inference.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale = 0
+        self.missing = 0
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.execute(SCHEMA)
+        return connection
+
+    def get(self, key, data_version, model_version):
+        """Return the stored JSON payload for key if it matches both versions, else None"""
+        try:
+            with self._connect() as connection:
+                row = connection.execute(
+                    'SELECT data_version, model_version, payload FROM forecasts WHERE key = ?', (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error reading forecast table: {e}")
+            row = None
+
+        with self._lock:
+            if row is None:
+                self.missing += 1
+                return None
+            if (row[0], row[1]) != (version_stamp(data_version), version_stamp(model_version)):
+                self.stale += 1
+                return None
+            self.hits += 1
+        return row[2]
+
+    def is_fresh(self, key, data_version, model_version):
+        """True if key is stored for exactly these versions (does not count as a read)"""
+        with self._connect() as connection:
+            row = connection.execute(
+                'SELECT data_version, model_version FROM forecasts WHERE key = ?', (key,)
+            ).fetchone()
+        return row == (version_stamp(data_version), version_stamp(model_version))
+
+    def put(self, key, disease, data_version, model_version, response):
+        """Store (or replace) the response dict for key; returns its JSON payload"""
+        payload = json.dumps(response)
+        with self._connect() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO forecasts VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, disease, version_stamp(data_version), version_stamp(model_version),
+                 response.get('alert_level'), datetime.now().strftime('%Y-%m-%d %H:%M:%S'), payload)
+            )
+        return payload
+
+    def entries(self):
+        """Stored rows without payloads, for status reporting"""
+        with self._connect() as connection:
+            rows = connection.execute(
+                'SELECT key, disease, alert_level, computed_at FROM forecasts ORDER BY key'
+            ).fetchall()
+        return [dict(zip(('key', 'disease', 'alert_level', 'computed_at'), row)) for row in rows]
+
+    def stats(self):
+        """Read counters: served from the table, stale rows, and keys not in the table"""
+        with self._lock:
+            return {'hits': self.hits, 'stale': self.stale, 'missing': self.missing}
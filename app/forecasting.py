@@ -0,0 +1,242 @@
+"""
+Forecast responses shared by the API (app.py) and the batch scoring job
+(precompute_forecasts.py)
+
+The build_* functions take any model object with predict_future (one series)
+and predict_future_batch (many series): a loaded model, or the API's
+MicroBatcher in front of one.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+
+from app.data_utils import DataProcessor
+from app.inference import NumpyForecastModel, load_inference_config
+from app.metrics import STAGE_SECONDS
+from app.snapshots import resolve_dataset
+from config import Config
+
+MODEL_DIR = os.path.dirname(Config.MODEL_PATH)
+# Trailing rows a forecast reads: the model input window and the history in the response.
+# Prefetched by DatasetStore; a model bundled with a longer window reads its own (see tail_rows)
+TAIL_ROWS = max(Config.SEQUENCE_LENGTH, Config.HISTORY_DAYS)
+
+
+def get_data_file(disease):
+    """Path to the active historical data file for a disease"""
+    return os.path.join(Config.DATA_PATH, f'{disease.lower()}_historical_data.csv')
+
+
+def get_served_data_file(disease):
+    """File the data for a disease is served from: the active snapshot's copy, else get_data_file"""
+    return resolve_dataset(disease.lower(), get_data_file(disease), Config.SNAPSHOT_PATH)
+
+
+def get_model_file(disease):
+    """Path to the trained model file for a disease"""
+    return os.path.join(MODEL_DIR, f'{disease.lower()}_forecast_model.h5')
+
+
+def load_forecast_model(model_path, n_features, sequence_length=Config.SEQUENCE_LENGTH):
+    """Load a trained model with the configured inference backend
+
+    sequence_length is the model's input window (the data processor's, which
+    a bundled model sets from its checkpoint).
+    """
+    if Config.INFERENCE_BACKEND == 'numpy':
+        try:
+            model = NumpyForecastModel(sequence_length=sequence_length, n_features=n_features)
+            model.load_model(model_path)
+            return model
+        except NotImplementedError as e:
+            print(f"NumPy backend cannot run {model_path} ({e}); using Keras")
+
+    # TensorFlow is only imported when the Keras backend is needed
+    from app.model import DiseaseOutbreakModel
+    model = DiseaseOutbreakModel(
+        sequence_length=sequence_length,
+        n_features=n_features,
+        model_type='LSTM'
+    )
+    model.load_model(model_path)
+    return model
+
+
+def load_data_processor(model_path):
+    """DataProcessor with the scaling saved in the model's inference bundle
+
+    Checkpoints saved without a bundle get an unfitted processor; the build_*
+    functions fit a copy of it on the served history instead (see fit_scaling).
+    """
+    data_processor = DataProcessor(sequence_length=Config.SEQUENCE_LENGTH)
+    config = load_inference_config(model_path)
+    if config is not None:
+        data_processor.load_inference_config(config)
+    else:
+        print(f"{model_path} has no saved scaler; fitting on the served data "
+              f"(run python train_model.py --bundle-only)")
+    return data_processor
+
+
+def fit_scaling(df, data_processor):
+    """(processor, scaled df) with the scaling refit on df, for models saved without a bundle
+
+    The processor is a new one: the shared per-disease processor is never
+    refit, so concurrent forecasts cannot see each other's scaling. Forecasts
+    are cached per data version, so this runs about once per version.
+    """
+    fitted = DataProcessor(sequence_length=data_processor.sequence_length)
+    with STAGE_SECONDS.time(stage='scaler_fit'):
+        scaled = fitted.prepare_features(df)
+    return fitted, scaled
+
+
+def scale_inputs(df, data_processor):
+    """(processor, scaled model input window): the last sequence_length rows of df
+
+    The returned processor holds the scaling used and inverse-transforms the forecast.
+    """
+    if data_processor.scaling_source == 'bundle':
+        # Training-time scaling: only the input window is transformed
+        with STAGE_SECONDS.time(stage='feature_prep'):
+            return data_processor, data_processor.transform_last(df, data_processor.sequence_length)
+    # No saved scaling: refit over the full history as the model was trained
+    fitted, scaled = fit_scaling(df, data_processor)
+    return fitted, scaled[-fitted.sequence_length:]
+
+
+def tail_rows(data_processor):
+    """Trailing rows a forecast with this processor reads"""
+    return max(data_processor.sequence_length, Config.HISTORY_DAYS)
+
+
+def forecast_input(dataset, data_processor):
+    """Rows of a Dataset that build_forecast needs
+
+    With scaling saved in the model that is only the last tail_rows rows;
+    otherwise the scaler is refit, which needs the full history.
+    """
+    if data_processor.scaling_source == 'bundle':
+        return dataset.tail(tail_rows(data_processor))
+    return dataset.df
+
+
+def alert_level(historical_cases, predicted_cases):
+    """(level, message) from the peak forecast relative to the recent average"""
+    avg_cases = np.mean(historical_cases)
+    max_predicted = np.max(predicted_cases)
+
+    if max_predicted > avg_cases * 2:
+        return 'HIGH', f'High outbreak risk detected! Predicted cases may reach {int(max_predicted)} cases.'
+    if max_predicted > avg_cases * 1.5:
+        return 'MEDIUM', f'Moderate outbreak risk. Predicted cases may reach {int(max_predicted)} cases.'
+    return 'LOW', f'Low outbreak risk. Cases expected to remain around {int(max_predicted)} cases.'
+
+
+def forecast_dates(last_date, n_days=Config.FORECAST_DAYS):
+    return [(last_date + timedelta(days=i+1)).strftime('%Y-%m-%d') for i in range(n_days)]
+
+
+def build_forecast(disease, df, data_processor, model):
+    """Run the full forecast pipeline for a disease and return the response dict"""
+    # Get last sequence for prediction
+    data_processor, last_sequence = scale_inputs(df, data_processor)
+
+    # Make forecast
+    predictions = model.predict_future(last_sequence, n_days=Config.FORECAST_DAYS)
+
+    # Inverse transform predictions
+    with STAGE_SECONDS.time(stage='inverse_transform'):
+        predicted_cases = data_processor.inverse_transform_predictions(predictions)
+
+    # Get historical data for context (last 30 days)
+    historical_dates = df['date'].tail(Config.HISTORY_DAYS).dt.strftime('%Y-%m-%d').tolist()
+    historical_cases = df['disease_cases'].tail(Config.HISTORY_DAYS).tolist()
+
+    level, message = alert_level(historical_cases, predicted_cases)
+
+    return {
+        'disease': disease,
+        'forecast_dates': forecast_dates(df['date'].iloc[-1]),
+        'predicted_cases': [int(max(0, x)) for x in predicted_cases],
+        'historical_dates': historical_dates,
+        'historical_cases': historical_cases,
+        'alert_level': level,
+        'alert_message': message,
+        'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+def population_shares(barangay_df, series_ids, id_col='adm4_pcode'):
+    """(shares, basis): each barangay's fraction of the total population of series_ids
+
+    Uses the latest pop_count_total per barangay; barangays without one get the
+    mean of the others. Falls back to equal shares ('equal') when the
+    population was not ingested.
+    """
+    if 'pop_count_total' in barangay_df.columns:
+        latest = barangay_df.sort_values('date').groupby(id_col)['pop_count_total'].last()
+        population = latest.reindex(series_ids).to_numpy(dtype=float)
+        known = np.isfinite(population) & (population > 0)
+        if known.any():
+            population = np.where(known, population, population[known].mean())
+            return population / population.sum(), 'population'
+    return np.full(len(series_ids), 1.0 / len(series_ids)), 'equal'
+
+
+def build_barangay_forecast(disease, df, barangay_df, data_processor, model, names=None):
+    """Forecast every barangay series for a disease in one batched call
+
+    Cases are only reported city-wide, so the model forecasts city-wide counts
+    from each barangay's features. Each barangay's forecast is apportioned by
+    its population share, so predicted_cases estimate cases in that barangay
+    rather than repeating a city-wide total.
+    """
+    names = names or {}
+    # The model was trained on the city-level series, so scale with that fit
+    if data_processor.scaling_source != 'bundle':
+        data_processor, _ = fit_scaling(df, data_processor)
+
+    with STAGE_SECONDS.time(stage='feature_prep'):
+        series_df = data_processor.prepare_barangay_data(barangay_df, df)
+        X, series_ids, last_dates = data_processor.prepare_series_tensor(series_df)
+    if len(series_ids) == 0:
+        raise ValueError(f'No barangay has {data_processor.sequence_length} days of data')
+
+    predictions = model.predict_future_batch(X, n_days=Config.FORECAST_DAYS)
+    with STAGE_SECONDS.time(stage='inverse_transform'):
+        predicted_cases = np.maximum(data_processor.inverse_transform_predictions(predictions), 0)
+        shares, basis = population_shares(barangay_df, series_ids)
+        predicted_cases = predicted_cases * shares[:, None]
+
+    # Fractional: a barangay's share of the city forecast is often below one case a day
+    rows = [
+        {
+            'adm4_pcode': code,
+            'barangay': names.get(code, code),
+            'population_share': round(float(share), 5),
+            'predicted_cases': [round(float(x), 2) for x in cases],
+            'peak_cases': round(float(cases.max()), 2)
+        }
+        for code, share, cases in zip(series_ids, shares, predicted_cases)
+    ]
+    rows.sort(key=lambda row: row['peak_cases'], reverse=True)
+
+    return {
+        'disease': disease,
+        'forecast_dates': forecast_dates(pd.Timestamp(last_dates.max())),
+        'n_barangays': len(rows),
+        'apportioned_by': basis,
+        'barangays': rows,
+        'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+def read_barangay_names(location_file=Config.LOCATION_FILE):
+    """{adm4_pcode: barangay name} from location.csv, empty if missing"""
+    if not os.path.exists(location_file):
+        return {}
+    locations = pd.read_csv(location_file, usecols=['adm4_pcode', 'adm4_en'])
+    return dict(zip(locations['adm4_pcode'], locations['adm4_en']))
@@ -0,0 +1,140 @@
+"""
+HTTP validators, cache headers and response compression for the JSON API
+
+Responses are identified by the data/model versions they were built from:
+the ETag is a hash of those versions and Last-Modified the newest file
+modification time, so a conditional request can be answered 304 Not Modified
+before any payload is built. ResponseCompressor (an after_request hook)
+negotiates brotli (when the optional brotli package is installed) or gzip and
+keeps recently compressed bodies per ETag.
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from flask import request, Response
+from werkzeug.http import is_resource_modified
+
+from app.metrics import STAGE_SECONDS
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = {'application/json', 'text/html'}
+MIN_COMPRESS_BYTES = 512
+
+
+def make_etag(*versions):
+    """Opaque tag for a response built from these data/model versions"""
+    return hashlib.sha1(json.dumps(versions, default=str).encode()).hexdigest()[:20]
+
+
+def newest_mtime(*paths):
+    """Latest modification time among the existing paths, or None"""
+    mtimes = []
+    for path in paths:
+        try:
+            mtimes.append(os.path.getmtime(path))
+        except (OSError, TypeError):
+            continue
+    return max(mtimes) if mtimes else None
+
+
+def http_date(timestamp):
+    """datetime for a Last-Modified header from a POSIX timestamp (None stays None)"""
+    if timestamp is None:
+        return None
+    # HTTP dates have one-second resolution
+    return datetime.fromtimestamp(int(timestamp), tz=timezone.utc)
+
+
+def cached_json(build, versions, last_modified=None, max_age=60):
+    """JSON response with validators for versions, or 304 if the client's copy is current
+
+    build() returns the JSON string (or a dict) and is only called when the
+    client has no current copy. last_modified is a POSIX timestamp.
+    """
+    etag = make_etag(*versions)
+    last_modified = http_date(last_modified)
+
+    # Weak tags: the same payload is served under different content encodings
+    if not is_resource_modified(request.environ, etag=f'W/"{etag}"', last_modified=last_modified):
+        response = Response(status=304)
+    else:
+        payload = build()
+        if not isinstance(payload, str):
+            with STAGE_SECONDS.time(stage='serialize'):
+                payload = json.dumps(payload)
+        response = Response(payload, mimetype='application/json')
+
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    response.cache_control.must_revalidate = True
+    return response
+
+
+class ResponseCompressor:
+    """gzip/brotli content negotiation with a small per-ETag cache of compressed bodies"""
+
+    def __init__(self, level=6, max_entries=128):
+        self.level = level
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def choose_encoding(self):
+        """Best encoding the client accepts: br (if available), then gzip, else None"""
+        accepted = request.accept_encodings
+        if brotli is not None and accepted['br']:
+            return 'br'
+        if accepted['gzip']:
+            return 'gzip'
+        return None
+
+    def compress(self, data, encoding):
+        if encoding == 'br':
+            return brotli.compress(data, quality=5)
+        return gzip.compress(data, compresslevel=self.level)
+
+    def __call__(self, response):
+        """after_request hook: compress eligible responses in place"""
+        if (response.status_code != 200 or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_TYPES):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self.choose_encoding()
+        data = response.get_data()
+        if encoding is None or len(data) < MIN_COMPRESS_BYTES:
+            return response
+
+        etag, _ = response.get_etag()
+        key = (etag, encoding)
+        body = None
+        if etag:
+            with self._lock:
+                body = self._cache.get(key)
+                if body is not None:
+                    self._cache.move_to_end(key)
+        if body is None:
+            body = self.compress(data, encoding)
+            if etag:
+                with self._lock:
+                    self._cache[key] = body
+                    if len(self._cache) > self.max_entries:
+                        self._cache.popitem(last=False)
+
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        return response
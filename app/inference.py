@@ -0,0 +1,274 @@
+"""
+TensorFlow-free inference for the forecast models
+
+NumpyForecastModel reads the .h5 checkpoint written by
+DiseaseOutbreakModel.save_model (layer config + weights via h5py) and runs the
+Sequential LSTM/GRU -> Dense stack built by build_model as vectorized NumPy:
+input projections for all timesteps are one matmul per layer, and only the
+recurrence loops over the sequence. Dropout is a no-op at inference.
+"""
+
+import json
+import numpy as np
+import h5py
+
+from app.metrics import STAGE_SECONDS
+
+
+def sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def hard_sigmoid(x):
+    return np.clip(0.2 * x + 0.5, 0.0, 1.0)
+
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    None: lambda x: x,
+    'tanh': np.tanh,
+    'sigmoid': sigmoid,
+    'hard_sigmoid': hard_sigmoid,
+    'relu': lambda x: np.maximum(x, 0)
+}
+
+
+class ForecastMixin:
+    """Multi-day forecasting on top of a forward(X) -> (n, output_steps) method
+
+    Shared by the Keras and NumPy backends; needs sequence_length, n_features
+    and output_steps attributes.
+    """
+
+    def predict_future(self, last_sequence, n_days=14):
+        """Predict multiple days into the future"""
+        return self.predict_future_batch(last_sequence[np.newaxis], n_days)[0]
+
+    def predict_future_batch(self, last_sequences, n_days=14):
+        """Forecast many series at once; last_sequences is (n_series, seq_len, n_features)
+
+        Each step is a single forward pass over all series, so n_days passes in
+        total regardless of how many series are forecast. Returns (n_series, n_days).
+        """
+        if self.output_steps > 1:
+            return self.predict_direct_batch(last_sequences, n_days)
+
+        n_series = len(last_sequences)
+        predictions = np.empty((n_series, n_days), dtype=np.float32)
+
+        # Preallocate room for the input windows plus every predicted day, so the
+        # windows can slide forward without reallocating (replaces np.vstack per step)
+        buffer = np.empty((n_series, self.sequence_length + n_days, self.n_features), dtype=last_sequences.dtype)
+        buffer[:, :self.sequence_length] = last_sequences
+
+        for step in range(n_days):
+            # Predict next day for every series
+            windows = buffer[:, step:step + self.sequence_length]
+            with STAGE_SECONDS.time(stage='inference_step'):
+                next_pred = self.forward(windows)[:, 0]
+            predictions[:, step] = next_pred
+
+            # Append new rows: other features are kept constant (could be improved with climate forecasts)
+            new_rows = buffer[:, step + self.sequence_length]
+            new_rows[:] = windows[:, -1]
+            new_rows[:, -1] = next_pred  # Update disease cases
+
+        return predictions
+
+    def predict_direct(self, last_sequence, n_days=14):
+        """Predict all horizon days in one forward pass with a multi-horizon head"""
+        return self.predict_direct_batch(last_sequence[np.newaxis], n_days)[0]
+
+    def predict_direct_batch(self, last_sequences, n_days=14):
+        """Multi-horizon forecast for (n_series, seq_len, n_features) in one forward pass"""
+        if n_days > self.output_steps:
+            raise ValueError(f"Model forecasts {self.output_steps} days, {n_days} requested")
+
+        windows = last_sequences[:, -self.sequence_length:]
+        return self.forward(windows)[:, :n_days]
+
+
+class LSTMLayer:
+    """Keras LSTM forward pass (gate order i, f, c, o)"""
+
+    def __init__(self, config, weights):
+        self.units = config['units']
+        self.return_sequences = config.get('return_sequences', False)
+        self.activation = ACTIVATIONS[config.get('activation', 'tanh')]
+        self.recurrent_activation = ACTIVATIONS[config.get('recurrent_activation', 'sigmoid')]
+        self.kernel = weights['kernel']
+        self.recurrent_kernel = weights['recurrent_kernel']
+        self.bias = weights.get('bias', np.zeros(4 * self.units, dtype=np.float32))
+
+    def __call__(self, x):
+        n, steps, _ = x.shape
+        u = self.units
+        # Input contribution for every timestep in one matmul, time-major so each step is contiguous
+        projected = np.ascontiguousarray(x.transpose(1, 0, 2)) @ self.kernel + self.bias
+        h = np.zeros((n, u), dtype=x.dtype)
+        c = np.zeros((n, u), dtype=x.dtype)
+        outputs = np.empty((steps, n, u), dtype=x.dtype) if self.return_sequences else None
+
+        for t in range(steps):
+            z = projected[t] + h @ self.recurrent_kernel
+            # One activation call covers the i, f and o gates
+            gates = self.recurrent_activation(z)
+            c = gates[:, u:2 * u] * c + gates[:, :u] * self.activation(z[:, 2 * u:3 * u])
+            h = gates[:, 3 * u:] * self.activation(c)
+            if outputs is not None:
+                outputs[t] = h
+
+        return outputs.transpose(1, 0, 2) if outputs is not None else h
+
+
+class GRULayer:
+    """Keras GRU forward pass (gate order z, r, h; reset_after as configured)"""
+
+    def __init__(self, config, weights):
+        self.units = config['units']
+        self.return_sequences = config.get('return_sequences', False)
+        self.reset_after = config.get('reset_after', True)
+        self.activation = ACTIVATIONS[config.get('activation', 'tanh')]
+        self.recurrent_activation = ACTIVATIONS[config.get('recurrent_activation', 'sigmoid')]
+        self.kernel = weights['kernel']
+        self.recurrent_kernel = weights['recurrent_kernel']
+        bias = weights.get('bias', np.zeros((2, 3 * self.units) if self.reset_after else 3 * self.units,
+                                            dtype=np.float32))
+        if self.reset_after:
+            # Separate input and recurrent biases, shape (2, 3 * units)
+            self.input_bias, self.recurrent_bias = bias[0], bias[1]
+        else:
+            self.input_bias, self.recurrent_bias = bias, np.zeros_like(bias)
+
+    def __call__(self, x):
+        n, steps, _ = x.shape
+        u = self.units
+        projected = np.ascontiguousarray(x.transpose(1, 0, 2)) @ self.kernel + self.input_bias
+        h = np.zeros((n, u), dtype=x.dtype)
+        outputs = np.empty((steps, n, u), dtype=x.dtype) if self.return_sequences else None
+
+        for t in range(steps):
+            x_t = projected[t]
+            if self.reset_after:
+                rec = h @ self.recurrent_kernel + self.recurrent_bias
+                z = self.recurrent_activation(x_t[:, :u] + rec[:, :u])
+                r = self.recurrent_activation(x_t[:, u:2 * u] + rec[:, u:2 * u])
+                candidate = self.activation(x_t[:, 2 * u:] + r * rec[:, 2 * u:])
+            else:
+                rec = h @ self.recurrent_kernel[:, :2 * u]
+                z = self.recurrent_activation(x_t[:, :u] + rec[:, :u])
+                r = self.recurrent_activation(x_t[:, u:2 * u] + rec[:, u:])
+                candidate = self.activation(x_t[:, 2 * u:] + (r * h) @ self.recurrent_kernel[:, 2 * u:])
+            h = z * h + (1 - z) * candidate
+            if outputs is not None:
+                outputs[t] = h
+
+        return outputs.transpose(1, 0, 2) if outputs is not None else h
+
+
+class DenseLayer:
+    """Keras Dense forward pass"""
+
+    def __init__(self, config, weights):
+        self.activation = ACTIVATIONS[config.get('activation', 'linear')]
+        self.kernel = weights['kernel']
+        self.bias = weights.get('bias')
+
+    def __call__(self, x):
+        y = x @ self.kernel
+        if self.bias is not None:
+            y = y + self.bias
+        return self.activation(y)
+
+
+LAYER_TYPES = {'LSTM': LSTMLayer, 'GRU': GRULayer, 'Dense': DenseLayer}
+PASSTHROUGH_LAYERS = {'InputLayer', 'Dropout'}
+
+
+def read_layer_weights(group):
+    """{'kernel': ..., 'recurrent_kernel': ..., 'bias': ...} for one layer group of an .h5 file"""
+    weights = {}
+    for weight_name in group.attrs.get('weight_names', []):
+        if isinstance(weight_name, bytes):
+            weight_name = weight_name.decode()
+        # 'sequential/lstm/lstm_cell/kernel' (Keras 3) or 'lstm/lstm_cell/kernel:0' (Keras 2)
+        key = weight_name.split('/')[-1].split(':')[0]
+        weights[key] = np.asarray(group[weight_name], dtype=np.float32)
+    return weights
+
+
+# .h5 file attribute holding the inference bundle metadata (scaler, features, window length)
+BUNDLE_ATTR = 'healthtrace_inference'
+
+
+def save_inference_config(filepath, config):
+    """Store DataProcessor.inference_config() inside a saved .h5 checkpoint
+
+    The checkpoint then carries everything needed to serve it: weights, the
+    scaling fitted at training time, the ordered feature list and the sequence
+    length. Keras ignores the extra attribute when loading.
+    """
+    with h5py.File(filepath, 'a') as f:
+        f.attrs[BUNDLE_ATTR] = json.dumps(config)
+
+
+def load_inference_config(filepath):
+    """Inference bundle metadata of a checkpoint, or None for checkpoints saved without it"""
+    with h5py.File(filepath, 'r') as f:
+        config = f.attrs.get(BUNDLE_ATTR)
+    if config is None:
+        return None
+    return json.loads(config)
+
+
+class NumpyForecastModel(ForecastMixin):
+    """Inference-only DiseaseOutbreakModel replacement that never imports TensorFlow"""
+
+    def __init__(self, sequence_length=30, n_features=4, model_type='LSTM', output_steps=1):
+        self.sequence_length = sequence_length
+        self.n_features = n_features
+        self.model_type = model_type
+        self.output_steps = output_steps
+        self.layers = None
+
+    def load_model(self, filepath):
+        """Load layer config and weights from a Keras .h5 checkpoint"""
+        with h5py.File(filepath, 'r') as f:
+            config = json.loads(f.attrs['model_config'])
+            if config['class_name'] != 'Sequential':
+                raise NotImplementedError(f"Unsupported model class {config['class_name']}")
+            weights_root = f['model_weights'] if 'model_weights' in f else f
+
+            layers = []
+            input_shape = None
+            for layer in config['config']['layers']:
+                class_name, layer_config = layer['class_name'], layer['config']
+                # Keras 3 keeps the input shape on InputLayer, Keras 2 on the first layer
+                shape = layer_config.get('batch_shape') or layer_config.get('batch_input_shape')
+                if input_shape is None and shape is not None:
+                    input_shape = shape
+                if class_name in PASSTHROUGH_LAYERS:
+                    continue
+                if class_name not in LAYER_TYPES:
+                    raise NotImplementedError(f"Unsupported layer type {class_name}")
+                weights = read_layer_weights(weights_root[layer_config['name']])
+                layers.append(LAYER_TYPES[class_name](layer_config, weights))
+                if class_name in ('LSTM', 'GRU'):
+                    self.model_type = class_name
+
+        self.layers = layers
+        if input_shape is not None:
+            self.sequence_length, self.n_features = input_shape[1], input_shape[2]
+        self.output_steps = layers[-1].kernel.shape[1]
+        print(f"Model loaded from {filepath} (NumPy backend)")
+        return self
+
+    def forward(self, X):
+        """Run one inference pass; X is (n, sequence_length, n_features)"""
+        if self.layers is None:
+            raise ValueError("Model not built or loaded")
+
+        x = np.asarray(X, dtype=np.float32)
+        for layer in self.layers:
+            x = layer(x)
+        return x
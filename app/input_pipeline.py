@@ -0,0 +1,97 @@
+import numpy as np
+import tensorflow as tf
+
+
+class SequenceDataset:
+    """Streaming tf.data input pipeline that windows disease series on the fly"""
+
+    def __init__(self, data_processor, data_files, output_steps=1, validation_split=0.2):
+        self.data_processor = data_processor
+        self.data_files = list(data_files)
+        self.output_steps = output_steps
+        self.validation_split = validation_split
+        self.feature_columns = None
+        self.n_windows = {'train': 0, 'validation': 0}
+
+    @property
+    def n_features(self):
+        return len(self.feature_columns)
+
+    @property
+    def window_length(self):
+        return self.data_processor.sequence_length + self.output_steps
+
+    def fit_scaler(self):
+        """Fit the shared scaler one series at a time (only one file in memory)"""
+        scaler = self.data_processor.scaler
+        self.n_windows = {'train': 0, 'validation': 0}
+        for filepath in self.data_files:
+            df = self.data_processor.load_data(filepath)
+            if self.feature_columns is None:
+                self.feature_columns = self.data_processor.get_feature_columns(df.columns)
+            scaler.partial_fit(self.data_processor.extract_features(df))
+
+            # Temporal split per series: the last validation_split of windows go to validation
+            n_sequences = max(len(df) - self.window_length + 1, 0)
+            n_val = int(np.ceil(n_sequences * self.validation_split))
+            self.n_windows['train'] += n_sequences - n_val
+            self.n_windows['validation'] += n_val
+        self.data_processor.set_scaling(self.feature_columns, scaler.min_, scaler.scale_)
+        return scaler
+
+    def _series(self, subset):
+        """Yield the scaled rows of each series that belong to subset"""
+        for filepath in self.data_files:
+            df = self.data_processor.load_data(filepath)
+            scaled = self.data_processor.transform(self.data_processor.extract_features(df))
+            scaled = scaled.astype(np.float32)
+
+            n_sequences = max(len(scaled) - self.window_length + 1, 0)
+            n_train = n_sequences - int(np.ceil(n_sequences * self.validation_split))
+            if subset == 'train':
+                rows = scaled[:n_train + self.window_length - 1]
+            else:
+                rows = scaled[n_train:]
+
+            if len(rows) >= self.window_length:
+                yield rows
+
+    def _split_window(self, window):
+        """Split a (window_length, n_features) window into model input and target"""
+        sequence_length = self.data_processor.sequence_length
+        X = window[:sequence_length]
+        y = window[sequence_length:, -1]
+        if self.output_steps == 1:
+            y = y[0]
+        return X, y
+
+    def build(self, subset='train', batch_size=32, shuffle_buffer=0, cache_path=None):
+        """Build a batched, prefetched tf.data.Dataset of (X, y) windows for subset
+
+        cache_path caches the windowed elements to a local file after the first
+        epoch (use a different path per subset); shuffle_buffer > 0 shuffles windows.
+        """
+        if self.feature_columns is None:
+            self.fit_scaler()
+
+        series = tf.data.Dataset.from_generator(
+            lambda: self._series(subset),
+            output_signature=tf.TensorSpec(shape=(None, self.n_features), dtype=tf.float32)
+        )
+
+        window_length = self.window_length
+        dataset = series.flat_map(
+            lambda rows: tf.data.Dataset.from_tensor_slices(rows)
+            .window(window_length, shift=1, drop_remainder=True)
+            .flat_map(lambda w: w.batch(window_length))
+        )
+        dataset = dataset.map(self._split_window, num_parallel_calls=tf.data.AUTOTUNE)
+        # Window counts are known from fit_scaler; lets Keras size epochs up front
+        dataset = dataset.apply(tf.data.experimental.assert_cardinality(self.n_windows[subset]))
+
+        if cache_path:
+            dataset = dataset.cache(cache_path)
+        if shuffle_buffer:
+            dataset = dataset.shuffle(shuffle_buffer)
+
+        return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
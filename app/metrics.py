@@ -0,0 +1,195 @@
+"""
+In-process latency metrics in the Prometheus text exposition format
+
+Histograms and gauges are kept in memory (one lock each, no extra dependency)
+and rendered by render() for the /metrics endpoint. The module-level metrics
+below are recorded from anywhere in the app:
+
+  STAGE_SECONDS       time per forecast stage: load, scaler_fit, feature_prep,
+                      inference_step, inverse_transform, serialize
+  BATCH_SECONDS       one micro-batched predict_future_batch call per model
+  MODEL_LOAD_SECONDS  how long each model took to load
+  REQUEST_SECONDS     request latency per endpoint, method and status
+  REQUESTS_IN_FLIGHT  requests currently being handled per endpoint
+"""
+
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from flask import request, g
+
+# Seconds; finer than the Prometheus defaults so single inference steps resolve
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one series per label combination"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket (non-cumulative) counts plus +Inf, then sum
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of the enclosed block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        with self._lock:
+            series = {key: (list(counts), total) for key, (counts, total) in self._series.items()}
+
+        lines = []
+        for key, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, key)} {total!r}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}')
+        return lines
+
+
+class Gauge:
+    """Value that goes up and down, one per label combination"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+                for key, value in sorted(values.items())]
+
+
+class Registry:
+    """The set of metrics rendered together on /metrics"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Every metric in the Prometheus text format"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'healthtrace_stage_duration_seconds', 'Time spent in each forecast pipeline stage', ['stage']))
+BATCH_SECONDS = REGISTRY.register(Histogram(
+    'healthtrace_inference_batch_duration_seconds', 'Micro-batched forecast forward passes per model', ['model']))
+MODEL_LOAD_SECONDS = REGISTRY.register(Gauge(
+    'healthtrace_model_load_seconds', 'Time taken to load each model', ['disease']))
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'healthtrace_http_request_duration_seconds', 'HTTP request latency', ['endpoint', 'method', 'status']))
+REQUESTS_IN_FLIGHT = REGISTRY.register(Gauge(
+    'healthtrace_http_requests_in_flight', 'HTTP requests currently being handled', ['endpoint']))
+
+
+def render():
+    return REGISTRY.render()
+
+
+class RequestMetrics:
+    """Flask hooks recording REQUEST_SECONDS and REQUESTS_IN_FLIGHT for every request"""
+
+    def init_app(self, app):
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        app.teardown_request(self.teardown_request)
+
+    @staticmethod
+    def endpoint():
+        # The route pattern, not the path, so /api/forecast/<disease> is one series
+        return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+    def before_request(self):
+        g.metrics_start = time.perf_counter()
+        g.metrics_status = 500
+        REQUESTS_IN_FLIGHT.inc(endpoint=self.endpoint())
+
+    def after_request(self, response):
+        g.metrics_status = response.status_code
+        return response
+
+    def teardown_request(self, exc):
+        start = g.pop('metrics_start', None)
+        if start is None:
+            return
+        endpoint = self.endpoint()
+        REQUESTS_IN_FLIGHT.dec(endpoint=endpoint)
+        REQUEST_SECONDS.observe(time.perf_counter() - start, endpoint=endpoint,
+                                method=request.method, status=g.pop('metrics_status', 500))
@@ -5,14 +5,19 @@ from tensorflow.keras.layers import LSTM, GRU, Dense, Dropout
 from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint
 import os
 
-class DiseaseOutbreakModel:
+from app.inference import ForecastMixin
+
+class DiseaseOutbreakModel(ForecastMixin):
     """LSTM/GRU model for disease outbreak forecasting"""
     
-    def __init__(self, sequence_length=30, n_features=4, model_type='LSTM'):
+    def __init__(self, sequence_length=30, n_features=4, model_type='LSTM', output_steps=1):
         self.sequence_length = sequence_length
         self.n_features = n_features
         self.model_type = model_type
+        # output_steps > 1 trains a direct multi-horizon head (one value per forecast day)
+        self.output_steps = output_steps
         self.model = None
+        self._forward = None
         
     def build_model(self, units=64):
         """Build LSTM or GRU model architecture"""
@@ -41,16 +46,21 @@ class DiseaseOutbreakModel:
         # Dense layers for output
         model.add(Dense(units=32, activation='relu'))
         model.add(Dropout(0.2))
-        model.add(Dense(units=1))  # Output: predicted disease cases
+        model.add(Dense(units=self.output_steps))  # Output: predicted disease cases per horizon day
         
         # Compile model
         model.compile(optimizer='adam', loss='mse', metrics=['mae'])
         
         self.model = model
+        self._forward = None
         return model
     
     def train(self, X_train, y_train, X_val, y_val, epochs=100, batch_size=32, model_path=None):
-        """Train the model"""
+        """Train the model
+        
+        X_train/X_val may also be batched tf.data.Dataset objects yielding (X, y);
+        pass y_train=y_val=None and batching comes from the datasets.
+        """
         if self.model is None:
             self.build_model()
         
@@ -65,14 +75,23 @@ class DiseaseOutbreakModel:
             )
         
         # Train model
-        history = self.model.fit(
-            X_train, y_train,
-            validation_data=(X_val, y_val),
-            epochs=epochs,
-            batch_size=batch_size,
-            callbacks=callbacks,
-            verbose=1
-        )
+        if isinstance(X_train, tf.data.Dataset):
+            history = self.model.fit(
+                X_train,
+                validation_data=X_val,
+                epochs=epochs,
+                callbacks=callbacks,
+                verbose=1
+            )
+        else:
+            history = self.model.fit(
+                X_train, y_train,
+                validation_data=(X_val, y_val),
+                epochs=epochs,
+                batch_size=batch_size,
+                callbacks=callbacks,
+                verbose=1
+            )
         
         return history
     
@@ -84,24 +103,19 @@ class DiseaseOutbreakModel:
         predictions = self.model.predict(X)
         return predictions
     
-    def predict_future(self, last_sequence, n_days=14):
-        """Predict multiple days into the future"""
-        predictions = []
-        current_sequence = last_sequence.copy()
+    def forward(self, X):
+        """Run one inference pass through a compiled graph, skipping Keras predict overhead"""
+        if self.model is None:
+            raise ValueError("Model not built or loaded")
         
-        for _ in range(n_days):
-            # Predict next day
-            next_pred = self.model.predict(current_sequence.reshape(1, self.sequence_length, self.n_features), verbose=0)
-            predictions.append(next_pred[0, 0])
-            
-            # Update sequence: remove first day, add prediction
-            # For simplicity, we keep other features constant (could be improved with climate forecasts)
-            new_row = current_sequence[-1].copy()
-            new_row[-1] = next_pred[0, 0]  # Update disease cases
-            
-            current_sequence = np.vstack([current_sequence[1:], new_row])
+        if self._forward is None:
+            # Traced once per model; later calls reuse the graph
+            self._forward = tf.function(
+                lambda x: self.model(x, training=False),
+                input_signature=[tf.TensorSpec([None, self.sequence_length, self.n_features], tf.float32)]
+            )
         
-        return np.array(predictions)
+        return self._forward(tf.convert_to_tensor(X, dtype=tf.float32)).numpy()
     
     def save_model(self, filepath):
         """Save model to file"""
@@ -118,5 +132,9 @@ class DiseaseOutbreakModel:
         self.model = tf.keras.models.load_model(filepath, compile=False)
         # Recompile with current metrics
         self.model.compile(optimizer='adam', loss='mse', metrics=['mae'])
+        self._forward = None
+        # Pick up the input window and head size the checkpoint was trained with
+        _, self.sequence_length, self.n_features = self.model.input_shape
+        self.output_steps = self.model.output_shape[-1]
         print(f"Model loaded from {filepath}")
         return self.model
@@ -0,0 +1,267 @@
+"""
+On-demand request profiling with flame-graph output
+
+RequestProfiler (Flask before/after hooks) profiles a request when it carries
+the admin token (X-Profile header or ?profile= query parameter) or is picked
+by the configured sample rate. While the request runs, a background thread
+samples the Python stacks of the request thread and of the worker threads
+that do its work (the micro-batchers and the dashboard executor), so pandas,
+NumPy and TensorFlow frames called from Python all show up. Finished profiles
+are kept in memory and exported as collapsed stacks (flamegraph.pl, speedscope
+import) or speedscope JSON.
+"""
+
+import os
+import sys
+import hmac
+import time
+import random
+import sysconfig
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime
+from urllib.parse import urlencode
+
+from flask import request, g
+
+# Threads that run work on behalf of a request (see MicroBatcher and app.dashboard_executor)
+WORKER_THREAD_PREFIXES = ('batcher-', 'dashboard')
+# A worker whose innermost frame is one of these (file suffix, function or None for any)
+# is idle, waiting for work; executor threads block in C below their _worker loop
+IDLE_FRAMES = (('threading.py', None), ('queue.py', None),
+               (os.path.join('concurrent', 'futures', 'thread.py'), '_worker'))
+# Frame paths are shown relative to the first of these that contains them
+SOURCE_ROOTS = sorted({sysconfig.get_paths()['purelib'], sysconfig.get_paths()['stdlib'],
+                       os.path.dirname(os.path.dirname(os.path.abspath(__file__)))}, key=len, reverse=True)
+_labels = {}
+
+
+def _frame_label(code):
+    """'function (path:line)', with the path relative to site-packages, the stdlib or the repo"""
+    label = _labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        for root in SOURCE_ROOTS:
+            if filename.startswith(root + os.sep):
+                filename = filename[len(root) + 1:]
+                break
+        label = _labels[code] = f'{code.co_name} ({filename}:{code.co_firstlineno})'
+    return label
+
+
+def _idle(frame):
+    code = frame.f_code
+    return any(code.co_filename.endswith(suffix) and function in (None, code.co_name)
+               for suffix, function in IDLE_FRAMES)
+
+
+def _stack(frame):
+    """Frame labels from the outermost call to frame"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+class Profile:
+    """Aggregated stack samples of one request"""
+
+    def __init__(self, profile_id, method, path, endpoint, interval):
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.endpoint = endpoint
+        self.interval = interval
+        self.created = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.status = None
+        self.duration = 0.0
+        # (thread name, frame labels...) -> number of samples
+        self.stacks = Counter()
+
+    @property
+    def samples(self):
+        return sum(self.stacks.values())
+
+    def summary(self):
+        return {
+            'id': self.id,
+            'method': self.method,
+            'path': self.path,
+            'endpoint': self.endpoint,
+            'status': self.status,
+            'created': self.created,
+            'duration_ms': round(self.duration * 1000, 2),
+            'interval_ms': self.interval * 1000,
+            'samples': self.samples
+        }
+
+    def collapsed(self):
+        """Brendan Gregg's collapsed-stack format: one 'frame;frame;... count' line per stack"""
+        return ''.join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+
+    def speedscope(self):
+        """speedscope file (https://www.speedscope.app) with one sampled profile per thread"""
+        frames = []
+        index = {}
+        by_thread = OrderedDict()
+        for (thread, *labels), count in self.stacks.most_common():
+            stack = []
+            for label in labels:
+                if label not in index:
+                    index[label] = len(frames)
+                    name, _, location = label.partition(' (')
+                    file, _, line = location.rstrip(')').rpartition(':')
+                    frames.append({'name': name, 'file': file, 'line': int(line)})
+                stack.append(index[label])
+            samples, weights = by_thread.setdefault(thread, ([], []))
+            samples.append(stack)
+            weights.append(count * self.interval)
+
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': f'{self.method} {self.path}',
+            'exporter': 'healthtrace',
+            'activeProfileIndex': 0,
+            'shared': {'frames': frames},
+            'profiles': [
+                {
+                    'type': 'sampled',
+                    'name': thread,
+                    'unit': 'seconds',
+                    'startValue': 0,
+                    'endValue': sum(weights),
+                    'samples': samples,
+                    'weights': weights
+                }
+                for thread, (samples, weights) in by_thread.items()
+            ]
+        }
+
+
+class StackSampler:
+    """Samples the stacks of one thread plus the busy worker threads until stopped
+
+    Concurrent profiled requests share the worker threads, so each one's
+    profile also includes work the workers did for the others.
+    """
+
+    def __init__(self, profile, thread_id):
+        self.profile = profile
+        self.thread_id = thread_id
+        self.thread_name = threading.current_thread().name
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.profile.duration = time.perf_counter() - self._started
+        return self.profile
+
+    def _run(self):
+        interval = self.profile.interval
+        while not self._stop.wait(interval):
+            workers = {thread.ident: thread.name for thread in threading.enumerate()
+                       if thread.name.startswith(WORKER_THREAD_PREFIXES)}
+            frames = sys._current_frames()
+            frame = frames.get(self.thread_id)
+            if frame is not None:
+                # Waits in the request thread are kept: they show time spent blocked on the workers
+                self.profile.stacks[(self.thread_name, *_stack(frame))] += 1
+            for ident, name in workers.items():
+                frame = frames.get(ident)
+                if frame is None or _idle(frame):
+                    continue
+                self.profile.stacks[(name, *_stack(frame))] += 1
+
+
+class RequestProfiler:
+    """Flask hooks that profile opted-in or sampled requests and keep the latest profiles
+
+    Profiling is off unless token is set. A request is profiled when its
+    X-Profile header or ?profile= parameter equals the token, or at random
+    with probability sample_rate. The profile id is returned in the
+    X-Profile-Id response header.
+    """
+
+    def __init__(self, token=None, sample_rate=0.0, interval_ms=1.0, keep=20):
+        self.token = token
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000.0
+        self.keep = keep
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_id = 1
+
+    def init_app(self, app):
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        app.teardown_request(self.teardown_request)
+
+    def authorized(self):
+        """True if the request carries the admin token"""
+        supplied = request.headers.get('X-Profile') or request.args.get('profile')
+        if not (self.token and supplied):
+            return False
+        # compare_digest rejects non-ASCII str, so compare the encoded bytes
+        return hmac.compare_digest(supplied.encode('utf-8', 'surrogatepass'),
+                                   self.token.encode('utf-8', 'surrogatepass'))
+
+    @staticmethod
+    def request_path():
+        """Path and query string of the request without the profile token"""
+        query = urlencode([(key, value) for key, value in request.args.items(multi=True) if key != 'profile'])
+        return f'{request.path}?{query}' if query else request.path
+
+    def wants_profile(self):
+        if not self.token or request.path.startswith('/admin/'):
+            return False
+        return self.authorized() or random.random() < self.sample_rate
+
+    def before_request(self):
+        if not self.wants_profile():
+            return
+        with self._lock:
+            profile_id = self._next_id
+            self._next_id += 1
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        profile = Profile(profile_id, request.method, self.request_path(), endpoint, self.interval)
+        g.profiler = StackSampler(profile, threading.get_ident()).start()
+
+    def _finish(self, status):
+        sampler = g.pop('profiler', None)
+        if sampler is None:
+            return None
+        profile = sampler.stop()
+        profile.status = status
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.keep:
+                self._profiles.popitem(last=False)
+        return profile
+
+    def after_request(self, response):
+        profile = self._finish(response.status_code)
+        if profile is not None:
+            response.headers['X-Profile-Id'] = str(profile.id)
+        return response
+
+    def teardown_request(self, exc):
+        # Only still running if the handler raised before after_request
+        self._finish(500)
+
+    def profiles(self):
+        """Summaries of the kept profiles, newest first"""
+        with self._lock:
+            return [profile.summary() for profile in reversed(self._profiles.values())]
+
+    def get(self, profile_id):
+        with self._lock:
+            return self._profiles.get(profile_id)
@@ -0,0 +1,195 @@
+"""
+Versioned, content-addressed dataset snapshots
+
+Layout under the snapshot root (app/data/snapshots by default):
+  objects/ab/<sha256>.csv   - dataset files stored once per distinct content,
+                              with their columnar copies alongside
+  manifests/<id>.json       - a snapshot: {dataset name: object hash} plus a label
+  current.json              - pointer to the active snapshot and activation history
+
+Activating or rolling back only rewrites current.json (atomically via
+os.replace), so nothing is copied and a running DatasetStore picks the change
+up on its next poll.
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+
+from app.columnar import load_dataset, save_columnar, copy_dataset
+
+POINTER_FILE = 'current.json'
+
+
+def file_sha256(path):
+    """Content hash of a file, read in 1 MiB blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_json_atomic(path, payload):
+    """Write JSON to a temp file and rename it over path"""
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class SnapshotStore:
+    """Content-addressed dataset objects, snapshot manifests and an active pointer"""
+
+    def __init__(self, root):
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.manifests_dir = os.path.join(root, 'manifests')
+        self.pointer_path = os.path.join(root, POINTER_FILE)
+        self._pointer_cache = (None, None)
+
+    def object_path(self, sha):
+        return os.path.join(self.objects_dir, sha[:2], f'{sha}.csv')
+
+    def put_object(self, path):
+        """Store a dataset file by content hash; identical files are stored once"""
+        sha = file_sha256(path)
+        obj = self.object_path(sha)
+        if not os.path.exists(obj):
+            os.makedirs(os.path.dirname(obj), exist_ok=True)
+            tmp_path = f'{obj}.{os.getpid()}.tmp'
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, obj)
+            # Objects never change, so their columnar copy is written once
+            save_columnar(load_dataset(obj), obj)
+        return sha
+
+    def create_snapshot(self, files, label=None, base=None):
+        """Snapshot {name: csv path} on top of base (default: the active snapshot)
+
+        Returns the snapshot id; identical snapshots share an id.
+        """
+        if base is None:
+            base_manifest = self.current()
+        else:
+            base_manifest = self.manifest(base)
+        datasets = dict(base_manifest['datasets']) if base_manifest else {}
+        for name, path in files.items():
+            datasets[name] = self.put_object(path)
+
+        snapshot_id = hashlib.sha256(json.dumps(datasets, sort_keys=True).encode()).hexdigest()[:12]
+        manifest_path = os.path.join(self.manifests_dir, f'{snapshot_id}.json')
+        if not os.path.exists(manifest_path):
+            os.makedirs(self.manifests_dir, exist_ok=True)
+            write_json_atomic(manifest_path, {
+                'id': snapshot_id,
+                'label': label,
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'datasets': datasets
+            })
+        return snapshot_id
+
+    def manifest(self, snapshot_id):
+        """Load a snapshot manifest by id"""
+        path = os.path.join(self.manifests_dir, f'{snapshot_id}.json')
+        if not os.path.exists(path):
+            raise KeyError(f"Unknown snapshot: {snapshot_id}")
+        with open(path) as f:
+            return json.load(f)
+
+    def list_snapshots(self):
+        """All manifests, oldest first"""
+        if not os.path.isdir(self.manifests_dir):
+            return []
+        manifests = [self.manifest(os.path.splitext(name)[0])
+                     for name in os.listdir(self.manifests_dir) if name.endswith('.json')]
+        return sorted(manifests, key=lambda m: m['created'])
+
+    def pointer(self):
+        """The active pointer {'active': id, 'history': [...]}, re-read only when it changes"""
+        try:
+            st = os.stat(self.pointer_path)
+        except FileNotFoundError:
+            return None
+        version, cached = self._pointer_cache
+        if version == (st.st_ino, st.st_mtime_ns, st.st_size):
+            return cached
+        with open(self.pointer_path) as f:
+            pointer = json.load(f)
+        self._pointer_cache = ((st.st_ino, st.st_mtime_ns, st.st_size), pointer)
+        return pointer
+
+    def current(self):
+        """Manifest of the active snapshot, or None"""
+        pointer = self.pointer()
+        return self.manifest(pointer['active']) if pointer else None
+
+    def activate(self, snapshot_id):
+        """Atomically point the active snapshot at snapshot_id"""
+        self.manifest(snapshot_id)  # must exist
+        pointer = self.pointer() or {'active': None, 'history': []}
+        history = list(pointer['history'])
+        if pointer['active'] is not None and pointer['active'] != snapshot_id:
+            history.append(pointer['active'])
+        os.makedirs(self.root, exist_ok=True)
+        write_json_atomic(self.pointer_path, {'active': snapshot_id, 'history': history})
+        return snapshot_id
+
+    def rollback(self, steps=1):
+        """Re-activate the snapshot active steps activations ago; copies nothing"""
+        pointer = self.pointer()
+        if not pointer or len(pointer['history']) < steps:
+            raise ValueError("No earlier snapshot to roll back to")
+        target = pointer['history'][-steps]
+        write_json_atomic(self.pointer_path, {'active': target, 'history': pointer['history'][:-steps]})
+        return target
+
+    def resolve(self, name):
+        """(object path, hash) of dataset name in the active snapshot, or None"""
+        manifest = self.current()
+        if not manifest or name not in manifest['datasets']:
+            return None
+        sha = manifest['datasets'][name]
+        return self.object_path(sha), sha
+
+
+def activate_datasets(files, label, root, previous=None):
+    """Snapshot {name: csv path} and make it the active snapshot
+
+    previous ({name: csv path}) is recorded as a baseline snapshot first when no
+    snapshot is active yet, so the first activation can be rolled back too.
+    """
+    store = SnapshotStore(root)
+    if store.pointer() is None and previous:
+        existing = {name: path for name, path in previous.items() if os.path.exists(path)}
+        if existing:
+            store.activate(store.create_snapshot(existing, label='baseline'))
+
+    snapshot_id = store.activate(store.create_snapshot(files, label=label))
+    print(f"✓ Activated snapshot {snapshot_id} ({label}); roll back with: python manage_snapshots.py rollback")
+    return snapshot_id
+
+
+def resolve_dataset(name, path, root):
+    """Path of the data served as dataset name: its active snapshot object, else path"""
+    resolved = SnapshotStore(root).resolve(name)
+    return resolved[0] if resolved else path
+
+
+def checkout_dataset(name, path, root):
+    """Copy the active snapshot's dataset name over the working file path
+
+    After a rollback the working file can hold data that is no longer served;
+    writers that append to it check it out first. Returns True if it was replaced.
+    """
+    resolved = SnapshotStore(root).resolve(name)
+    if resolved is None:
+        return False
+    obj, sha = resolved
+    if os.path.exists(path) and file_sha256(path) == sha:
+        return False
+    copy_dataset(obj, path)
+    return True
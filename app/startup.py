@@ -0,0 +1,62 @@
+import time
+import threading
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """Wall-clock breakdown of server startup and a readiness flag
+
+    mark(name) records the time since the previous mark, for sequential steps on
+    the main thread; stage(name) times a block and may run on any thread, e.g.
+    models warmed up in the background. The clock starts when the timer is
+    created, so create it before the heavy imports.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last_mark = self.started
+        self._stages = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._ready_after = None
+
+    def mark(self, name):
+        """Record the time spent since the previous mark under name"""
+        now = time.perf_counter()
+        with self._lock:
+            self._stages[name] = now - self._last_mark
+            self._last_mark = now
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block under name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._stages[name] = time.perf_counter() - start
+
+    def set_ready(self):
+        """Flag the server as able to serve every endpoint"""
+        if not self._ready.is_set():
+            self._ready_after = time.perf_counter() - self.started
+            self._ready.set()
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def wait_ready(self, timeout=None):
+        return self._ready.wait(timeout)
+
+    def report(self):
+        """Readiness plus per-stage timings in milliseconds"""
+        with self._lock:
+            stages = {name: round(seconds * 1000, 2) for name, seconds in self._stages.items()}
+        return {
+            'ready': self.ready,
+            'uptime_s': round(time.perf_counter() - self.started, 3),
+            'ready_after_s': round(self._ready_after, 3) if self._ready_after is not None else None,
+            'stages_ms': stages
+        }
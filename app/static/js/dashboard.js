@@ -5,32 +5,97 @@ SciChart.SciChartSurface.configure({
 
 let currentDisease = null;
 let currentForecastData = null;
+// Latest status entry per disease, kept up to date by the status stream
+let statusByDisease = {};
+// Forecast and climate data per disease from /api/dashboard
+let dashboardData = {};
 
 // Initialize dashboard on page load
 document.addEventListener('DOMContentLoaded', function() {
-    loadCurrentStatus();
     setupDiseaseButtons();
+    // Status, forecasts and climate for every disease in one request
+    loadDashboard();
     
-    // Update status every 5 minutes
-    setInterval(loadCurrentStatus, 300000);
+    if (window.EventSource) {
+        subscribeToStatus();
+    } else {
+        // No Server-Sent Events support: poll every 5 minutes
+        loadCurrentStatus();
+        setInterval(loadCurrentStatus, 300000);
+    }
 });
 
-// Load current status for all diseases
-async function loadCurrentStatus() {
+// Receive the status snapshot, then only the diseases that changed
+function subscribeToStatus() {
+    const source = new EventSource('/api/status_stream');
+    
+    source.addEventListener('snapshot', event => {
+        const status = JSON.parse(event.data).status;
+        const names = status.map(entry => entry.disease);
+        applyStatusChanges(status, Object.keys(statusByDisease).filter(disease => !names.includes(disease)));
+    });
+    
+    source.addEventListener('delta', event => {
+        const delta = JSON.parse(event.data);
+        applyStatusChanges(Object.values(delta.changed), delta.removed);
+    });
+    
+    // The browser reconnects by itself (sending Last-Event-ID) after a dropped connection
+    source.onerror = () => console.warn('Status stream disconnected, reconnecting...');
+}
+
+function applyStatusChanges(changed, removed) {
+    let forecastChanged = false;
+    changed.forEach(entry => {
+        const previous = statusByDisease[entry.disease];
+        if (previous && previous.forecast_version !== entry.forecast_version) {
+            // Stale: refetched the next time the disease is shown
+            delete dashboardData[entry.disease];
+            forecastChanged = forecastChanged || entry.disease === currentDisease;
+        }
+        statusByDisease[entry.disease] = entry;
+    });
+    removed.forEach(disease => delete statusByDisease[disease]);
+    
+    renderStatus(Object.values(statusByDisease));
+    // Refresh the open forecast only when its underlying data or model changed
+    if (forecastChanged) {
+        loadDiseaseForecasts(currentDisease);
+    }
+}
+
+// Load status, forecast and climate data for the given diseases (all by default)
+async function loadDashboard(diseases) {
+    const query = diseases ? `?diseases=${diseases.map(encodeURIComponent).join(',')}` : '';
     try {
-        const response = await fetch('/api/current_status');
+        const response = await fetch(`/api/dashboard${query}`);
         const data = await response.json();
         
-        const statusGrid = document.getElementById('statusGrid');
-        statusGrid.innerHTML = '';
+        if (data.error) {
+            console.error('Dashboard error:', data.error);
+            return;
+        }
         
-        data.forEach(disease => {
-            const card = createStatusCard(disease);
-            statusGrid.appendChild(card);
+        Object.entries(data.diseases).forEach(([disease, section]) => {
+            dashboardData[disease] = section;
+            statusByDisease[disease] = section.status;
         });
-        
-        updateAlertBanner(data);
+        Object.entries(data.errors).forEach(([disease, error]) => console.error(`${disease}: ${error}`));
+        renderStatus(Object.values(statusByDisease));
         
+    } catch (error) {
+        console.error('Error loading dashboard:', error);
+        document.getElementById('alertBanner').innerHTML = 
+            '<span style="color: red;">Error loading data. Please refresh the page.</span>';
+    }
+}
+
+// Load current status for all diseases
+async function loadCurrentStatus() {
+    try {
+        const response = await fetch('/api/current_status');
+        const data = await response.json();
+        renderStatus(data);
     } catch (error) {
         console.error('Error loading current status:', error);
         document.getElementById('alertBanner').innerHTML = 
@@ -38,6 +103,18 @@ async function loadCurrentStatus() {
     }
 }
 
+function renderStatus(data) {
+    const statusGrid = document.getElementById('statusGrid');
+    statusGrid.innerHTML = '';
+    
+    data.forEach(disease => {
+        const card = createStatusCard(disease);
+        statusGrid.appendChild(card);
+    });
+    
+    updateAlertBanner(data);
+}
+
 // Create status card for a disease
 function createStatusCard(disease) {
     const card = document.createElement('div');
@@ -156,14 +233,15 @@ async function loadDiseaseForecasts(disease) {
     forecastChartDiv.innerHTML = `<div class="text-center text-slate-500 chart-loader"><svg class="animate-spin h-8 w-8 text-sky-600 mx-auto mb-2" ...></svg><p>Loading forecast...</p></div>`; // Use the full SVG from index.html here for brevity
     climateChartDiv.innerHTML = `<div class="text-center text-slate-500 chart-loader"><svg class="animate-spin h-8 w-8 text-sky-600 mx-auto mb-2" ...></svg><p>Loading climate data...</p></div>`;    
     try {
-        // Load forecast data
-        const forecastResponse = await fetch(`/api/forecast/${disease}`);
-        const forecastData = await forecastResponse.json();
-        
-        if (forecastData.error) {
-            alert(`Error: ${forecastData.error}`);
+        // Usually already loaded with the page; fetched again only if it changed since
+        if (!dashboardData[disease]) {
+            await loadDashboard([disease]);
+        }
+        if (!dashboardData[disease]) {
+            alert(`Error: could not load the ${disease} forecast`);
             return;
         }
+        const forecastData = dashboardData[disease].forecast;
 
         currentForecastData = forecastData;
         
@@ -180,8 +258,8 @@ async function loadDiseaseForecasts(disease) {
 
         setupExportButton();
         
-        // Load and plot climate data
-        await loadClimateData(disease);
+        // Plot climate data
+        await plotClimateChart(dashboardData[disease].climate);
         
     } catch (error) {
         console.error('Error loading forecast:', error);
@@ -365,24 +443,6 @@ async function plotForecastChart(data) {
     sciChartSurface.zoomExtents();
 }
 
-// Load and plot climate data
-async function loadClimateData(disease) {
-    try {
-        const response = await fetch(`/api/climate_data/${disease}`);
-        const data = await response.json();
-        
-        if (data.error) {
-            console.error('Climate data error:', data.error);
-            return;
-        }
-        
-        await plotClimateChart(data); // Await the async function
-        
-    } catch (error) {
-        console.error('Error loading climate data:', error);
-    }
-}
-
 // Plot climate chart
 async function plotClimateChart(data) {
     const chartDiv = document.getElementById('climateChart');
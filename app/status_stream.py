@@ -0,0 +1,103 @@
+import json
+import threading
+from collections import deque
+
+
+def sse_event(event, data, event_id=None):
+    """Format one Server-Sent Events message"""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+class StatusBroadcaster:
+    """One shared status snapshot pushed to every connected dashboard as deltas
+
+    publish() is called with the full {disease: status} map whenever it may
+    have changed (e.g. after each dataset poll); only an actual change bumps
+    the version and wakes the streams. Each client gets the snapshot once,
+    then only the entries that changed. Idle clients sleep on a condition
+    variable and wake only for changes or the keep-alive heartbeat.
+    """
+
+    def __init__(self, heartbeat=15.0, history=64):
+        self.heartbeat = heartbeat
+        self._cond = threading.Condition()
+        self._status = {}
+        self._version = 0
+        # Recent deltas, so a reconnecting client (Last-Event-ID) can catch up without a snapshot
+        self._deltas = deque(maxlen=history)
+        self._clients = 0
+        self._closed = False
+
+    def publish(self, status):
+        """Replace the snapshot; returns True (and notifies streams) only if anything changed"""
+        with self._cond:
+            changed = {name: entry for name, entry in status.items() if self._status.get(name) != entry}
+            removed = [name for name in self._status if name not in status]
+            if not changed and not removed:
+                return False
+
+            self._version += 1
+            self._status = dict(status)
+            self._deltas.append((self._version, {'changed': changed, 'removed': removed}))
+            self._cond.notify_all()
+            return True
+
+    def snapshot(self):
+        """(version, list of status entries)"""
+        with self._cond:
+            return self._version, list(self._status.values())
+
+    def _catch_up(self, since):
+        """Events a client at version since has missed: its deltas, or a snapshot if they are gone"""
+        if since is not None:
+            missed = [(version, delta) for version, delta in self._deltas if version > since]
+            if missed and missed[0][0] == since + 1:
+                return [sse_event('delta', delta, version) for version, delta in missed]
+        return [sse_event('snapshot', {'status': list(self._status.values())}, self._version)]
+
+    def stream(self, last_event_id=None):
+        """Generator of SSE messages for one client until the broadcaster is closed"""
+        with self._cond:
+            self._clients += 1
+            since = last_event_id if last_event_id is not None and last_event_id <= self._version else None
+            pending = self._catch_up(since) if since != self._version else []
+            seen = self._version
+
+        try:
+            # Reconnect after 5 s if the connection drops
+            yield 'retry: 5000\n\n'
+            for message in pending:
+                yield message
+
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: self._version != seen or self._closed, timeout=self.heartbeat)
+                    if self._closed:
+                        return
+                    pending = self._catch_up(seen) if self._version != seen else []
+                    seen = self._version
+
+                if pending:
+                    for message in pending:
+                        yield message
+                else:
+                    # Comment line: keeps proxies from closing the idle connection
+                    yield ': keep-alive\n\n'
+        finally:
+            with self._cond:
+                self._clients -= 1
+
+    def stats(self):
+        with self._cond:
+            return {'version': self._version, 'clients': self._clients, 'entries': len(self._status)}
+
+    def close(self):
+        """End every open stream"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""Benchmark dataset load time: CSV with date parsing vs memory-mapped columnar files"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.columnar import save_columnar, load_columnar
+from config import Config
+
+
+def time_call(fn, repeats):
+    """Return the best wall time in milliseconds over repeats calls"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('files', nargs='*', help='Dataset CSVs (default: active disease files)')
+    parser.add_argument('--repeats', type=int, default=10)
+    args = parser.parse_args()
+
+    files = args.files or [
+        os.path.join(Config.DATA_PATH, f'{disease.lower()}_historical_data.csv')
+        for disease in Config.DISEASES
+    ]
+    files = [f for f in files if os.path.exists(f)]
+    if not files:
+        print("No dataset files found")
+        return
+
+    print("="*72)
+    print(f"{'File':<40}{'CSV (ms)':>10}{'Columnar (ms)':>15}{'Speedup':>8}")
+    print("="*72)
+
+    # Convert into a scratch directory so the benchmark never touches app/data
+    with tempfile.TemporaryDirectory() as scratch:
+        for filepath in files:
+            scratch_csv = os.path.join(scratch, os.path.basename(filepath))
+            shutil.copy(filepath, scratch_csv)
+            df = pd.read_csv(scratch_csv, parse_dates=['date'])
+            save_columnar(df, scratch_csv)
+
+            # Columnar load must round-trip the CSV exactly
+            pd.testing.assert_frame_equal(load_columnar(scratch_csv), df, check_dtype=False)
+
+            csv_ms = time_call(lambda: pd.read_csv(scratch_csv, parse_dates=['date']), args.repeats)
+            columnar_ms = time_call(lambda: load_columnar(scratch_csv), args.repeats)
+            print(f"{os.path.basename(filepath):<40}{csv_ms:>10.2f}{columnar_ms:>15.2f}{csv_ms / columnar_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""Benchmark multi-step forecasting: Keras predict loop vs compiled forward pass
+
+Exits non-zero if the compiled rollout differs from the original predict loop
+by more than --tolerance.
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+# Disable TensorFlow warnings
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.model import DiseaseOutbreakModel
+from config import Config
+
+
+def predict_future_reference(model, last_sequence, n_days):
+    """Original rollout: one Keras predict call and one np.vstack per day"""
+    predictions = []
+    current_sequence = last_sequence.copy()
+
+    for _ in range(n_days):
+        next_pred = model.model.predict(current_sequence.reshape(1, model.sequence_length, model.n_features), verbose=0)
+        predictions.append(next_pred[0, 0])
+
+        new_row = current_sequence[-1].copy()
+        new_row[-1] = next_pred[0, 0]
+        current_sequence = np.vstack([current_sequence[1:], new_row])
+
+    return np.array(predictions)
+
+
+def time_call(fn, repeats):
+    """Return the best wall time in milliseconds over repeats calls"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--model', help='Path to a trained .h5 model (random weights if omitted)')
+    parser.add_argument('--features', type=int, default=52, help='Feature count for a random model')
+    parser.add_argument('--model-type', default='LSTM', choices=['LSTM', 'GRU'])
+    parser.add_argument('--days', type=int, default=Config.FORECAST_DAYS)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--tolerance', type=float, default=1e-5)
+    args = parser.parse_args()
+
+    model = DiseaseOutbreakModel(
+        sequence_length=Config.SEQUENCE_LENGTH,
+        n_features=args.features,
+        model_type=args.model_type
+    )
+    if args.model:
+        model.load_model(args.model)
+        model.n_features = model.model.input_shape[-1]
+    else:
+        model.build_model(units=64)
+
+    rng = np.random.default_rng(42)
+    last_sequence = rng.random((Config.SEQUENCE_LENGTH, model.n_features))
+
+    # Warm up both paths (graph tracing, first-call allocation)
+    expected = predict_future_reference(model, last_sequence, args.days)
+    actual = model.predict_future(last_sequence, n_days=args.days)
+
+    reference_ms = time_call(lambda: predict_future_reference(model, last_sequence, args.days), args.repeats)
+    compiled_ms = time_call(lambda: model.predict_future(last_sequence, n_days=args.days), args.repeats)
+
+    print("="*60)
+    print(f"{args.model_type} forecast benchmark: {args.days} days, {model.n_features} features")
+    print("="*60)
+    print(f"  Keras predict loop:   {reference_ms:9.2f} ms")
+    print(f"  Compiled forward:     {compiled_ms:9.2f} ms")
+    print(f"  Speedup:              {reference_ms / compiled_ms:9.1f}x")
+    max_diff = np.max(np.abs(expected - actual))
+    matches = np.allclose(actual, expected, rtol=0, atol=args.tolerance)
+    print(f"  Max abs difference:   {max_diff:.3e}  {'OK' if matches else 'FAIL'}")
+    if not matches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""Parity check and latency benchmark: NumPy inference backend vs Keras
+
+Builds (or loads) LSTM and GRU models, saves them as .h5 checkpoints, reloads
+them with NumpyForecastModel and checks forward passes and 14-day forecasts
+against Keras. Exits non-zero if any output differs by more than --tolerance.
+tests/test_inference.py runs the same parity check on random models.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+import numpy as np
+
+# Disable TensorFlow warnings
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(ROOT)
+
+from app.inference import NumpyForecastModel
+from config import Config
+
+
+def time_call(fn, repeats):
+    """Return the best wall time in milliseconds over repeats calls"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def import_time(module):
+    """Seconds for a fresh interpreter to import module"""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True,
+                            env={**os.environ, 'TF_CPP_MIN_LOG_LEVEL': '3'})
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def compare(label, keras_model, numpy_model, args, rng):
+    """Check parity and time both backends for one checkpoint; returns max abs difference"""
+    n_features = keras_model.n_features
+    single = rng.random((Config.SEQUENCE_LENGTH, n_features)).astype(np.float32)
+    batch = rng.random((args.batch, Config.SEQUENCE_LENGTH, n_features)).astype(np.float32)
+
+    diffs = [
+        np.abs(keras_model.forward(batch) - numpy_model.forward(batch)).max(),
+        np.abs(keras_model.predict_future(single, args.days) - numpy_model.predict_future(single, args.days)).max(),
+        np.abs(keras_model.predict_future_batch(batch, args.days)
+               - numpy_model.predict_future_batch(batch, args.days)).max()
+    ]
+    max_diff = float(max(diffs))
+
+    timings = {
+        'forward, batch 1': (lambda m: m.forward(single[np.newaxis])),
+        f'forward, batch {args.batch}': (lambda m: m.forward(batch)),
+        f'{args.days}-day forecast': (lambda m: m.predict_future(single, args.days)),
+        f'{args.days}-day forecast x{args.batch}': (lambda m: m.predict_future_batch(batch, args.days))
+    }
+
+    print(f"\n{label} ({n_features} features)  max abs difference: {max_diff:.3e}"
+          f"  {'OK' if max_diff <= args.tolerance else 'FAIL'}")
+    print(f"  {'':<28}{'Keras (ms)':>12}{'NumPy (ms)':>12}{'Speedup':>9}")
+    for name, fn in timings.items():
+        keras_ms = time_call(lambda: fn(keras_model), args.repeats)
+        numpy_ms = time_call(lambda: fn(numpy_model), args.repeats)
+        print(f"  {name:<28}{keras_ms:>12.2f}{numpy_ms:>12.2f}{keras_ms / numpy_ms:>8.1f}x")
+    return max_diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--models', nargs='*', default=None,
+                        help='Trained .h5 checkpoints (default: app/models/*_forecast_model.h5)')
+    parser.add_argument('--features', type=int, default=52, help='Feature count for random models')
+    parser.add_argument('--days', type=int, default=Config.FORECAST_DAYS)
+    parser.add_argument('--batch', type=int, default=180, help='Series per batched call')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--tolerance', type=float, default=1e-4)
+    args = parser.parse_args()
+
+    print("="*60)
+    print("NumPy inference backend: parity and latency")
+    print("="*60)
+    print(f"  import app.inference:  {import_time('app.inference'):6.2f} s")
+    print(f"  import app.model (TF): {import_time('app.model'):6.2f} s")
+
+    from app.model import DiseaseOutbreakModel
+
+    rng = np.random.default_rng(42)
+    checkpoints = args.models
+    if checkpoints is None:
+        # app/models is not in a fresh checkout; the random models below still run
+        model_dir = os.path.join(ROOT, 'app', 'models')
+        checkpoints = sorted(os.path.join(model_dir, name) for name in os.listdir(model_dir)
+                             if name.endswith('_forecast_model.h5')) if os.path.isdir(model_dir) else []
+
+    max_diff = 0.0
+    with tempfile.TemporaryDirectory() as scratch:
+        # Random LSTM and GRU models cover both cell types even without trained GRU checkpoints
+        for model_type in ['LSTM', 'GRU']:
+            model = DiseaseOutbreakModel(Config.SEQUENCE_LENGTH, args.features, model_type)
+            model.build_model(units=64)
+            path = os.path.join(scratch, f'{model_type.lower()}.h5')
+            model.model.save(path)
+            checkpoints.append(path)
+
+        for path in checkpoints:
+            keras_model = DiseaseOutbreakModel()
+            keras_model.load_model(path)
+            numpy_model = NumpyForecastModel().load_model(path)
+            label = f"{numpy_model.model_type} {os.path.basename(path)}"
+            max_diff = max(max_diff, compare(label, keras_model, numpy_model, args, rng))
+
+    print(f"\nLargest difference across all checkpoints: {max_diff:.3e}")
+    if max_diff > args.tolerance:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
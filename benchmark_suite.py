@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+"""Micro-benchmarks for the DataProcessor and forecast model hot paths
+
+  python benchmark_suite.py                                   # run, write benchmark_results.json
+  python benchmark_suite.py --save-baseline                   # also store it as benchmark_baseline.json
+  python benchmark_suite.py --compare benchmark_baseline.json # exit 1 if any case regressed
+
+Times load_data, prepare_features, create_sequences,
+inverse_transform_predictions, predict and predict_future over history length,
+feature count and sequence length. Data is synthetic: generate_sample_data
+scaled to the requested history (4 features), with CCHAIN-named columns
+derived from its climate series for the 23 and 52 feature sets. Models have
+random weights; predict and predict_future run on the Keras
+DiseaseOutbreakModel and the NumPy backend that serves the API.
+
+Each case records the best and median time per call over --repeats
+measurements (fast calls are looped to at least 20 ms per measurement). A case
+regresses when its best time exceeds the baseline's by more than --threshold.
+Baselines are only comparable on the same machine.
+"""
+
+import gc
+import io
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Disable TensorFlow warnings
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(ROOT)
+
+from app.data_utils import DataProcessor
+from app.inference import NumpyForecastModel
+from config import Config
+
+RESULTS_FILE = os.path.join(ROOT, 'benchmark_results.json')
+BASELINE_FILE = os.path.join(ROOT, 'benchmark_baseline.json')
+
+
+def time_call(fn, repeats, min_time=0.02):
+    """Return (best, median) wall time per call in milliseconds over repeats measurements
+
+    Like timeit, calls faster than min_time seconds are looped within each
+    measurement so sub-millisecond cases are not dominated by timer noise.
+    """
+    start = time.perf_counter()
+    fn()
+    number = max(1, int(min_time / max(time.perf_counter() - start, 1e-9)))
+
+    timings = []
+    # As in timeit, garbage collection pauses are kept out of the measurements
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            timings.append((time.perf_counter() - start) * 1000 / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return min(timings), float(np.median(timings))
+
+
+def synthetic_history(num_days, n_features):
+    """generate_sample_data scaled to num_days, widened to n_features model inputs"""
+    processor = DataProcessor()
+    with tempfile.TemporaryDirectory() as tmp, redirect_stdout(io.StringIO()):
+        df = processor.generate_sample_data(os.path.join(tmp, 'sample.csv'), num_days=num_days)
+    if n_features == 4:
+        return df
+
+    # CCHAIN layout: n_features - 1 climate/context columns plus disease_cases, each a noisy
+    # mix of the sample climate series so scaling and filling see realistic values
+    rng = np.random.default_rng(n_features)
+    base = df[['temperature', 'humidity', 'rainfall']].to_numpy()
+    columns = {'date': df['date']}
+    for name in Config.CLIMATE_FEATURES[:n_features - 1]:
+        mix = base @ rng.normal(size=3) + rng.normal(0, 1, num_days)
+        # Some gaps, as in the real extracts
+        mix[rng.random(num_days) < 0.02] = np.nan
+        columns[name] = mix
+    columns['disease_cases'] = df['disease_cases']
+    return pd.DataFrame(columns)
+
+
+def build_models(n_features, sequence_length, backends, tmp):
+    """{backend: model} with the same random weights"""
+    from app.model import DiseaseOutbreakModel
+    import tensorflow as tf
+    # No per-call progress bars from Keras predict
+    tf.keras.utils.disable_interactive_logging()
+
+    keras_model = DiseaseOutbreakModel(sequence_length=sequence_length, n_features=n_features)
+    keras_model.build_model(units=64)
+    models = {}
+    if 'keras' in backends:
+        models['keras'] = keras_model
+    if 'numpy' in backends:
+        path = os.path.join(tmp, f'model_{n_features}_{sequence_length}.h5')
+        with redirect_stdout(io.StringIO()):
+            keras_model.save_model(path)
+            models['numpy'] = NumpyForecastModel().load_model(path)
+    return models
+
+
+def run_suite(args):
+    """{case name: result} for every parameter combination"""
+    results = {}
+
+    def record(name, fn, **params):
+        best, median = time_call(fn, args.repeats)
+        results[name] = {'best_ms': round(best, 4), 'median_ms': round(median, 4), **params}
+        print(f"  {name:<58} {best:10.3f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_features in args.features:
+            for sequence_length in args.sequence_lengths:
+                models = build_models(n_features, sequence_length, args.backends, tmp)
+                window = np.random.default_rng(0).random((sequence_length, n_features)).astype(np.float32)
+                for backend, model in models.items():
+                    # Warm up (graph tracing, first-call allocation)
+                    model.predict_future(window, n_days=args.days)
+                    record(f'predict_future/{backend}/f{n_features}/s{sequence_length}',
+                           lambda: model.predict_future(window, n_days=args.days),
+                           benchmark='predict_future', backend=backend,
+                           features=n_features, sequence_length=sequence_length)
+
+                for history in args.history:
+                    df = synthetic_history(history, n_features)
+                    csv_path = os.path.join(tmp, f'history_{history}_{n_features}.csv')
+                    if not os.path.exists(csv_path):
+                        df.to_csv(csv_path, index=False)
+                    processor = DataProcessor(sequence_length=sequence_length)
+                    case = f'h{history}/f{n_features}'
+                    params = {'history': history, 'features': n_features}
+
+                    # Independent of sequence length: run once per history and feature count
+                    if sequence_length == args.sequence_lengths[0]:
+                        record(f'load_data/{case}', lambda: processor.load_data(csv_path),
+                               benchmark='load_data', **params)
+                        record(f'prepare_features/{case}', lambda: processor.prepare_features(df),
+                               benchmark='prepare_features', **params)
+                        predictions = np.random.default_rng(1).random((history, args.days))
+                        processor.prepare_features(df)
+                        record(f'inverse_transform_predictions/{case}',
+                               lambda: processor.inverse_transform_predictions(predictions),
+                               benchmark='inverse_transform_predictions', **params)
+
+                    scaled = processor.prepare_features(df).astype(np.float32)
+                    record(f'create_sequences/{case}/s{sequence_length}',
+                           lambda: processor.create_sequences(scaled),
+                           benchmark='create_sequences', sequence_length=sequence_length, **params)
+
+                    X, _ = processor.create_sequences(scaled)
+                    for backend, model in models.items():
+                        # NumPy models have no Keras predict; forward is their batch inference
+                        predict = model.predict if backend == 'keras' else model.forward
+                        predict(X)
+                        record(f'predict/{backend}/{case}/s{sequence_length}', lambda: predict(X),
+                               benchmark='predict', backend=backend,
+                               sequence_length=sequence_length, **params)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print each case against the baseline; returns the names of regressed cases"""
+    regressions = []
+    print(f"\n{'case':<58} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in results.items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            print(f"{name:<58} {'-':>10} {result['best_ms']:10.3f}      new")
+            continue
+        change = result['best_ms'] / previous['best_ms'] - 1
+        flag = ''
+        if change > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<58} {previous['best_ms']:10.3f} {result['best_ms']:10.3f} {change:+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmarks for the forecasting hot paths')
+    parser.add_argument('--history', type=int, nargs='+', default=[365, 3650], help='Days of history')
+    parser.add_argument('--features', type=int, nargs='+', default=[4, 23, 52], help='Model input features')
+    parser.add_argument('--sequence-lengths', type=int, nargs='+', default=[14, Config.SEQUENCE_LENGTH])
+    parser.add_argument('--backends', nargs='+', default=['keras', 'numpy'], choices=['keras', 'numpy'])
+    parser.add_argument('--days', type=int, default=Config.FORECAST_DAYS, help='Forecast horizon')
+    parser.add_argument('--repeats', type=int, default=10)
+    parser.add_argument('--output', default=RESULTS_FILE)
+    parser.add_argument('--save-baseline', action='store_true', help=f'Also write {BASELINE_FILE}')
+    parser.add_argument('--compare', metavar='BASELINE', help='Baseline JSON to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed slowdown over the baseline best time (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    if max(args.features) > len(Config.CLIMATE_FEATURES) + 1:
+        parser.error(f'at most {len(Config.CLIMATE_FEATURES) + 1} features')
+
+    print("="*60)
+    print("HealthTrace micro-benchmarks")
+    print("="*60)
+    report = {
+        'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'machine': {
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'cpus': os.cpu_count(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__
+        },
+        'repeats': args.repeats,
+        'forecast_days': args.days,
+        'results': run_suite(args)
+    }
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    if args.save_baseline:
+        with open(BASELINE_FILE, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {BASELINE_FILE}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get('machine') != report['machine']:
+            print("Warning: baseline was recorded on a different machine or library versions")
+        regressions = compare(report['results'], baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) more than {args.threshold:.0%} slower than the baseline")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == '__main__':
+    main()
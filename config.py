@@ -7,11 +7,52 @@ class Config:
     # Model configuration
     SEQUENCE_LENGTH = 30  # Use 30 days of historical data
     FORECAST_DAYS = 14    # Forecast 14 days ahead
+    HISTORY_DAYS = 30     # Days of history returned with each forecast
+    OUTPUT_STEPS = 1      # Model output head size; set to FORECAST_DAYS for a direct multi-horizon model
     
     # Model paths
     MODEL_PATH = os.path.join(os.path.dirname(__file__), 'app', 'models', 'disease_forecast_model.h5')
     DATA_PATH = os.path.join(os.path.dirname(__file__), 'app', 'data')
     
+    # Seconds between checks for changed data files (loaded datasets are reloaded on change)
+    DATA_RELOAD_INTERVAL = 5
+    
+    # Versioned dataset snapshots; the active snapshot takes precedence over the CSVs in DATA_PATH
+    SNAPSHOT_PATH = os.path.join(DATA_PATH, 'snapshots')
+    
+    # Per-barangay features (python ingest_cchain.py --level barangay) for barangay-level forecasts
+    BARANGAY_DATA_FILE = os.path.join(DATA_PATH, 'iloilo_barangay_features.csv')
+    LOCATION_FILE = os.path.join(DATA_PATH, 'location.csv')
+    
+    # Seconds browsers may reuse an API response before revalidating it (ETag/Last-Modified)
+    HTTP_CACHE_MAX_AGE = 60
+    
+    # Seconds between keep-alive comments on idle /api/status_stream connections
+    STATUS_STREAM_HEARTBEAT = 15
+    
+    # On-demand profiling: requests whose X-Profile header (or ?profile=) equals the token are
+    # profiled, plus PROFILE_SAMPLE_RATE of all requests; /admin/profiles needs the token too.
+    # Profiling is off when no token is set.
+    PROFILE_TOKEN = os.environ.get('HEALTHTRACE_PROFILE_TOKEN')
+    PROFILE_SAMPLE_RATE = float(os.environ.get('HEALTHTRACE_PROFILE_SAMPLE_RATE', 0))
+    PROFILE_INTERVAL_MS = 1
+    PROFILE_KEEP = 20
+    
+    # Forecasts precomputed by precompute_forecasts.py, served while the data and model are unchanged
+    FORECAST_TABLE = os.path.join(DATA_PATH, 'forecasts.sqlite')
+    
+    # Cross-request micro-batching: a batch runs when this many windows are queued
+    # or the oldest queued request has waited this long
+    INFERENCE_MAX_BATCH_SIZE = 32
+    INFERENCE_MAX_WAIT_MS = 5
+    
+    # 'numpy' serves the .h5 checkpoints without importing TensorFlow; 'keras' uses TensorFlow
+    INFERENCE_BACKEND = os.environ.get('HEALTHTRACE_INFERENCE_BACKEND', 'numpy')
+    
+    # 'background' loads models and datasets in a thread while /healthz already answers,
+    # 'lazy' loads each on its first request, 'eager' loads everything before serving
+    STARTUP_MODE = os.environ.get('HEALTHTRACE_STARTUP_MODE', 'background')
+    
     # Diseases to track (based on CCHAIN Project data for Iloilo City)
     DISEASES = ['Dengue', 'Typhoid', 'Leptospirosis']
     
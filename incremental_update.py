@@ -0,0 +1,351 @@
+"""
+Incremental, append-only refresh of the feature store and disease files
+
+Instead of re-running prepare_cchain_data.py and every extract/merge/activate
+script, this tracks a high-water mark per raw source (byte offset + last date)
+in app/data/pipeline_state.json and on each run:
+  1. reads only the bytes appended to each raw CCHAIN source since the last run,
+  2. aggregates the new Iloilo City rows and appends rows for dates past its last
+     one to iloilo_features.csv, recomputing rolling features (tave_7day,
+     tave_30day) over the tail window only,
+  3. turns new PIDSR weeks into daily rows and appends them to each
+     {disease}_historical_data.csv, with features taken as-of each date and
+     precipitation_7day / precipitation_30day recomputed over the tail window,
+  4. snapshots the updated disease files and activates the snapshot, so the
+     app serves them and `manage_snapshots.py rollback` undoes the update.
+Existing rows are never rewritten and only the tail of each file is read; new
+rows are appended to the CSVs and the now stale columnar copies are dropped.
+Each disease file is first checked out from the active snapshot, so appends
+build on the served data even after a rollback.
+
+Run `python ingest_cchain.py` once for a full build, then `python incremental_update.py --init`
+to record the high-water marks; later runs process only new data.
+"""
+
+import io
+import os
+import json
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+from app.columnar import load_dataset_tail, drop_columnar
+from app.snapshots import SnapshotStore, activate_datasets, checkout_dataset
+from ingest_cchain import (DATA_DIR, FEATURES_FILE, FEATURE_GROUPS, ILOILO_CITY_CODE, DISEASE_COLUMN_NAMES,
+                           load_iloilo_barangays, plan_scans, aggregate_daily, postprocess_group)
+from prepare_cchain_data import DISEASE_MAPPING
+
+STATE_FILE = 'pipeline_state.json'
+SNAPSHOT_DIR = 'snapshots'
+DISEASE_SOURCE = 'disease_pidsr_totals.csv'
+DISEASE_CODES = {**DISEASE_MAPPING, 'A27': 'leptospirosis'}
+
+# Longest rolling window among derived features; only this much history is re-read
+TAIL_WINDOW = 30
+
+
+def load_state(data_dir=DATA_DIR):
+    """Load high-water marks, or an empty state if none were recorded yet"""
+    path = os.path.join(data_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return {'sources': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_state(state, data_dir=DATA_DIR):
+    """Write high-water marks atomically"""
+    path = os.path.join(data_dir, STATE_FILE)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def read_appended_rows(filepath, offset, usecols, dtype=None):
+    """Read complete CSV lines appended after byte offset; return (DataFrame, new offset)"""
+    header = pd.read_csv(filepath, nrows=0).columns.tolist()
+    with open(filepath, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+
+    # Stop at the last newline so a half-written row is picked up next run
+    end = data.rfind(b'\n') + 1
+    if end == 0:
+        return pd.DataFrame(columns=usecols), offset
+
+    df = pd.read_csv(io.BytesIO(data[:end]), header=None, names=header, usecols=usecols, dtype=dtype)
+    return df, offset + end
+
+
+def baseline_state(data_dir=DATA_DIR):
+    """Record current file sizes and last dates as high-water marks (after a full build)"""
+    state = {'sources': {}}
+    for source in sorted(set(spec['source'] for spec in FEATURE_GROUPS.values()) | {DISEASE_SOURCE}):
+        path = os.path.join(data_dir, source)
+        if not os.path.exists(path):
+            continue
+        # Date column only; this one full read is what later runs avoid
+        dates = pd.read_csv(path, usecols=['date'], dtype={'date': 'str'})['date']
+        max_date = dates.max() if len(dates) else None
+        state['sources'][source] = {'offset': os.path.getsize(path), 'max_date': max_date}
+        print(f"  ✓ {source}: offset {state['sources'][source]['offset']:,}, last date {max_date}")
+
+    save_state(state, data_dir)
+    return state
+
+
+def read_new_source_rows(source, state, barangays, data_dir):
+    """Return the Iloilo City rows of source appended since its high-water mark"""
+    path = os.path.join(data_dir, source)
+    entry = state['sources'].get(source)
+    if entry is None or not os.path.exists(path):
+        return None, entry
+
+    if os.path.getsize(path) < entry['offset']:
+        print(f"  ✗ {source} shrank since last run; run ingest_cchain.py for a full rebuild")
+        return None, entry
+
+    aggregations = plan_scans([g for g, spec in FEATURE_GROUPS.items() if spec['source'] == source])[source]
+    header = pd.read_csv(path, nrows=0).columns
+    value_cols = [col for col in aggregations if col in header]
+    dtype = {col: 'float64' for col in value_cols}
+    dtype.update({'adm4_pcode': 'str', 'date': 'str'})
+
+    rows, offset = read_appended_rows(path, entry['offset'], ['adm4_pcode', 'date'] + value_cols, dtype)
+    rows = rows[rows['adm4_pcode'].isin(barangays)]
+
+    # Only dates past the high-water mark are complete new aggregates
+    if entry.get('max_date'):
+        late = rows['date'] <= entry['max_date']
+        if late.any():
+            print(f"  ⚠ {source}: skipping {int(late.sum())} rows dated at or before {entry['max_date']}")
+        rows = rows[~late]
+
+    new_entry = {'offset': offset, 'max_date': entry.get('max_date')}
+    if len(rows) > 0:
+        new_entry['max_date'] = rows['date'].max()
+        rows = aggregate_daily(rows.drop(columns='adm4_pcode'), {col: aggregations[col] for col in value_cols})
+    else:
+        rows = None
+    return rows, new_entry
+
+
+def read_tail_since(csv_path, since, extra_rows=TAIL_WINDOW):
+    """Last rows of a date-ordered dataset, back to extra_rows rows before since
+
+    The window read from the end of the file doubles until it reaches that far
+    (or the whole file), so only the recent part of the history is parsed.
+    """
+    n_rows = extra_rows
+    while True:
+        tail = load_dataset_tail(csv_path, n_rows)
+        if len(tail) < n_rows or (tail['date'] < since).sum() >= extra_rows:
+            return tail.reset_index(drop=True)
+        n_rows *= 2
+
+
+def append_rows(rows, csv_path):
+    """Append rows to a dataset CSV in its column order; its columnar copy is dropped"""
+    rows.to_csv(csv_path, mode='a', header=False, index=False, date_format='%Y-%m-%d')
+    # The values array is column-major, so rows cannot be appended to it in place;
+    # readers fall back to the CSV (read backwards for tails) until the next full build
+    drop_columnar(csv_path)
+
+
+def append_features(tail, new_rows_by_source):
+    """New city-level feature store rows for dates after the store's last row
+
+    tail holds the store's last rows, reaching TAIL_WINDOW - 1 rows before the
+    earliest new date. Existing rows are never rewritten: values a source
+    reports for dates the store already has are only carried forward onto the
+    new dates, like any gap in a lower-frequency (monthly/yearly) feature.
+    """
+    last_date = tail['date'].max()
+    store = tail.set_index('date')
+    # Forward fill of the new rows starts from the last existing row
+    seed = store.iloc[[-1]].copy()
+    new_rows = pd.DataFrame(columns=store.columns, index=pd.DatetimeIndex([], name='date'))
+    for source, daily in new_rows_by_source.items():
+        for group, spec in FEATURE_GROUPS.items():
+            if spec['source'] != source:
+                continue
+            cols = [col for col in spec['aggregations'] if col in daily.columns]
+            frame = daily[['date'] + cols].copy()
+
+            if group == 'atmosphere':
+                # Prepend the last TAIL_WINDOW - 1 raw days so rolling means match a full rebuild
+                history = store.loc[store.index < frame['date'].min(), cols].tail(TAIL_WINDOW - 1)
+                frame = pd.concat([history.reset_index(), frame], ignore_index=True)
+                frame = postprocess_group(group, frame).iloc[len(history):]
+            elif group == 'temperature':
+                frame = postprocess_group(group, frame)
+
+            frame = frame.set_index('date')[[col for col in frame.columns if col in store.columns]]
+            late = frame[frame.index <= last_date]
+            if len(late):
+                latest = late.ffill().iloc[-1].dropna()
+                seed.loc[seed.index[0], latest.index] = latest.to_numpy()
+            new_rows = frame[frame.index > last_date].combine_first(new_rows)
+
+    new_rows = new_rows.sort_index()[store.columns].infer_objects()
+    # Carry lower-frequency features (monthly/yearly) forward onto new dates
+    new_rows = pd.concat([seed, new_rows]).ffill().iloc[1:]
+    return new_rows.reset_index()[tail.columns]
+
+
+def new_daily_cases(disease_rows, last_date, last_cases):
+    """Expand new weekly PIDSR rows into daily rows after last_date (forward filled)"""
+    weekly = disease_rows.groupby('date')['case_total'].sum().sort_index()
+    end = weekly.index.max()
+    if end <= last_date:
+        return None
+
+    dates = pd.date_range(last_date + pd.Timedelta(days=1), end, freq='D')
+    daily = weekly.reindex(dates)
+    # Days before the first new week keep the last known weekly value
+    if pd.isna(daily.iloc[0]):
+        daily.iloc[0] = last_cases
+    daily = daily.ffill()
+    return pd.DataFrame({'date': dates, 'disease_cases': daily.values})
+
+
+def append_disease_rows(disease_file, new_cases, features):
+    """Append new daily rows to a disease file; only rolling tails are recomputed
+
+    features must reach back to the first new date. Only the last TAIL_WINDOW
+    rows of the disease file are read.
+    """
+    existing = load_dataset_tail(disease_file, TAIL_WINDOW)
+    columns = existing.columns.tolist()
+
+    # Features as of each new date (latest value at or before it, i.e. forward fill)
+    store = features.rename(columns=DISEASE_COLUMN_NAMES)
+    store_cols = [col for col in columns if col in store.columns and col not in ('date', 'disease_cases')]
+    new_rows = pd.merge_asof(new_cases.sort_values('date'), store[['date'] + store_cols],
+                             on='date', direction='backward')
+
+    if 'precipitation' in columns:
+        tail = existing[['date', 'precipitation']].tail(TAIL_WINDOW - 1)
+        precipitation = pd.concat([tail['precipitation'], new_rows['precipitation']], ignore_index=True)
+        rolled_7 = precipitation.rolling(window=7, min_periods=1).mean()
+        rolled_30 = precipitation.rolling(window=30, min_periods=1).mean()
+        if 'precipitation_7day' in columns:
+            new_rows['precipitation_7day'] = rolled_7.iloc[len(tail):].values
+        if 'precipitation_30day' in columns:
+            new_rows['precipitation_30day'] = rolled_30.iloc[len(tail):].values
+
+    # Columns with no new source data keep their last value
+    for col in columns:
+        if col not in new_rows.columns:
+            new_rows[col] = np.nan
+    new_rows = new_rows[columns]
+    last_row = existing.iloc[[-1]]
+    new_rows = pd.concat([last_row, new_rows], ignore_index=True).ffill().iloc[1:]
+
+    append_rows(new_rows, disease_file)
+    return len(new_rows)
+
+
+def run_incremental(data_dir=DATA_DIR):
+    """Process everything appended since the last run"""
+    start = time.perf_counter()
+    state = load_state(data_dir)
+    if not state['sources']:
+        print("No high-water marks recorded; run with --init after a full build")
+        return
+
+    barangays = load_iloilo_barangays(data_dir)
+
+    print("Reading appended source rows...")
+    new_rows_by_source = {}
+    for source in sorted(state['sources']):
+        if source == DISEASE_SOURCE:
+            continue
+        rows, entry = read_new_source_rows(source, state, barangays, data_dir)
+        if entry is not None:
+            state['sources'][source] = entry
+        if rows is not None:
+            new_rows_by_source[source] = rows
+            print(f"  ✓ {source}: {len(rows)} new date(s)")
+
+    features_path = os.path.join(data_dir, FEATURES_FILE)
+    if new_rows_by_source:
+        earliest = min(rows['date'].min() for rows in new_rows_by_source.values())
+        new_features = append_features(read_tail_since(features_path, earliest), new_rows_by_source)
+        if len(new_features):
+            append_rows(new_features, features_path)
+            print(f"  ✓ {FEATURES_FILE}: now through {new_features['date'].max().date()}")
+
+    print("\nReading new PIDSR weeks...")
+    entry = state['sources'].get(DISEASE_SOURCE)
+    disease_path = os.path.join(data_dir, DISEASE_SOURCE)
+    if entry is not None and os.path.exists(disease_path):
+        rows, offset = read_appended_rows(
+            disease_path, entry['offset'],
+            ['adm3_pcode', 'disease_icd10_code', 'date', 'case_total'],
+            {'adm3_pcode': 'str', 'disease_icd10_code': 'str', 'date': 'str'}
+        )
+        rows = rows[(rows['adm3_pcode'] == ILOILO_CITY_CODE) & rows['disease_icd10_code'].isin(DISEASE_CODES)]
+        rows = rows.assign(date=pd.to_datetime(rows['date']))
+
+        snapshot_root = os.path.join(data_dir, SNAPSHOT_DIR)
+        store = SnapshotStore(snapshot_root)
+        disease_files = {disease: os.path.join(data_dir, f'{disease}_historical_data.csv')
+                         for disease in DISEASE_CODES.values()}
+        updated = {}
+        for code, disease in DISEASE_CODES.items():
+            disease_file = disease_files[disease]
+            disease_rows = rows[rows['disease_icd10_code'] == code]
+            if disease_rows.empty:
+                continue
+            # Append to what is served, not to a working copy left behind by a rollback
+            if checkout_dataset(disease, disease_file, snapshot_root):
+                print(f"  ✓ {disease}: checked out the active snapshot")
+            if not os.path.exists(disease_file):
+                continue
+            last_row = load_dataset_tail(disease_file, 1)
+            new_cases = new_daily_cases(disease_rows, last_row['date'].iloc[-1], last_row['disease_cases'].iloc[-1])
+            if new_cases is None:
+                continue
+            if store.pointer() is None:
+                # Record the files as they were so the first update can be rolled back too
+                store.activate(store.create_snapshot(
+                    {name: path for name, path in disease_files.items() if os.path.exists(path)},
+                    label='baseline'))
+            features = read_tail_since(features_path, new_cases['date'].min(), extra_rows=1)
+            added = append_disease_rows(disease_file, new_cases, features)
+            updated[disease] = disease_file
+            print(f"  ✓ {disease}: appended {added} day(s)")
+
+        if updated:
+            last_date = str(rows['date'].max().date())
+            activate_datasets(updated, label=f'incremental update through {last_date}', root=snapshot_root)
+
+        state['sources'][DISEASE_SOURCE] = {
+            'offset': offset,
+            'max_date': str(rows['date'].max().date()) if len(rows) else entry.get('max_date')
+        }
+
+    save_state(state, data_dir)
+    print(f"\nIncremental update finished in {time.perf_counter() - start:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Append-only incremental feature refresh')
+    parser.add_argument('--init', action='store_true',
+                        help='Record current source sizes/dates as high-water marks')
+    args = parser.parse_args()
+
+    print("="*60)
+    print("HEALTHTRACE INCREMENTAL UPDATE")
+    print("="*60)
+    if args.init:
+        baseline_state()
+    else:
+        run_incremental()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,337 @@
+"""
+Single-pass CCHAIN ingestion engine for Iloilo City features
+
+Replaces the per-group extract_* scripts: location.csv is read once, every raw
+CCHAIN source is scanned exactly once with only the needed columns (usecols),
+explicit dtypes and categorical barangay/date codes, all feature groups that
+share a source are aggregated in that same pass, and the result is written as
+one city-level features table (plus the legacy per-group files the merge_*
+scripts read). With --level barangay the same scans keep one series per
+adm4_pcode instead and write iloilo_barangay_features.csv.
+"""
+
+import os
+import time
+import argparse
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+from app.columnar import write_dataset
+
+# Constants
+ILOILO_CITY_CODE = 'PH063022000'  # adm3_pcode for Iloilo City
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'data')
+FEATURES_FILE = 'iloilo_features.csv'
+BARANGAY_FEATURES_FILE = 'iloilo_barangay_features.csv'
+CHUNK_SIZE = 500000
+
+# Feature groups: raw source file and per-column aggregation across barangays
+FEATURE_GROUPS = {
+    'climate_indices': {
+        'source': 'climate_indices.csv',
+        'aggregations': {
+            'pr_norm': 'mean',   # Normalized precipitation
+            'spi3': 'mean',      # 3-month Standardized Precipitation Index
+            'spi6': 'mean',      # 6-month Standardized Precipitation Index
+            'pnp': 'mean'        # Precipitation anomaly
+        }
+    },
+    'atmosphere': {
+        'source': 'climate_atmosphere_downscaled.csv',
+        'aggregations': {
+            'tmin': 'mean',      # Minimum temperature (°C)
+            'tmax': 'mean',      # Maximum temperature (°C)
+            'tave': 'mean',      # Average temperature (°C)
+            'pr': 'sum'          # Precipitation (mm) - sum across barangays
+        }
+    },
+    'air_quality': {
+        'source': 'climate_air_quality.csv',
+        'aggregations': {col: 'mean' for col in ['no2', 'co', 'so2', 'o3', 'pm10', 'pm25']}
+    },
+    'vegetation': {
+        'source': 'climate_land.csv',
+        'aggregations': {'ndvi': 'mean'}
+    },
+    'sanitation': {
+        'source': 'osm_poi_sanitation.csv',
+        'aggregations': {col: 'mean' for col in [
+            'drinking_water_count', 'drinking_water_nearest',
+            'water_well_count', 'water_well_nearest',
+            'toilet_count', 'toilet_nearest',
+            'waste_basket_count', 'waste_basket_nearest',
+            'wastewater_plant_count', 'wastewater_plant_nearest'
+        ]}
+    },
+    'water_body': {
+        'source': 'osm_poi_water_body.csv',
+        'aggregations': {col: 'mean' for col in [
+            'osm_wetland_nearest', 'osm_reservoir_nearest',
+            'osm_water_nearest', 'osm_riverbank_nearest',
+            'osm_river_nearest', 'osm_stream_nearest',
+            'osm_canal_nearest', 'osm_drain_nearest'
+        ]}
+    },
+    'healthcare': {
+        'source': 'osm_poi_health.csv',
+        'aggregations': {col: 'mean' for col in [
+            'clinic_count', 'clinic_nearest',
+            'hospital_count', 'hospital_nearest',
+            'pharmacy_count', 'pharmacy_nearest',
+            'doctors_count', 'doctors_nearest'
+        ]}
+    },
+    'wealth': {
+        'source': 'tm_relative_wealth_index.csv',
+        'aggregations': {'rwi_mean': 'mean', 'rwi_median': 'mean', 'rwi_std': 'mean'}
+    },
+    # Groups used by enhance_features.py
+    'temperature': {
+        'source': 'climate_atmosphere.csv',
+        'aggregations': {'t2m_mean': 'mean', 't2m_min': 'mean', 't2m_max': 'mean'}
+    },
+    'population': {
+        'source': 'worldpop_population.csv',
+        'aggregations': {'pop_count_total': 'mean', 'pop_density_mean': 'mean'}
+    },
+    'nighttime_lights': {
+        'source': 'nighttime_lights.csv',
+        'aggregations': {'avg_rad_mean': 'mean'}
+    }
+}
+
+# Feature columns that are renamed in the disease files
+DISEASE_COLUMN_NAMES = {'pr_norm': 'precipitation', 'pnp': 'precip_anomaly'}
+
+# Group-by keys per aggregation level
+LEVEL_KEYS = {
+    'city': ['date'],
+    'barangay': ['adm4_pcode', 'date']
+}
+
+# Per-group files written for the merge_* scripts: output file -> groups combined
+LEGACY_OUTPUTS = {
+    'iloilo_climate_atmosphere.csv': ['atmosphere'],
+    'iloilo_airqual_vegetation.csv': ['air_quality', 'vegetation'],
+    'iloilo_sanitation_waterbody.csv': ['sanitation', 'water_body'],
+    'iloilo_healthcare_wealth.csv': ['healthcare', 'wealth']
+}
+
+
+def load_iloilo_barangays(data_dir=DATA_DIR):
+    """Get the set of barangay codes for Iloilo City (read once per run)"""
+    location_df = pd.read_csv(
+        os.path.join(data_dir, 'location.csv'),
+        usecols=['adm3_pcode', 'adm4_pcode'],
+        dtype={'adm3_pcode': 'category', 'adm4_pcode': 'str'}
+    )
+    return set(location_df.loc[location_df['adm3_pcode'] == ILOILO_CITY_CODE, 'adm4_pcode'])
+
+
+def plan_scans(groups):
+    """Combine the aggregations of all requested groups by source file"""
+    scans = {}
+    for group in groups:
+        spec = FEATURE_GROUPS[group]
+        scans.setdefault(spec['source'], {}).update(spec['aggregations'])
+    return scans
+
+
+def aggregate_daily(iloilo, aggregations, keys=('date',)):
+    """Aggregate filtered barangay rows to one row per keys (city level: per date)"""
+    keys = list(keys)
+    daily = iloilo.groupby(keys).agg(aggregations).reset_index()
+    daily['date'] = pd.to_datetime(daily['date'])
+    return daily.sort_values(keys).reset_index(drop=True)
+
+
+def scan_source(filepath, aggregations, barangays, chunk_size=CHUNK_SIZE, level='city'):
+    """Scan one raw source once and aggregate its columns by date (and barangay)"""
+    header = pd.read_csv(filepath, nrows=0).columns
+    aggregations = {col: agg for col, agg in aggregations.items() if col in header}
+    if not aggregations:
+        print(f"  ✗ {os.path.basename(filepath)}: none of the requested columns found")
+        return None
+
+    dtype = {col: 'float64' for col in aggregations}
+    dtype.update({'adm4_pcode': 'category', 'date': 'category'})
+
+    # Only the projected, filtered rows are kept; they are a small slice of the source
+    filtered = []
+    rows = 0
+    reader = pd.read_csv(
+        filepath,
+        usecols=['adm4_pcode', 'date'] + list(aggregations),
+        dtype=dtype,
+        chunksize=chunk_size
+    )
+    for chunk in reader:
+        rows += len(chunk)
+        chunk = chunk[chunk['adm4_pcode'].isin(barangays)]
+        if len(chunk) > 0:
+            # Drop unused categories so concat/groupby stay small
+            chunk = chunk.assign(date=chunk['date'].astype('str'))
+            if level == 'barangay':
+                filtered.append(chunk.assign(adm4_pcode=chunk['adm4_pcode'].astype('str')))
+            else:
+                filtered.append(chunk.drop(columns='adm4_pcode'))
+
+    if not filtered:
+        print(f"  ✗ {os.path.basename(filepath)}: no Iloilo City records")
+        return None
+
+    iloilo = pd.concat(filtered, ignore_index=True)
+    daily = aggregate_daily(iloilo, aggregations, LEVEL_KEYS[level])
+
+    print(f"  ✓ {os.path.basename(filepath)}: {rows:,} rows scanned, "
+          f"{len(iloilo):,} Iloilo City records, {daily['date'].nunique()} dates")
+    return daily
+
+
+def postprocess_group(group, df):
+    """Group-specific derived features and unit fixes"""
+    if group == 'atmosphere':
+        # Barangay-level frames roll within each barangay's own series
+        tave = df.groupby('adm4_pcode')['tave'] if 'adm4_pcode' in df.columns else df['tave']
+        df['temp_range'] = df['tmax'] - df['tmin']  # Diurnal temperature range
+        df['tave_7day'] = tave.rolling(window=7, min_periods=1).mean().to_numpy()  # 7-day moving average
+        df['tave_30day'] = tave.rolling(window=30, min_periods=1).mean().to_numpy()  # 30-day moving average
+    elif group == 'temperature':
+        # Convert from Kelvin to Celsius if needed
+        for col in [c for c in df.columns if c != 'date']:
+            if df[col].mean() > 100:
+                df[col] = df[col] - 273.15
+    return df
+
+
+def combine_groups(frames, groups, level='city'):
+    """Outer-join group frames on date (and barangay) and forward/backward fill the gaps"""
+    keys = LEVEL_KEYS[level]
+    frames = [frames[g] for g in groups if frames.get(g) is not None]
+    if not frames:
+        return None
+    combined = frames[0]
+    for frame in frames[1:]:
+        combined = combined.merge(frame, on=keys, how='outer')
+    combined = combined.sort_values(keys).reset_index(drop=True)
+    if len(frames) > 1:
+        feature_cols = [col for col in combined.columns if col not in keys]
+        if level == 'barangay':
+            by_barangay = combined.groupby('adm4_pcode')[feature_cols]
+            combined[feature_cols] = by_barangay.ffill()
+            combined[feature_cols] = combined.groupby('adm4_pcode')[feature_cols].bfill()
+        else:
+            combined[feature_cols] = combined[feature_cols].ffill().bfill()
+    return combined
+
+
+def ingest(groups=None, data_dir=DATA_DIR, chunk_size=CHUNK_SIZE, workers=None, level='city'):
+    """Scan every source needed by groups once and return {group: DataFrame at level}"""
+    groups = list(groups or FEATURE_GROUPS)
+    barangays = load_iloilo_barangays(data_dir)
+    print(f"Found {len(barangays)} barangays in Iloilo City")
+
+    scans = plan_scans(groups)
+    available = {src: aggs for src, aggs in scans.items()
+                 if os.path.exists(os.path.join(data_dir, src))}
+    for src in set(scans) - set(available):
+        print(f"  ✗ {src}: file not found, skipping")
+
+    # Sources are independent, so scan them concurrently (parsing releases the GIL)
+    print(f"\nScanning {len(available)} source(s)...")
+    with ThreadPoolExecutor(max_workers=workers or len(available) or 1) as executor:
+        futures = {
+            src: executor.submit(scan_source, os.path.join(data_dir, src), aggs, barangays, chunk_size, level)
+            for src, aggs in available.items()
+        }
+        source_frames = {src: future.result() for src, future in futures.items()}
+
+    frames = {}
+    for group in groups:
+        spec = FEATURE_GROUPS[group]
+        daily = source_frames.get(spec['source'])
+        if daily is None:
+            continue
+        cols = LEVEL_KEYS[level] + [col for col in spec['aggregations'] if col in daily.columns]
+        frames[group] = postprocess_group(group, daily[cols].copy())
+    return frames
+
+
+def run_ingestion(groups=None, outputs=None, data_dir=DATA_DIR, chunk_size=CHUNK_SIZE,
+                  workers=None, write_features=True):
+    """Ingest raw sources and write the features table and legacy group files
+
+    outputs limits which legacy files are written (default: all whose groups
+    were ingested); groups defaults to the groups those outputs need.
+    """
+    start = time.perf_counter()
+    if groups is None and outputs:
+        groups = sorted({g for output in outputs for g in LEGACY_OUTPUTS[output]})
+
+    frames = ingest(groups, data_dir=data_dir, chunk_size=chunk_size, workers=workers)
+
+    print("\nWriting outputs...")
+    for output, output_groups in LEGACY_OUTPUTS.items():
+        if outputs is not None and output not in outputs:
+            continue
+        combined = combine_groups(frames, output_groups)
+        if combined is None or any(g not in frames for g in output_groups):
+            continue
+        combined.to_csv(os.path.join(data_dir, output), index=False)
+        print(f"  ✓ {output}: {len(combined)} records, {len(combined.columns) - 1} features")
+
+    if write_features and frames:
+        features = combine_groups(frames, list(frames))
+        write_dataset(features, os.path.join(data_dir, FEATURES_FILE))
+        print(f"  ✓ {FEATURES_FILE}: {len(features)} records, {len(features.columns) - 1} features")
+
+    print(f"\nIngestion finished in {time.perf_counter() - start:.1f}s")
+    return frames
+
+
+def run_barangay_ingestion(groups=None, data_dir=DATA_DIR, chunk_size=CHUNK_SIZE, workers=None):
+    """Ingest raw sources per barangay and write the barangay features table
+
+    Columns are named like the disease files, so DataProcessor can line them up
+    with a disease's city-level columns.
+    """
+    start = time.perf_counter()
+    frames = ingest(groups, data_dir=data_dir, chunk_size=chunk_size, workers=workers, level='barangay')
+    combined = combine_groups(frames, list(frames), level='barangay')
+    if combined is None:
+        print("No barangay features ingested")
+        return None
+
+    combined = combined.rename(columns=DISEASE_COLUMN_NAMES)
+    # adm4_pcode is a string column, so this table is kept as CSV only
+    combined.to_csv(os.path.join(data_dir, BARANGAY_FEATURES_FILE), index=False)
+    print(f"\n  ✓ {BARANGAY_FEATURES_FILE}: {combined['adm4_pcode'].nunique()} barangays, "
+          f"{combined['date'].nunique()} dates, {len(combined.columns) - 2} features")
+    print(f"\nIngestion finished in {time.perf_counter() - start:.1f}s")
+    return combined
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Single-pass CCHAIN feature ingestion for Iloilo City')
+    parser.add_argument('--groups', nargs='+', choices=list(FEATURE_GROUPS),
+                        help='Feature groups to ingest (default: all)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--workers', type=int, help='Sources scanned concurrently')
+    parser.add_argument('--level', choices=list(LEVEL_KEYS), default='city',
+                        help='city: one averaged series; barangay: one series per adm4_pcode')
+    parser.add_argument('--features-only', action='store_true',
+                        help=f'Write only {FEATURES_FILE}, not the per-group legacy files')
+    args = parser.parse_args()
+
+    print("="*60)
+    print("CCHAIN SINGLE-PASS INGESTION")
+    print("="*60)
+    if args.level == 'barangay':
+        run_barangay_ingestion(groups=args.groups, chunk_size=args.chunk_size, workers=args.workers)
+    else:
+        run_ingestion(groups=args.groups, outputs=[] if args.features_only else None,
+                      chunk_size=args.chunk_size, workers=args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Manage versioned dataset snapshots served by the HealthTrace app
+
+  python manage_snapshots.py list
+  python manage_snapshots.py create --label "retrained inputs" dengue=app/data/dengue_historical_data.csv
+  python manage_snapshots.py import            # snapshot the current *_historical_data.csv files
+  python manage_snapshots.py activate <id>
+  python manage_snapshots.py rollback [--steps N]
+
+Activation and rollback only switch the active pointer; a running server
+reloads the affected datasets within Config.DATA_RELOAD_INTERVAL seconds.
+"""
+
+import os
+import argparse
+
+from app.snapshots import SnapshotStore
+from config import Config
+
+
+def list_snapshots(store):
+    pointer = store.pointer()
+    active = pointer['active'] if pointer else None
+    snapshots = store.list_snapshots()
+    if not snapshots:
+        print("No snapshots yet")
+        return
+
+    objects = set()
+    for manifest in snapshots:
+        marker = '*' if manifest['id'] == active else ' '
+        datasets = ', '.join(f"{name}:{sha[:8]}" for name, sha in sorted(manifest['datasets'].items()))
+        print(f"{marker} {manifest['id']}  {manifest['created']}  {manifest['label'] or ''}")
+        print(f"    {datasets}")
+        objects.update(manifest['datasets'].values())
+
+    references = sum(len(m['datasets']) for m in snapshots)
+    print(f"\n{len(snapshots)} snapshot(s), {references} dataset references, {len(objects)} stored object(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Versioned dataset snapshots')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('list', help='List snapshots (* marks the active one)')
+
+    create = subparsers.add_parser('create', help='Snapshot NAME=PATH datasets and activate it')
+    create.add_argument('files', nargs='+', metavar='NAME=PATH')
+    create.add_argument('--label')
+    create.add_argument('--no-activate', action='store_true')
+
+    subparsers.add_parser('import', help='Snapshot the current *_historical_data.csv files and activate it')
+
+    activate = subparsers.add_parser('activate', help='Activate a snapshot by id')
+    activate.add_argument('snapshot_id')
+
+    rollback = subparsers.add_parser('rollback', help='Re-activate an earlier snapshot')
+    rollback.add_argument('--steps', type=int, default=1)
+    args = parser.parse_args()
+
+    store = SnapshotStore(Config.SNAPSHOT_PATH)
+
+    if args.command == 'list':
+        list_snapshots(store)
+    elif args.command in ('create', 'import'):
+        if args.command == 'import':
+            files = {disease.lower(): os.path.join(Config.DATA_PATH, f'{disease.lower()}_historical_data.csv')
+                     for disease in Config.DISEASES}
+            files = {name: path for name, path in files.items() if os.path.exists(path)}
+            label, activate_it = 'imported', True
+        else:
+            files = dict(item.split('=', 1) for item in args.files)
+            label, activate_it = args.label, not args.no_activate
+        snapshot_id = store.create_snapshot(files, label=label)
+        print(f"✓ Created snapshot {snapshot_id}")
+        if activate_it:
+            store.activate(snapshot_id)
+            print(f"✓ Activated snapshot {snapshot_id}")
+    elif args.command == 'activate':
+        store.activate(args.snapshot_id)
+        print(f"✓ Activated snapshot {args.snapshot_id}")
+    elif args.command == 'rollback':
+        snapshot_id = store.rollback(args.steps)
+        print(f"✓ Rolled back to snapshot {snapshot_id}")
+
+
+if __name__ == '__main__':
+    main()
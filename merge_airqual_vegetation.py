@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+from app.columnar import load_dataset, write_dataset
+
 print("Merging air quality and vegetation features with disease data...\n")
 
 # Load the new features
@@ -18,7 +20,7 @@ for disease in diseases:
     
     # Load current atmosphere-enhanced data
     input_file = f'app/data/{disease}_historical_data.csv'
-    df = pd.read_csv(input_file)
+    df = load_dataset(input_file)
     df['date'] = pd.to_datetime(df['date'])
     
     print(f"Original data: {len(df)} records, {len(df.columns)} columns")
@@ -44,7 +46,7 @@ for disease in diseases:
     
     # Save the enhanced data with air quality and vegetation features
     output_file = f'app/data/{disease}_historical_data_full.csv'
-    df_merged.to_csv(output_file, index=False)
+    write_dataset(df_merged, output_file)
     print(f"✓ Saved to: {output_file}")
     
     # Show sample
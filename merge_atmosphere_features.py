@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+from app.columnar import load_dataset, write_dataset
+
 print("Merging atmosphere features with existing enhanced data...\n")
 
 # Load the new climate atmosphere features
@@ -18,7 +20,7 @@ for disease in diseases:
     
     # Load existing enhanced data
     input_file = f'app/data/{disease}_historical_data_enhanced.csv'
-    df = pd.read_csv(input_file)
+    df = load_dataset(input_file)
     df['date'] = pd.to_datetime(df['date'])
     
     print(f"Original data: {len(df)} records, {len(df.columns)} columns")
@@ -45,7 +47,7 @@ for disease in diseases:
     
     # Save the enhanced data with atmosphere features
     output_file = f'app/data/{disease}_historical_data_atmosphere.csv'
-    df_merged.to_csv(output_file, index=False)
+    write_dataset(df_merged, output_file)
     print(f"✓ Saved to: {output_file}")
     
     # Show sample
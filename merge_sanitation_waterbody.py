@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+from app.columnar import load_dataset, write_dataset
+
 print("Merging Sanitation/Water Body features with disease data...\n")
 
 # Load the sanitation and water body data
@@ -27,7 +29,7 @@ for disease in diseases:
     # Load current disease data (23 features)
     input_file = f'app/data/{disease}_historical_data.csv'
     print(f"\nLoading {input_file}...")
-    disease_df = pd.read_csv(input_file)
+    disease_df = load_dataset(input_file)
     disease_df['date'] = pd.to_datetime(disease_df['date'])
     
     print(f"Current records: {len(disease_df)}")
@@ -57,7 +59,7 @@ for disease in diseases:
     
     # Save the merged data
     output_file = f'app/data/{disease}_historical_data_with_sanwater.csv'
-    merged.to_csv(output_file, index=False)
+    write_dataset(merged, output_file)
     
     print(f"\n✓ Saved: {output_file}")
     print(f"  Total records: {len(merged)}")
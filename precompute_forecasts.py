@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Batch forecast scoring: precompute every forecast the API serves
+
+  python precompute_forecasts.py                 # city forecasts for all diseases
+  python precompute_forecasts.py --barangays     # plus the per-barangay tables
+  python precompute_forecasts.py --force         # recompute rows that are still fresh
+
+Each forecast (with its alert level) is written to the Config.FORECAST_TABLE
+SQLite table, stamped with the data and model versions it was computed from.
+The API serves a row for as long as both versions match what it has loaded and
+runs the model live only for stale or missing rows, so run this after new data
+is activated or a model is retrained.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.dataset_store import DatasetStore
+from app.forecast_cache import ForecastCache
+from app.forecast_table import ForecastTable
+from app.forecasting import (TAIL_ROWS, get_data_file, get_model_file, load_forecast_model, load_data_processor,
+                             forecast_input, build_forecast, build_barangay_forecast, read_barangay_names)
+from app.snapshots import SnapshotStore
+from config import Config
+
+
+def precompute(diseases, barangays=False, force=False, table_path=Config.FORECAST_TABLE):
+    """Score diseases into the forecast table; returns {key: status}"""
+    table = ForecastTable(table_path)
+    # Same dataset resolution (active snapshot, else the CSVs) and version stamps as the server
+    store = DatasetStore(snapshots=SnapshotStore(Config.SNAPSHOT_PATH), tail_rows=TAIL_ROWS)
+    barangay_dataset = None
+    names = {}
+    if barangays:
+        barangay_dataset = store.register('barangays', Config.BARANGAY_DATA_FILE)
+        if barangay_dataset is None:
+            print(f"✗ Barangay features not found at {Config.BARANGAY_DATA_FILE}")
+        names = read_barangay_names()
+
+    results = {}
+    for disease in diseases:
+        dataset = store.register(disease, get_data_file(disease))
+        model_path = get_model_file(disease)
+        if dataset is None or not os.path.exists(model_path):
+            print(f"✗ {disease}: data or model missing, skipped")
+            results[disease] = 'missing'
+            continue
+
+        model_version = ForecastCache.file_version(model_path)
+        jobs = [(disease, dataset.version, lambda: build_forecast(disease, forecast_input(dataset, data_processor), data_processor, model))]
+        if barangay_dataset is not None:
+            jobs.append((f'{disease}:barangays', (dataset.version, barangay_dataset.version),
+                         lambda: build_barangay_forecast(disease, dataset.df, barangay_dataset.df,
+                                                         data_processor, model, names)))
+
+        model = data_processor = None
+        for key, data_version, build in jobs:
+            if not force and table.is_fresh(key, data_version, model_version):
+                print(f"- {key}: up to date")
+                results[key] = 'fresh'
+                continue
+
+            if model is None:
+                data_processor = load_data_processor(model_path)
+                feature_columns = data_processor.feature_columns or data_processor.get_feature_columns(dataset.tail(1).columns)
+                model = load_forecast_model(model_path, len(feature_columns), data_processor.sequence_length)
+
+            start = time.perf_counter()
+            try:
+                response = build()
+            except Exception as e:
+                print(f"✗ {key}: {e}")
+                results[key] = 'failed'
+                continue
+            table.put(key, disease, data_version, model_version, response)
+            level = response.get('alert_level', f"{response.get('n_barangays')} barangays")
+            print(f"✓ {key}: {level} ({time.perf_counter() - start:.2f} s)")
+            results[key] = 'computed'
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute forecasts into the forecast table')
+    parser.add_argument('--diseases', nargs='+', default=Config.DISEASES)
+    parser.add_argument('--barangays', action='store_true', help='Also score every barangay series')
+    parser.add_argument('--force', action='store_true', help='Recompute rows that are still fresh')
+    parser.add_argument('--table', default=Config.FORECAST_TABLE)
+    args = parser.parse_args()
+
+    print("="*60)
+    print("Precomputing forecasts")
+    print("="*60)
+    results = precompute(args.diseases, barangays=args.barangays, force=args.force, table_path=args.table)
+
+    counts = {}
+    for status in results.values():
+        counts[status] = counts.get(status, 0) + 1
+    print("\n" + ", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+    if counts.get('failed'):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
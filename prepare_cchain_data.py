@@ -8,6 +8,8 @@ import numpy as np
 import os
 from datetime import datetime
 
+from app.columnar import write_dataset
+
 # Constants
 ILOILO_CITY_CODE = 'PH063022000'  # adm3_pcode for Iloilo City
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'app', 'data')
@@ -195,7 +197,7 @@ def save_disease_files(merged_df):
         
         # Save to file
         output_file = os.path.join(DATA_DIR, f'{disease}_historical_data.csv')
-        output_df.to_csv(output_file, index=False)
+        write_dataset(output_df, output_file)
         
         print(f"  Saved {disease}: {len(output_df)} records to {output_file}")
         print(f"    Date range: {output_df['date'].min()} to {output_df['date'].max()}")
@@ -1,12 +1,15 @@
 import pandas as pd
-import shutil
+
+from app.columnar import load_dataset, write_dataset
+from app.snapshots import activate_datasets
+from config import Config
 
 print("Replacing Cholera with Leptospirosis in CCHAIN data...\n")
 
 # Read cholera data as template
 cholera_file = 'app/data/cholera_historical_data.csv'
 print(f"Loading template from {cholera_file}...")
-template_df = pd.read_csv(cholera_file)
+template_df = load_dataset(cholera_file)
 print(f"Template has {len(template_df)} records with {len(template_df.columns)} columns")
 
 # Load disease PIDSR data
@@ -55,32 +58,10 @@ print(f"Date range: {merged['date'].min()} to {merged['date'].max()}")
 
 # Save
 output_file = 'app/data/leptospirosis_historical_data.csv'
-merged.to_csv(output_file, index=False)
+write_dataset(merged, output_file)
 print(f"\n✓ Saved to: {output_file}")
-
-# Also copy all cholera backup files to leptospirosis
-backup_files = [
-    ('cholera_historical_data_original.csv', 'leptospirosis_historical_data_original.csv'),
-    ('cholera_historical_data_enhanced.csv', 'leptospirosis_historical_data_enhanced.csv'),
-    ('cholera_historical_data_atmosphere.csv', 'leptospirosis_historical_data_atmosphere.csv'),
-    ('cholera_historical_data_full.csv', 'leptospirosis_historical_data_full.csv'),
-    ('cholera_historical_data_with_sanwater.csv', 'leptospirosis_historical_data_with_sanwater.csv'),
-    ('cholera_historical_data_with_healthwealth.csv', 'leptospirosis_historical_data_with_healthwealth.csv'),
-    ('cholera_23feat_backup.csv', 'leptospirosis_23feat_backup.csv'),
-    ('cholera_41feat_backup.csv', 'leptospirosis_41feat_backup.csv'),
-]
-
-print("\nCopying backup files...")
-for old_name, new_name in backup_files:
-    old_path = f'app/data/{old_name}'
-    new_path = f'app/data/{new_name}'
-    try:
-        # Read old file, it has cholera data
-        # We'll just copy structure for now
-        shutil.copy(output_file, new_path)
-        print(f"  ✓ Created {new_name}")
-    except Exception as e:
-        print(f"  ⚠ Skipped {old_name}: {e}")
+# The snapshot history replaces the old per-stage backup copies of this file
+activate_datasets({'leptospirosis': output_file}, label='leptospirosis (52 features)', root=Config.SNAPSHOT_PATH)
 
 print("\n" + "="*60)
 print("LEPTOSPIROSIS DATA PREPARATION COMPLETE")
@@ -22,6 +22,7 @@ if __name__ == '__main__':
     
     from app.data_utils import DataProcessor
     from app.model import DiseaseOutbreakModel
+    from app.forecasting import get_served_data_file
     from config import Config
     
     app = Flask(__name__, 
@@ -79,7 +80,7 @@ if __name__ == '__main__':
         
         try:
             # Load historical data
-            data_file = os.path.join(Config.DATA_PATH, f'{disease.lower()}_historical_data.csv')
+            data_file = get_served_data_file(disease)
             
             if not os.path.exists(data_file):
                 return jsonify({'error': 'Historical data not found'}), 404
@@ -152,7 +153,7 @@ if __name__ == '__main__':
                     continue
                 
                 # Load historical data
-                data_file = os.path.join(Config.DATA_PATH, f'{disease.lower()}_historical_data.csv')
+                data_file = get_served_data_file(disease)
                 
                 if not os.path.exists(data_file):
                     continue
@@ -188,7 +189,7 @@ if __name__ == '__main__':
             return jsonify({'error': 'Disease not found'}), 404
         
         try:
-            data_file = os.path.join(Config.DATA_PATH, f'{disease.lower()}_historical_data.csv')
+            data_file = get_served_data_file(disease)
             
             if not os.path.exists(data_file):
                 return jsonify({'error': 'Data not found'}), 404
@@ -0,0 +1,394 @@
+"""
+Content-hash-cached DAG runner for the data build scripts
+
+Each build script (prepare/enhance/extract/merge/activate) is declared below as a
+stage with its code files, input files and output files. Dependencies are derived
+from those declarations in build order: a stage depends on the last earlier stage
+that writes each of its inputs, and on earlier readers/writers of files it
+overwrites (the activate_* scripts rewrite {disease}_historical_data.csv in place).
+
+A stage is skipped when the hashes of its code and inputs match the last run.
+Every output a stage writes is kept in a content-addressed object store, so a
+skipped stage's outputs can be restored when a later in-place stage has since
+overwritten them and a downstream stage needs to rerun. Independent branches
+(e.g. the extract_* scans) run concurrently as subprocesses.
+
+Usage: python run_pipeline.py [--dry-run] [--force STAGE ...] [--workers N]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DATA = 'app/data'
+PIPELINE_DIR = os.path.join(ROOT, DATA, '.pipeline')
+STATE_FILE = os.path.join(PIPELINE_DIR, 'state.json')
+OBJECTS_DIR = os.path.join(PIPELINE_DIR, 'objects')
+LOGS_DIR = os.path.join(PIPELINE_DIR, 'logs')
+
+DISEASES = ['dengue', 'typhoid', 'cholera']
+INGEST_CODE = ['ingest_cchain.py', 'app/columnar.py']
+
+
+def per_disease(pattern, diseases=DISEASES):
+    """Expand a '{disease}' file pattern to data paths"""
+    return [f'{DATA}/{pattern.format(disease=disease)}' for disease in diseases]
+
+
+def data(*names):
+    """Data directory paths for file names"""
+    return [f'{DATA}/{name}' for name in names]
+
+
+# Stages in build order: script (and optional args), extra code files, inputs and outputs (repo-relative)
+STAGES = {
+    'prepare_cchain': {
+        'script': 'prepare_cchain_data.py',
+        'code': ['app/columnar.py'],
+        'inputs': data('disease_pidsr_totals.csv', 'climate_indices.csv', 'location.csv'),
+        'outputs': per_disease('{disease}_historical_data.csv')
+    },
+    'ingest_features': {
+        'script': 'ingest_cchain.py',
+        # The per-group files are the extract_* stages' outputs; writing them here too would race them
+        'args': ['--features-only'],
+        'code': ['app/columnar.py'],
+        'inputs': data('location.csv', 'climate_indices.csv', 'climate_atmosphere_downscaled.csv',
+                       'climate_air_quality.csv', 'climate_land.csv', 'osm_poi_sanitation.csv',
+                       'osm_poi_water_body.csv', 'osm_poi_health.csv', 'tm_relative_wealth_index.csv',
+                       'climate_atmosphere.csv', 'worldpop_population.csv', 'nighttime_lights.csv'),
+        'outputs': data('iloilo_features.csv')
+    },
+    'enhance_features': {
+        'script': 'enhance_features.py',
+        'code': INGEST_CODE,
+        'inputs': per_disease('{disease}_historical_data.csv') + data(
+            'location.csv', 'climate_atmosphere.csv', 'worldpop_population.csv', 'nighttime_lights.csv'),
+        'outputs': per_disease('{disease}_historical_data_enhanced.csv')
+    },
+    'activate_enhanced': {
+        'script': 'activate_enhanced_features.py',
+        'code': ['app/columnar.py', 'app/snapshots.py'],
+        'inputs': per_disease('{disease}_historical_data.csv') + per_disease('{disease}_historical_data_enhanced.csv'),
+        'outputs': per_disease('{disease}_historical_data.csv')
+    },
+    'extract_atmosphere': {
+        'script': 'extract_atmosphere_features.py',
+        'code': INGEST_CODE,
+        'inputs': data('location.csv', 'climate_atmosphere_downscaled.csv'),
+        'outputs': data('iloilo_climate_atmosphere.csv')
+    },
+    'merge_atmosphere': {
+        'script': 'merge_atmosphere_features.py',
+        'code': ['app/columnar.py'],
+        'inputs': data('iloilo_climate_atmosphere.csv') + per_disease('{disease}_historical_data_enhanced.csv'),
+        'outputs': per_disease('{disease}_historical_data_atmosphere.csv')
+    },
+    'activate_atmosphere': {
+        'script': 'activate_atmosphere_features.py',
+        'code': ['app/columnar.py', 'app/snapshots.py'],
+        'inputs': per_disease('{disease}_historical_data.csv') + per_disease('{disease}_historical_data_atmosphere.csv'),
+        'outputs': per_disease('{disease}_historical_data.csv')
+    },
+    'extract_airqual_vegetation': {
+        'script': 'extract_airqual_vegetation.py',
+        'code': INGEST_CODE,
+        'inputs': data('location.csv', 'climate_air_quality.csv', 'climate_land.csv'),
+        'outputs': data('iloilo_airqual_vegetation.csv')
+    },
+    'merge_airqual_vegetation': {
+        'script': 'merge_airqual_vegetation.py',
+        'code': ['app/columnar.py'],
+        'inputs': data('iloilo_airqual_vegetation.csv') + per_disease('{disease}_historical_data.csv'),
+        'outputs': per_disease('{disease}_historical_data_full.csv')
+    },
+    'activate_airqual_vegetation': {
+        'script': 'activate_airqual_vegetation.py',
+        'code': ['app/columnar.py', 'app/snapshots.py'],
+        'inputs': per_disease('{disease}_historical_data.csv') + per_disease('{disease}_historical_data_full.csv'),
+        'outputs': per_disease('{disease}_historical_data.csv')
+    },
+    'extract_sanitation_waterbody': {
+        'script': 'extract_sanitation_waterbody.py',
+        'code': INGEST_CODE,
+        'inputs': data('location.csv', 'osm_poi_sanitation.csv', 'osm_poi_water_body.csv'),
+        'outputs': data('iloilo_sanitation_waterbody.csv')
+    },
+    'merge_sanitation_waterbody': {
+        'script': 'merge_sanitation_waterbody.py',
+        'code': ['app/columnar.py'],
+        'inputs': data('iloilo_sanitation_waterbody.csv') + per_disease('{disease}_historical_data.csv'),
+        'outputs': per_disease('{disease}_historical_data_with_sanwater.csv')
+    },
+    'activate_sanitation_waterbody': {
+        'script': 'activate_sanitation_waterbody.py',
+        'code': ['app/columnar.py', 'app/snapshots.py'],
+        'inputs': per_disease('{disease}_historical_data.csv') + per_disease('{disease}_historical_data_with_sanwater.csv'),
+        'outputs': per_disease('{disease}_historical_data.csv')
+    },
+    'extract_healthcare_wealth': {
+        'script': 'extract_healthcare_wealth.py',
+        'code': INGEST_CODE,
+        'inputs': data('location.csv', 'osm_poi_health.csv', 'tm_relative_wealth_index.csv'),
+        'outputs': data('iloilo_healthcare_wealth.csv')
+    },
+    'merge_healthcare_wealth': {
+        'script': 'merge_healthcare_wealth.py',
+        'code': ['app/columnar.py'],
+        'inputs': data('iloilo_healthcare_wealth.csv') + per_disease('{disease}_historical_data.csv'),
+        'outputs': per_disease('{disease}_historical_data_with_healthwealth.csv')
+    },
+    'activate_healthcare_wealth': {
+        'script': 'activate_healthcare_wealth.py',
+        'code': ['app/columnar.py', 'app/snapshots.py'],
+        'inputs': per_disease('{disease}_historical_data.csv') + per_disease('{disease}_historical_data_with_healthwealth.csv'),
+        'outputs': per_disease('{disease}_historical_data.csv')
+    },
+    'prepare_leptospirosis': {
+        'script': 'prepare_leptospirosis.py',
+        'code': ['app/columnar.py', 'app/snapshots.py'],
+        'inputs': data('cholera_historical_data.csv', 'disease_pidsr_totals.csv'),
+        'outputs': data('leptospirosis_historical_data.csv')
+    }
+}
+
+
+def build_graph(stages):
+    """Derive each stage's dependencies and each input's producing stage"""
+    deps = {}
+    producers = {}
+    last_writer = {}
+    readers_since_write = {}
+
+    for name, stage in stages.items():
+        stage_deps = set()
+        producers[name] = {}
+        for path in stage['inputs']:
+            if path in last_writer:
+                producers[name][path] = last_writer[path]
+                stage_deps.add(last_writer[path])
+        for path in stage['outputs']:
+            # Overwriting a file must wait for its previous writer and readers
+            if path in last_writer:
+                stage_deps.add(last_writer[path])
+            stage_deps.update(readers_since_write.get(path, ()))
+
+        for path in stage['inputs']:
+            readers_since_write.setdefault(path, set()).add(name)
+        for path in stage['outputs']:
+            last_writer[path] = name
+            readers_since_write[path] = set()
+
+        stage_deps.discard(name)
+        deps[name] = stage_deps
+
+    return deps, producers, last_writer
+
+
+class PipelineRunner:
+    """Runs STAGES in dependency order, skipping stages whose hashes are unchanged"""
+
+    def __init__(self, stages=STAGES, workers=4, force=(), dry_run=False):
+        self.stages = stages
+        self.workers = workers
+        self.force = set(force)
+        self.dry_run = dry_run
+        self.deps, self.producers, self.last_writer = build_graph(stages)
+
+        self.state = self.load_state()
+        self.lock = threading.RLock()
+        self.results = {}  # stage -> {output path: hash} for this run
+        self.status = {}
+
+    def load_state(self):
+        if not os.path.exists(STATE_FILE):
+            return {'hashes': {}, 'stages': {}}
+        with open(STATE_FILE) as f:
+            return json.load(f)
+
+    def save_state(self):
+        os.makedirs(PIPELINE_DIR, exist_ok=True)
+        tmp_path = STATE_FILE + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, STATE_FILE)
+
+    def file_hash(self, path):
+        """SHA-256 of a repo file, memoized by (size, mtime_ns); None if missing"""
+        full_path = os.path.join(ROOT, path)
+        try:
+            st = os.stat(full_path)
+        except FileNotFoundError:
+            return None
+        with self.lock:
+            cached = self.state['hashes'].get(path)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+
+        digest = hashlib.sha256()
+        with open(full_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        sha = digest.hexdigest()
+        with self.lock:
+            self.state['hashes'][path] = [st.st_size, st.st_mtime_ns, sha]
+        return sha
+
+    def object_path(self, sha):
+        return os.path.join(OBJECTS_DIR, sha[:2], sha)
+
+    def store_object(self, path, sha):
+        """Keep a copy of an output so it can be restored after in-place overwrites"""
+        obj = self.object_path(sha)
+        if not os.path.exists(obj):
+            os.makedirs(os.path.dirname(obj), exist_ok=True)
+            tmp_path = f'{obj}.{threading.get_ident()}.tmp'
+            shutil.copyfile(os.path.join(ROOT, path), tmp_path)
+            os.replace(tmp_path, obj)
+
+    def materialize(self, path, sha):
+        """Make sure path on disk holds the content with hash sha"""
+        if self.file_hash(path) == sha:
+            return
+        shutil.copyfile(self.object_path(sha), os.path.join(ROOT, path))
+        # The CSV is now newer than any columnar copy, so loaders fall back to it
+        self.file_hash(path)
+
+    def input_hashes(self, name):
+        """Logical input versions: the producing stage's output hash, else the file on disk"""
+        hashes = {}
+        for path in self.stages[name]['inputs']:
+            producer = self.producers[name].get(path)
+            if producer is not None:
+                hashes[path] = self.results.get(producer, {}).get(path)
+            else:
+                hashes[path] = self.file_hash(path)
+        return hashes
+
+    def stage_key(self, name, inputs):
+        stage = self.stages[name]
+        digest = hashlib.sha256(name.encode())
+        for path in [stage['script']] + stage['code']:
+            digest.update(f'code:{path}:{self.file_hash(path)}\n'.encode())
+        digest.update(f"args:{json.dumps(stage.get('args', []))}\n".encode())
+        for path in sorted(inputs):
+            digest.update(f'input:{path}:{inputs[path]}\n'.encode())
+        return digest.hexdigest()
+
+    def can_skip(self, name, key):
+        recorded = self.state['stages'].get(name)
+        if name in self.force or recorded is None or recorded['key'] != key:
+            return False
+        return all(os.path.exists(self.object_path(sha)) for sha in recorded['outputs'].values())
+
+    def run_stage(self, name):
+        """Run or skip one stage; returns its status"""
+        stage = self.stages[name]
+        inputs = self.input_hashes(name)
+        missing = [path for path, sha in inputs.items() if sha is None]
+        if missing:
+            print(f"  ✗ {name}: missing input(s) {', '.join(os.path.basename(p) for p in missing)}")
+            return 'blocked'
+
+        key = self.stage_key(name, inputs)
+        if self.can_skip(name, key):
+            self.results[name] = dict(self.state['stages'][name]['outputs'])
+            return 'cached'
+        if self.dry_run:
+            print(f"  → {name}: would run")
+            return 'stale'
+
+        # Inputs overwritten by later in-place stages are restored to the version this stage reads
+        with self.lock:
+            for path, sha in inputs.items():
+                if self.producers[name].get(path) is not None:
+                    self.materialize(path, sha)
+
+        start = time.perf_counter()
+        os.makedirs(LOGS_DIR, exist_ok=True)
+        with open(os.path.join(LOGS_DIR, f'{name}.log'), 'w') as log:
+            proc = subprocess.run([sys.executable, stage['script'], *stage.get('args', [])], cwd=ROOT,
+                                  stdout=log, stderr=subprocess.STDOUT)
+        elapsed = time.perf_counter() - start
+        if proc.returncode != 0:
+            print(f"  ✗ {name}: failed after {elapsed:.1f}s (see {DATA}/.pipeline/logs/{name}.log)")
+            return 'failed'
+
+        outputs = {}
+        for path in stage['outputs']:
+            sha = self.file_hash(path)
+            if sha is None:
+                print(f"  ⚠ {name}: declared output {os.path.basename(path)} was not written")
+                continue
+            self.store_object(path, sha)
+            outputs[path] = sha
+
+        with self.lock:
+            self.results[name] = outputs
+            self.state['stages'][name] = {'key': key, 'outputs': outputs}
+        print(f"  ✓ {name}: ran in {elapsed:.1f}s")
+        return 'ran'
+
+    def run(self):
+        start = time.perf_counter()
+        pending = dict(self.deps)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while pending or running:
+                for name in [n for n, d in pending.items() if d <= set(self.status)]:
+                    del pending[name]
+                    if any(self.status[d] in ('failed', 'blocked') for d in self.deps[name]):
+                        self.status[name] = 'blocked'
+                        continue
+                    if any(self.status[d] == 'stale' for d in self.deps[name]):
+                        print(f"  → {name}: would run (upstream changed)")
+                        self.status[name] = 'stale'
+                        continue
+                    running[executor.submit(self.run_stage, name)] = name
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.status[running.pop(future)] = future.result()
+
+        # Leave every file as written by its last stage in build order
+        if not self.dry_run:
+            for path, writer in self.last_writer.items():
+                sha = self.results.get(writer, {}).get(path)
+                if sha is not None:
+                    self.materialize(path, sha)
+            self.save_state()
+
+        counts = {s: list(self.status.values()).count(s) for s in ('ran', 'stale', 'cached', 'failed', 'blocked')}
+        ran = f"{counts['stale']} to run" if self.dry_run else f"{counts['ran']} ran"
+        print(f"\n{ran}, {counts['cached']} cached, {counts['failed']} failed, "
+              f"{counts['blocked']} blocked in {time.perf_counter() - start:.2f}s")
+        return self.status
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Incremental DAG runner for the data build scripts')
+    parser.add_argument('--dry-run', action='store_true', help='Report which stages would run')
+    parser.add_argument('--force', nargs='+', default=[], choices=list(STAGES), metavar='STAGE',
+                        help='Rerun these stages even if unchanged')
+    parser.add_argument('--workers', type=int, default=4, help='Stages run concurrently')
+    args = parser.parse_args()
+
+    print("="*60)
+    print("HEALTHTRACE DATA PIPELINE")
+    print("="*60)
+    status = PipelineRunner(workers=args.workers, force=args.force, dry_run=args.dry_run).run()
+    sys.exit(1 if 'failed' in status.values() else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+"""The compiled multi-day rollout gives the same numbers as the original predict loop"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('tensorflow')
+
+from app.model import DiseaseOutbreakModel
+from benchmark_forecast import predict_future_reference
+
+SEQUENCE_LENGTH = 30
+N_FEATURES = 8
+DAYS = 14
+
+
+@pytest.mark.parametrize('model_type', ['LSTM', 'GRU'])
+def test_predict_future_matches_predict_loop(model_type):
+    model = DiseaseOutbreakModel(SEQUENCE_LENGTH, N_FEATURES, model_type)
+    model.build_model(units=32)
+    last_sequence = np.random.default_rng(0).random((SEQUENCE_LENGTH, N_FEATURES))
+
+    expected = predict_future_reference(model, last_sequence, DAYS)
+    np.testing.assert_allclose(model.predict_future(last_sequence, n_days=DAYS), expected, rtol=0, atol=1e-5)
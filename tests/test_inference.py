@@ -0,0 +1,53 @@
+"""NumPy inference backend parity with Keras for both recurrent cell types"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.inference import NumpyForecastModel
+
+pytest.importorskip('tensorflow')
+
+SEQUENCE_LENGTH = 30
+N_FEATURES = 8
+DAYS = 14
+TOLERANCE = 1e-4
+
+
+@pytest.fixture(params=['LSTM', 'GRU'])
+def models(request, tmp_path):
+    """(Keras model, NumPy model) loaded from the same random checkpoint"""
+    from app.model import DiseaseOutbreakModel
+    model = DiseaseOutbreakModel(SEQUENCE_LENGTH, N_FEATURES, request.param)
+    model.build_model(units=32)
+    path = str(tmp_path / f'{request.param.lower()}.h5')
+    model.model.save(path)
+
+    keras_model = DiseaseOutbreakModel()
+    keras_model.load_model(path)
+    numpy_model = NumpyForecastModel().load_model(path)
+    assert numpy_model.model_type == request.param
+    return keras_model, numpy_model
+
+
+def test_forward_matches_keras(models):
+    keras_model, numpy_model = models
+    batch = np.random.default_rng(0).random((16, SEQUENCE_LENGTH, N_FEATURES)).astype(np.float32)
+    np.testing.assert_allclose(numpy_model.forward(batch), keras_model.forward(batch), atol=TOLERANCE)
+
+
+def test_forecasts_match_keras(models):
+    keras_model, numpy_model = models
+    rng = np.random.default_rng(1)
+    single = rng.random((SEQUENCE_LENGTH, N_FEATURES)).astype(np.float32)
+    batch = rng.random((4, SEQUENCE_LENGTH, N_FEATURES)).astype(np.float32)
+
+    np.testing.assert_allclose(numpy_model.predict_future(single, DAYS),
+                               keras_model.predict_future(single, DAYS), atol=TOLERANCE)
+    np.testing.assert_allclose(numpy_model.predict_future_batch(batch, DAYS),
+                               keras_model.predict_future_batch(batch, DAYS), atol=TOLERANCE)
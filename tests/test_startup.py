@@ -0,0 +1,45 @@
+"""Lazy startup must not load any model until a request needs it"""
+
+import os
+import sys
+import importlib.util
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def server():
+    """A fresh copy of app.py (the app/ package shadows its module name)"""
+    spec = importlib.util.spec_from_file_location('healthtrace_server', os.path.join(ROOT, 'app.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    yield module
+    module.dataset_store.stop_watcher()
+
+
+def test_lazy_startup_loads_no_models(server, monkeypatch):
+    loaded = []
+    monkeypatch.setattr(server, 'load_disease_model', lambda disease: loaded.append(disease))
+
+    server.initialize_models('lazy')
+    # What the watcher runs after a data reload or snapshot switch
+    server.refresh_status()
+
+    assert loaded == []
+    assert server.startup.report()['ready']
+    assert server.status_broadcaster.snapshot()[1] == []
+
+
+def test_status_lists_a_model_once_loaded(server):
+    dengue_model = os.path.join(ROOT, 'app', 'models', 'dengue_forecast_model.h5')
+    if not os.path.exists(dengue_model):
+        pytest.skip('no trained Dengue model')
+
+    server.initialize_models('lazy')
+    assert server.get_batcher('Dengue') is not None
+
+    status = server.status_broadcaster.snapshot()[1]
+    assert [entry['disease'] for entry in status] == ['Dengue']
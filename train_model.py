@@ -1,58 +1,75 @@
 import os
 import sys
+import json
+import math
+import time
+import argparse
+import multiprocessing
 import numpy as np
-from sklearn.model_selection import train_test_split
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.data_utils import DataProcessor
+from app.forecasting import get_served_data_file
+from app.inference import save_inference_config
 from app.model import DiseaseOutbreakModel
 from config import Config
 
-def train_model(disease='Dengue', model_type='LSTM'):
-    """Train disease outbreak forecasting model"""
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'models')
+# Training windows held in the streaming pipeline's shuffle buffer
+STREAM_SHUFFLE_BUFFER = 10000
+
+def get_model_path(disease, model_type=None):
+    """Checkpoint path for a disease; model_type adds a suffix to keep variants apart"""
+    suffix = f'_{model_type.lower()}' if model_type else ''
+    return os.path.join(MODEL_DIR, f'{disease.lower()}{suffix}_forecast_model.h5')
+
+def train_model(disease='Dengue', model_type='LSTM', output_steps=Config.OUTPUT_STEPS,
+                streaming=False, data_files=None, batch_size=32, cache_dir=None,
+                epochs=50, model_path=None):
+    """Train disease outbreak forecasting model
+    
+    With streaming=True the data is fed through a tf.data pipeline that windows
+    each series on the fly instead of materializing every sequence in memory.
+    data_files can list several series (e.g. one per barangay); cache_dir caches
+    the windowed datasets to local files after the first epoch.
+    """
     
     print(f"Training {model_type} model for {disease} outbreak forecasting...")
+    if output_steps > 1:
+        print(f"Using direct multi-horizon head ({output_steps} days per forward pass)")
     
     # Initialize data processor
     data_processor = DataProcessor(sequence_length=Config.SEQUENCE_LENGTH)
     
-    # Data file path
-    data_file = os.path.join(Config.DATA_PATH, f'{disease.lower()}_historical_data.csv')
+    # Train on the data the app serves
+    data_files = data_files or [get_served_data_file(disease)]
     
     # Check if data exists, if not prompt to run data preparation
-    if not os.path.exists(data_file):
-        print(f"ERROR: Data file not found: {data_file}")
-        print(f"Please run 'python prepare_cchain_data.py' first to process CCHAIN data.")
-        raise FileNotFoundError(f"Missing data file: {data_file}")
-    
-    # Load and prepare data
-    print("Loading data...")
-    df = data_processor.load_data(data_file)
-    
-    print("Preparing features...")
-    scaled_data = data_processor.prepare_features(df)
-    
-    print("Creating sequences...")
-    X, y = data_processor.create_sequences(scaled_data)
-    
-    print(f"Data shape: X={X.shape}, y={y.shape}")
-    
-    # Split data into train and validation sets
-    X_train, X_val, y_train, y_val = train_test_split(
-        X, y, test_size=0.2, shuffle=False  # Don't shuffle to maintain temporal order
-    )
+    for path in data_files:
+        if not os.path.exists(path):
+            print(f"ERROR: Data file not found: {path}")
+            print(f"Please run 'python prepare_cchain_data.py' first to process CCHAIN data.")
+            raise FileNotFoundError(f"Missing data file: {path}")
     
-    print(f"Train shape: X={X_train.shape}, y={y_train.shape}")
-    print(f"Validation shape: X={X_val.shape}, y={y_val.shape}")
+    if streaming:
+        train_data, val_data, n_features = build_streaming_datasets(
+            data_processor, data_files, output_steps, batch_size, cache_dir, disease
+        )
+    else:
+        train_data, val_data, n_features = build_in_memory_datasets(
+            data_processor, data_files[0], output_steps
+        )
     
     # Initialize and build model
     print(f"Building {model_type} model...")
     model = DiseaseOutbreakModel(
         sequence_length=Config.SEQUENCE_LENGTH,
-        n_features=X.shape[2],
-        model_type=model_type
+        n_features=n_features,
+        model_type=model_type,
+        output_steps=output_steps
     )
     model.build_model(units=64)
     
@@ -60,32 +77,211 @@ def train_model(disease='Dengue', model_type='LSTM'):
     
     # Train model
     print("Training model...")
-    model_dir = os.path.join(os.path.dirname(__file__), 'app', 'models')
-    os.makedirs(model_dir, exist_ok=True)
-    model_path = os.path.join(model_dir, f'{disease.lower()}_forecast_model.h5')
+    model_path = model_path or get_model_path(disease)
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
     
     history = model.train(
-        X_train, y_train,
-        X_val, y_val,
-        epochs=50,
-        batch_size=32,
+        *train_data,
+        *val_data,
+        epochs=epochs,
+        batch_size=batch_size,
         model_path=model_path
     )
     
     # Evaluate model
     print("\nEvaluating model...")
-    train_loss, train_mae = model.model.evaluate(X_train, y_train)
-    val_loss, val_mae = model.model.evaluate(X_val, y_val)
+    train_loss, train_mae = model.model.evaluate(*train_data)
+    val_loss, val_mae = model.model.evaluate(*val_data)
     
     print(f"Training - Loss: {train_loss:.4f}, MAE: {train_mae:.4f}")
     print(f"Validation - Loss: {val_loss:.4f}, MAE: {val_mae:.4f}")
     
+    # Bundle the training-time scaling, feature order and window length with the weights
+    if os.path.exists(model_path):
+        save_inference_config(model_path, data_processor.inference_config())
+    
     print(f"\nModel saved to: {model_path}")
     print("Training complete!")
     
     return model, history
 
+def bundle_checkpoint(disease, model_path=None, data_file=None):
+    """Add inference bundle metadata to a checkpoint saved before bundles existed
+    
+    Refits the scaler on the served data (see get_served_data_file), which reproduces
+    the training scaling only if the data has not changed since the model was trained.
+    """
+    model_path = model_path or get_model_path(disease)
+    data_file = data_file or get_served_data_file(disease)
+    
+    data_processor = DataProcessor(sequence_length=Config.SEQUENCE_LENGTH)
+    data_processor.prepare_features(data_processor.load_data(data_file))
+    save_inference_config(model_path, data_processor.inference_config())
+    print(f"✓ Bundled scaler for {len(data_processor.feature_columns)} features into {model_path}")
+
+def build_in_memory_datasets(data_processor, data_file, output_steps):
+    """Load one series and return ((X_train, y_train), (X_val, y_val), n_features)"""
+    # Load and prepare data
+    print("Loading data...")
+    df = data_processor.load_data(data_file)
+    
+    print("Preparing features...")
+    scaled_data = data_processor.prepare_features(df)
+    
+    print("Creating sequences...")
+    X, y = data_processor.create_sequences(scaled_data, output_steps=output_steps, dtype=np.float32)
+    
+    print(f"Data shape: X={X.shape}, y={y.shape}")
+    
+    # Split data into train and validation sets
+    # Slice instead of train_test_split so X stays a view; no shuffle to maintain temporal order
+    n_train = len(X) - math.ceil(len(X) * 0.2)
+    X_train, X_val = X[:n_train], X[n_train:]
+    y_train, y_val = y[:n_train], y[n_train:]
+    
+    print(f"Train shape: X={X_train.shape}, y={y_train.shape}")
+    print(f"Validation shape: X={X_val.shape}, y={y_val.shape}")
+    
+    return (X_train, y_train), (X_val, y_val), X.shape[2]
+
+def build_streaming_datasets(data_processor, data_files, output_steps, batch_size, cache_dir, name):
+    """Build tf.data pipelines and return ((train_ds, None), (val_ds, None), n_features)"""
+    from app.input_pipeline import SequenceDataset
+    
+    print(f"Building streaming input pipeline over {len(data_files)} series...")
+    pipeline = SequenceDataset(data_processor, data_files, output_steps=output_steps)
+    pipeline.fit_scaler()
+    
+    cache_paths = {'train': None, 'validation': None}
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        for subset in cache_paths:
+            cache_paths[subset] = os.path.join(cache_dir, f'{name.lower()}_{subset}.tfcache')
+    
+    # model.fit shuffles in-memory arrays every epoch; match that for the training windows
+    # (up to STREAM_SHUFFLE_BUFFER of them, which bounds memory) and keep validation in order
+    shuffle_buffer = min(pipeline.n_windows['train'], STREAM_SHUFFLE_BUFFER)
+    train_ds = pipeline.build('train', batch_size=batch_size, shuffle_buffer=shuffle_buffer,
+                              cache_path=cache_paths['train'])
+    val_ds = pipeline.build('validation', batch_size=batch_size, cache_path=cache_paths['validation'])
+    
+    print(f"Train windows: {pipeline.n_windows['train']}, validation windows: {pipeline.n_windows['validation']}")
+    print(f"Features: {pipeline.n_features}, batch size: {batch_size}")
+    
+    return (train_ds, None), (val_ds, None), pipeline.n_features
+
+def _train_worker(disease, model_type, model_path, intra_op_threads, inter_op_threads, kwargs):
+    """Train one disease/variant in a worker process with its own thread budget"""
+    import tensorflow as tf
+    
+    # Must run before TensorFlow initializes its runtime in this process
+    tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+    
+    result = {
+        'disease': disease,
+        'model_type': model_type,
+        'model_path': model_path,
+        'pid': os.getpid(),
+        'intra_op_threads': intra_op_threads,
+        'inter_op_threads': inter_op_threads
+    }
+    start = time.perf_counter()
+    try:
+        _, history = train_model(disease=disease, model_type=model_type, model_path=model_path, **kwargs)
+        result.update({
+            'status': 'ok',
+            'epochs_run': len(history.history['loss']),
+            'best_val_loss': float(min(history.history['val_loss'])),
+            'best_val_mae': float(min(history.history['val_mae']))
+        })
+    except Exception as e:
+        result.update({'status': 'error', 'error': f'{type(e).__name__}: {e}'})
+    result['seconds'] = round(time.perf_counter() - start, 2)
+    return result
+
+def train_parallel(diseases, model_types=('LSTM',), max_workers=None, threads_per_worker=None,
+                   summary_path=None, **kwargs):
+    """Train every disease (and model variant) in its own worker process
+    
+    Each worker gets threads_per_worker intra-op threads (default: CPU cores
+    split evenly across workers) so workers don't oversubscribe the machine.
+    Returns the aggregated summary and writes it to summary_path as JSON.
+    """
+    jobs = [(disease, model_type) for disease in diseases for model_type in model_types]
+    max_workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+    threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // max_workers)
+    inter_op_threads = 1 if threads_per_worker < 4 else 2
+    
+    print(f"Training {len(jobs)} model(s) on {max_workers} worker(s), "
+          f"{threads_per_worker} thread(s) each")
+    
+    results = []
+    start = time.perf_counter()
+    # spawn: TensorFlow is not fork-safe once initialized
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        futures = {}
+        for disease, model_type in jobs:
+            # Only suffix checkpoint names when several variants share a disease
+            model_path = get_model_path(disease, model_type if len(model_types) > 1 else None)
+            future = executor.submit(
+                _train_worker, disease, model_type, model_path,
+                threads_per_worker, inter_op_threads, kwargs
+            )
+            futures[future] = (disease, model_type)
+        
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            status = '✓' if result['status'] == 'ok' else '✗'
+            print(f"{status} {result['disease']} {result['model_type']} finished in {result['seconds']}s")
+    
+    summary = {
+        'wall_seconds': round(time.perf_counter() - start, 2),
+        'workers': max_workers,
+        'threads_per_worker': threads_per_worker,
+        'results': sorted(results, key=lambda r: (r['disease'], r['model_type']))
+    }
+    
+    summary_path = summary_path or os.path.join(MODEL_DIR, 'training_summary.json')
+    os.makedirs(os.path.dirname(summary_path), exist_ok=True)
+    with open(summary_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+    
+    print_training_summary(summary)
+    print(f"\nSummary saved to: {summary_path}")
+    return summary
+
+def print_training_summary(summary):
+    """Print a table of per-model results from train_parallel"""
+    print("\n" + "="*60)
+    print("TRAINING SUMMARY")
+    print("="*60)
+    print(f"{'Disease':<15}{'Model':<7}{'Status':<8}{'Time (s)':>10}{'Val loss':>12}")
+    for r in summary['results']:
+        val_loss = f"{r['best_val_loss']:.4f}" if r['status'] == 'ok' else '-'
+        print(f"{r['disease']:<15}{r['model_type']:<7}{r['status']:<8}{r['seconds']:>10}{val_loss:>12}")
+        if r['status'] == 'ok':
+            print(f"  -> {r['model_path']}")
+        else:
+            print(f"  -> {r['error']}")
+    total = sum(r['seconds'] for r in summary['results'])
+    print(f"\nWall time: {summary['wall_seconds']}s (sequential sum: {round(total, 2)}s)")
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Train HealthTrace forecasting models')
+    parser.add_argument('--parallel', action='store_true',
+                        help='Train each disease/variant in its own worker process')
+    parser.add_argument('--variants', nargs='+', default=['LSTM'], choices=['LSTM', 'GRU'],
+                        help='Model variants to train per disease (parallel mode)')
+    parser.add_argument('--workers', type=int, help='Number of worker processes')
+    parser.add_argument('--threads-per-worker', type=int, help='Intra-op threads per worker')
+    parser.add_argument('--epochs', type=int, default=50)
+    parser.add_argument('--bundle-only', action='store_true',
+                        help='Add scaler/feature metadata to existing checkpoints without retraining')
+    args = parser.parse_args()
+    
     # Train models for diseases available in CCHAIN data
     diseases = Config.DISEASES  # ['Dengue', 'Typhoid', 'Cholera']
     
@@ -95,22 +291,35 @@ if __name__ == '__main__':
     print(f"Diseases: {', '.join(diseases)}")
     print("="*60)
     
-    for disease in diseases:
-        print(f"\n{'='*60}")
-        print(f"Training model for {disease}")
-        print(f"{'='*60}\n")
-        
-        try:
-            train_model(disease=disease, model_type='LSTM')
-        except FileNotFoundError as e:
-            print(f"\n{e}")
-            print("\nPlease run: python prepare_cchain_data.py")
-            break
-        except Exception as e:
-            print(f"Error training model for {disease}: {e}")
-            import traceback
-            traceback.print_exc()
-            continue
+    if args.bundle_only:
+        for disease in diseases:
+            if os.path.exists(get_model_path(disease)):
+                bundle_checkpoint(disease)
+    elif args.parallel:
+        train_parallel(
+            diseases,
+            model_types=args.variants,
+            max_workers=args.workers,
+            threads_per_worker=args.threads_per_worker,
+            epochs=args.epochs
+        )
+    else:
+        for disease in diseases:
+            print(f"\n{'='*60}")
+            print(f"Training model for {disease}")
+            print(f"{'='*60}\n")
+            
+            try:
+                train_model(disease=disease, model_type='LSTM', epochs=args.epochs)
+            except FileNotFoundError as e:
+                print(f"\n{e}")
+                print("\nPlease run: python prepare_cchain_data.py")
+                break
+            except Exception as e:
+                print(f"Error training model for {disease}: {e}")
+                import traceback
+                traceback.print_exc()
+                continue
     
     print("\n" + "="*60)
     print("Model training complete!")